@@ -1,15 +1,37 @@
 '''appWindow
 The file contains the various widgets users will use to interface with PySQL'''
 
+import completionIndex
+import exportWizard
+import html
+import itertools
+import importWizard
 import json
-import mysql.connector
+import parameterDialog
+import planView
+import queryPlan
+import queryStatsDialog
 import random
+import re
+import schemaBrowser
 import settingsWindow
+import sqlCompleter
+import sqlTokenizer
+import sqlUtils
 import themes
-from tableDraw import tableDraw
+import time
+from collections import deque
+from commandHistory import CommandHistory
+from queryStats import QueryStats
+from queryWorker import QueryWorker, killQuery
+from resultCache import ResultCache
+from resultModel import ResultModel
+from rowStore import RowStore
+from sqlHighlighter import SqlHighlighter, charFormat, tokenFormats
+from tableDraw import TableRenderer, columnWidths, streamTableDraw
 from os import path
-from PyQt5.QtCore import Qt, QSize, pyqtSignal
-from PyQt5.QtGui import QFont, QPalette, QColor, QIcon, QKeySequence, QTextCursor
+from PyQt5.QtCore import Qt, QEvent, QSize, QThread, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QPalette, QColor, QIcon, QKeySequence, QTextCursor, QTextBlockFormat, QTextCharFormat
 from PyQt5.QtWidgets import (
     
     QToolBar,
@@ -22,6 +44,11 @@ from PyQt5.QtWidgets import (
     QHBoxLayout,
     QWidget,
     QTextEdit,
+    QTableView,
+    QLabel,
+    QLineEdit,
+    QFileDialog,
+    QProgressBar,
     QMessageBox, 
     QSizePolicy
 )
@@ -38,7 +65,8 @@ class EditingWindow(QMainWindow):
         A list that can be used to store and execute multiple
         commands at once
     sqlComp : tuple
-        A tuple containing the db and cur objects
+        A tuple containing the db and cur objects, along with the
+        connection parameters and the connection pool
     panel : QToolBar
         A widget containing that provides access to a settings and
         a quit button
@@ -50,10 +78,50 @@ class EditingWindow(QMainWindow):
         A QAction that launches the settings window
     settingsShortcut : QShortcut
         A shortcut that triggers settingsAction when pressed
+    cancelAction : QAction
+        A QAction that cancels the running query, along with any
+        queries queued behind it
+    cancelShortcut : QShortcut
+        A shortcut that triggers cancelAction when pressed
+    gridAction : QAction
+        A checkable QAction that toggles displaying results in
+        resultGrid, where rows are fetched lazily
+    gridShortcut : QShortcut
+        A shortcut that triggers gridAction when pressed
+    poolAction : QAction
+        A QAction that launches a dialog listing the connection
+        pool's counters
+    cacheAction : QAction
+        A checkable QAction that toggles caching the results of
+        SELECTs
+    cacheStatsAction : QAction
+        A QAction that launches a dialog listing the result cache's
+        counters
+    queryStatsAction : QAction
+        A QAction that launches a dialog listing the timings of the
+        queries run this session
+    explainAction : QAction
+        A QAction that explains the entry field's query, or the last
+        query run, and launches a dialog showing its plan
+    explainShortcut : QShortcut
+        A shortcut that triggers explainAction when pressed
+    streamAction : QAction
+        A checkable QAction that toggles drawing results in the
+        console chunk by chunk, as rows are fetched
     console : ConsoleEdit
         Displays queries and their results, with syntax highlighting
+    resultGrid : QTableView
+        Displays results row by row when gridAction is checked
     entryField : EntryField
         Allows for the typing of queries
+    historySearch : HistorySearch
+        Searches the command history as the user types, shown upon
+        triggering searchAction
+    searchAction : QAction
+        A QAction that starts a reverse incremental search of the
+        command history
+    searchShortcut : QShortcut
+        A shortcut that triggers searchAction when pressed
     macroOne : str
         A commonly used query that can be quickly inserted
     macroShortcutOne : QShortcut
@@ -64,6 +132,47 @@ class EditingWindow(QMainWindow):
         A shortcut that executes all the queries in quickPoll
     eraseQuickPollShorcut : QShortcut
         A shortcut that erases all the queries in quickPoll
+    batchPollAction : QAction
+        A QAction that executes all the queries in quickPoll as a
+        single transaction, displaying only a summary
+    batchPollShortcut : QShortcut
+        A shortcut that triggers batchPollAction when pressed
+    rollbackAction : QAction
+        A checkable QAction that sets whether an error within a
+        batch rolls the whole batch back
+    parallelPollAction : QAction
+        A QAction that executes all the queries in quickPoll, running
+        consecutive reads in parallel on separate connections
+    parallelPollShortcut : QShortcut
+        A shortcut that triggers parallelPollAction when pressed
+    scriptAction : QAction
+        A QAction that prompts for a .sql script file and executes it
+    scriptShortcut : QShortcut
+        A shortcut that triggers scriptAction when pressed
+    resumeScriptAction : QAction
+        A QAction that resumes the last script file that failed,
+        past its last committed statement
+    importAction : QAction
+        A QAction that launches the CSV/TSV import wizard
+    importJobs : list
+        The imports running in the background
+    exportAction : QAction
+        A QAction that launches the query export wizard
+    exportJobs : list
+        The exports running in the background
+    completer : SqlCompleter
+        Suggests keywords, schemas, tables and columns as queries
+        are typed in entryField
+    schemaBrowser : SchemaBrowser
+        A sidebar tree of the server's schemas, tables, columns and
+        indexes, read as they are expanded
+    schemaAction : QAction
+        A checkable QAction that toggles the schema browser
+    schemaShortcut : QShortcut
+        A shortcut that triggers schemaAction when pressed
+    refreshSchemaAction : QAction
+        A QAction that reads the expanded levels of the schema
+        browser again
     tools : QMenuBar
         A menu. Allows for an alternative way
         of accessing exitAction and settingsAction'''
@@ -75,7 +184,7 @@ class EditingWindow(QMainWindow):
         self.setWindowTitle('PySQL')
         self.quickPoll = [] #will contain commands that can be queried at once
         self.sqlComp = sqlComp #passes in the required components to work with mysql
-        qApp.setPalette(themes.themesDict['Raspberry']) #Set default palette
+        qApp.setPalette(themes.palette('Raspberry')) #Set default palette
 
         self.statusBar().showMessage(random.choice([
             "If there's a MySQL, where's MyPRQL?",
@@ -100,6 +209,24 @@ class EditingWindow(QMainWindow):
         self.helpAction = QAction(QIcon(f'{path.dirname(path.abspath(__file__))}/assets/icons/help.png'), 'Help', self)
         self.helpAction.triggered.connect(self.launchHelp)
 
+        self.poolAction = QAction('Connection Pool Diagnostics', self)
+        self.poolAction.triggered.connect(self.launchPoolDiagnostics)
+
+        self.cacheAction = QAction('Cache Results', self)
+        self.cacheAction.setCheckable(True)
+        self.cacheAction.toggled.connect(self.toggleCache)
+
+        self.cacheStatsAction = QAction('Result Cache Statistics', self)
+        self.cacheStatsAction.triggered.connect(self.launchCacheStats)
+        self.queryStatsAction = QAction('Query Timings', self)
+        self.queryStatsAction.triggered.connect(self.launchQueryStats)
+
+        self.explainAction = QAction('Explain Query', self)
+        self.explainAction.triggered.connect(self.launchExplain)
+        self.explainShortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.Key_E), self)
+        self.explainShortcut.setContext(Qt.ApplicationShortcut)
+        self.explainShortcut.activated.connect(lambda: self.explainAction.triggered.emit())
+
         self.exitAction = QAction(QIcon(f'{path.dirname(path.abspath(__file__))}/assets/icons/quitIcon.png'), 'Quit', self)
         self.exitAction.triggered.connect(qApp.quit)
         self.exitShortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.Key_Q), self)
@@ -112,6 +239,12 @@ class EditingWindow(QMainWindow):
         self.settingsShortcut.activated.connect(lambda: self.settingsAction.triggered.emit(True))
         self.settingsShortcut.setContext(Qt.ApplicationShortcut)
 
+        self.cancelAction = QAction('Cancel Running Query', self)
+        self.cancelAction.triggered.connect(lambda: self.console.cancelQuery())
+        self.cancelShortcut = QShortcut(QKeySequence(Qt.Key_Escape), self)
+        self.cancelShortcut.activated.connect(lambda: self.completer.popup().hide() if self.completer.popup().isVisible() else self.cancelAction.triggered.emit()) #closes completions first
+        self.cancelShortcut.setContext(Qt.ApplicationShortcut)
+
         self.panel.addAction(self.exitAction)
         self.panel.addWidget(stretcher)
         self.panel.addAction(self.settingsAction)
@@ -121,14 +254,64 @@ class EditingWindow(QMainWindow):
         self.panel.sizeHint = lambda: QSize(150,500)
         
         self.console = ConsoleEdit(self, self.sqlComp)
+
+        self.resultGrid = QTableView()
+        self.resultGrid.setVisible(False)
+        self.resultGrid.horizontalHeader().setSortIndicator(-1, Qt.AscendingOrder) #results are left unsorted until a header is clicked
+        self.resultGrid.setSortingEnabled(True)
+
+        self.gridAction = QAction('Grid Results', self)
+        self.gridAction.setCheckable(True)
+        self.gridAction.toggled.connect(self.toggleGrid)
+        self.gridShortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.Key_G), self)
+        self.gridShortcut.activated.connect(self.gridAction.toggle)
+        self.gridShortcut.setContext(Qt.ApplicationShortcut)
+
+        self.streamAction = QAction('Stream Results', self)
+        self.streamAction.setCheckable(True)
+        self.streamAction.toggled.connect(lambda checked: setattr(self.console, 'streamResults', checked))
+        self.rawAction = QAction('Raw Results (Lazy Decoding)', self)
+        self.rawAction.setCheckable(True)
+        self.rawAction.toggled.connect(lambda checked: setattr(self.console.worker.session, 'rawResults', checked)) #read by the session as each query starts
         
         self.entryField = EntryField()
-        self.entryField.formatText.connect(self.console.append)
+        self.entryField.formatText.connect(self.console.appendEcho)
         self.entryField.parseText.connect(self.console.appendParse)
+        self.entryField.parameterized.connect(self.runParameterized)
+
+        self.completer = sqlCompleter.SqlCompleter(self.sqlComp[3], EntryField.keyWords, lambda: self.console.worker.session.database)
+        self.entryField.setCompleter(self.completer)
+        self.completer.refresh()
+
+        self.schemaBrowser = schemaBrowser.SchemaBrowser(self.sqlComp[3])
+        self.schemaBrowser.nameChosen.connect(self.entryField.insertPlainText)
+
+        self.schemaAction = QAction('Schema Browser', self)
+        self.schemaAction.setCheckable(True)
+        self.schemaAction.setChecked(True)
+        self.schemaAction.toggled.connect(self.schemaBrowser.setVisible)
+        self.schemaShortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.Key_B), self)
+        self.schemaShortcut.activated.connect(self.schemaAction.toggle)
+        self.schemaShortcut.setContext(Qt.ApplicationShortcut)
+
+        self.refreshSchemaAction = QAction('Refresh Schema Browser', self)
+        self.refreshSchemaAction.triggered.connect(self.schemaBrowser.refresh)
+
+        self.historySearch = HistorySearch(self, self.entryField)
+        self.historySearch.setVisible(False)
+
+        self.searchAction = QAction('Search Command History', self)
+        self.searchAction.triggered.connect(self.historySearch.start)
+        self.searchShortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.Key_R), self)
+        self.searchShortcut.activated.connect(lambda: self.searchAction.triggered.emit())
+        self.searchShortcut.setContext(Qt.ApplicationShortcut)
 
         writeLayout = QVBoxLayout() #contains console + text editor
         writeLayout.addWidget(self.console)
+        writeLayout.addWidget(self.resultGrid)
+        writeLayout.addWidget(self.historySearch)
         writeLayout.addWidget(self.entryField)
+        writeLayout.setAlignment(self.historySearch, Qt.AlignHCenter)
         writeLayout.addSpacing(50)
         writeLayout.setSpacing(50)
         writeLayout.setContentsMargins(11,11,11,11)
@@ -138,6 +321,7 @@ class EditingWindow(QMainWindow):
         layout.setContentsMargins(0,0,0,0)
         layout.setAlignment(self.panel, Qt.AlignLeft) 
         layout.addWidget(self.panel)
+        layout.addWidget(self.schemaBrowser)
         layout.addLayout(writeLayout)
 
         container = QWidget()
@@ -171,6 +355,42 @@ class EditingWindow(QMainWindow):
         self.eraseQuickPollShortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.Key_F5), self)
         self.eraseQuickPollShortcut.setContext(Qt.ApplicationShortcut)
         self.eraseQuickPollShortcut.activated.connect(self.pollErase)
+
+        self.batchPollAction = QAction('Execute Polled Queries (Batched)', self)
+        self.batchPollAction.triggered.connect(self.pollExecuteBatch)
+        self.batchPollShortcut = QShortcut(QKeySequence(Qt.ALT + Qt.Key_F5), self)
+        self.batchPollShortcut.setContext(Qt.ApplicationShortcut)
+        self.batchPollShortcut.activated.connect(lambda: self.batchPollAction.triggered.emit())
+
+        self.rollbackAction = QAction('Rollback Batch On Error', self)
+        self.rollbackAction.setCheckable(True)
+        self.rollbackAction.setChecked(True)
+
+        self.parallelPollAction = QAction('Execute Polled Queries (Parallel)', self)
+        self.parallelPollAction.triggered.connect(self.pollExecuteParallel)
+        self.parallelPollShortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.SHIFT + Qt.Key_F5), self)
+        self.parallelPollShortcut.setContext(Qt.ApplicationShortcut)
+        self.parallelPollShortcut.activated.connect(lambda: self.parallelPollAction.triggered.emit())
+
+        self.scriptAction = QAction('Run SQL File...', self)
+        self.scriptAction.triggered.connect(self.runScriptFile)
+        self.scriptShortcut = QShortcut(QKeySequence(Qt.CTRL + Qt.Key_O), self)
+        self.scriptShortcut.setContext(Qt.ApplicationShortcut)
+        self.scriptShortcut.activated.connect(lambda: self.scriptAction.triggered.emit())
+
+        self.resumeScriptAction = QAction('Resume SQL File', self)
+        self.resumeScriptAction.setEnabled(False)
+        self.resumeScriptAction.triggered.connect(lambda: self.console.appendScript(*self.console.scriptResume))
+
+        self.importJobs = []
+        self.importAction = QAction('Import CSV/TSV...', self)
+        self.importAction.triggered.connect(self.launchImport)
+        self.cancelAction.triggered.connect(lambda: [job.importer.cancelled.set() for job in self.importJobs])
+
+        self.exportJobs = []
+        self.exportAction = QAction('Export Query...', self)
+        self.exportAction.triggered.connect(self.launchExport)
+        self.cancelAction.triggered.connect(lambda: [job.exporter.cancelled.set() for job in self.exportJobs])
         
 
         self.tools = QMenu('&Tools')
@@ -179,6 +399,27 @@ class EditingWindow(QMainWindow):
         self.tools.addSeparator()
         self.tools.addAction(self.settingsAction)
         self.tools.addSeparator()
+        self.tools.addAction(self.cancelAction)
+        self.tools.addAction(self.searchAction)
+        self.tools.addAction(self.batchPollAction)
+        self.tools.addAction(self.rollbackAction)
+        self.tools.addAction(self.parallelPollAction)
+        self.tools.addAction(self.scriptAction)
+        self.tools.addAction(self.resumeScriptAction)
+        self.tools.addAction(self.importAction)
+        self.tools.addAction(self.exportAction)
+        self.tools.addAction(self.gridAction)
+        self.tools.addAction(self.streamAction)
+        self.tools.addAction(self.rawAction)
+        self.tools.addAction(self.schemaAction)
+        self.tools.addAction(self.refreshSchemaAction)
+        self.tools.addSeparator()
+        self.tools.addAction(self.poolAction)
+        self.tools.addAction(self.cacheAction)
+        self.tools.addAction(self.cacheStatsAction)
+        self.tools.addAction(self.queryStatsAction)
+        self.tools.addAction(self.explainAction)
+        self.tools.addSeparator()
         self.tools.addAction(self.aboutMeAction)
         self.tools.addSeparator()
         self.tools.addAction(self.helpAction)
@@ -250,11 +491,20 @@ class EditingWindow(QMainWindow):
         None'''
 
         message = '''
-        F1-3 : Use Macro 1-3
+        F1-3 : Use Macro 1-3 (? Prompts For A Parameter)
         F5 : Quick Poll
         Shift + F5 : Execute Polled Queries
         Ctrl + F5 : Erase Polled Queries
+        Alt + F5 : Execute Polled Queries (Batched)
+        Ctrl + Shift + F5 : Execute Polled Queries (Parallel)
+        Esc : Cancel Running Query
+        Ctrl + G : Toggle Grid Results
+        Ctrl + B : Toggle Schema Browser
+        Ctrl + Space : Complete Word (Also Suggested As You Type)
+        Ctrl + O : Run SQL File
+        Ctrl + E : Explain Query (Entry Field Or Last Run)
         Up/Down (When Entry Field Focused) : Flip through queries
+        Ctrl + R : Search Command History (Again For Older Matches)
         Ctrl + S : Launch Settings
         Ctrl + Q : Quit
         Alt + T : Open Menu Bar
@@ -266,6 +516,138 @@ class EditingWindow(QMainWindow):
 
 
 
+    def launchPoolDiagnostics(self) -> None:
+        '''Launches a dialog listing the connection pool's counters
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        stats = {**self.sqlComp[3].stats(), **self.console.worker.session.statementCache.stats()}
+        message = '\n'.join([f'{key} : {value}' for key, value in stats.items()])
+        self.poolDiagnostics = QMessageBox(QMessageBox.Information, 'Connection Pool Diagnostics', message, QMessageBox.Ok)
+        self.poolDiagnostics.exec()
+
+
+    def launchCacheStats(self) -> None:
+        '''Launches a dialog listing the result cache's counters
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        message = '\n'.join([f'{key} : {value}' for key, value in self.console.resultCache.stats().items()])
+        self.cacheStats = QMessageBox(QMessageBox.Information, 'Result Cache Statistics', message, QMessageBox.Ok)
+        self.cacheStats.exec()
+
+
+    def launchQueryStats(self) -> None:
+        '''Launches a dialog listing the timings of the queries run
+        this session
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        self.queryStatsDialog = queryStatsDialog.QueryStatsDialog(self, self.console.queryStats)
+        self.queryStatsDialog.exec()
+
+
+    def launchExplain(self) -> None:
+        '''Explains the entry field's query, or the last query run
+        should the entry field be empty. The plan is shown in a
+        dialog once explained
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        text = self.entryField.toPlainText().strip()
+        if not text and self.console.queryStats.recent:
+            text = self.console.queryStats.recent[-1][1]
+
+        if sqlUtils.firstKeyword(text) not in queryPlan.explainable:
+            self.statusBar().showMessage('Last Operation: Nothing To Explain')
+            return None
+
+        self.console.explain(text)
+        self.statusBar().showMessage('Last Operation: Explaining Query...')
+
+
+    def toggleCache(self, checked : bool) -> None:
+        '''Toggles caching the results of SELECTs. The cache is
+        emptied upon being turned off
+        
+        Parameters
+        ----------
+        checked : bool
+        
+        Returns
+        -------
+        None'''
+
+        self.console.cacheResults = checked
+        if not checked:
+            self.console.resultCache.clear()
+        self.statusBar().showMessage(f'Last Operation: Result Caching {"Enabled" if checked else "Disabled"}')
+
+
+    def toggleGrid(self, checked : bool) -> None:
+        '''Switches between displaying results in the console and in
+        resultGrid
+        
+        Parameters
+        ----------
+        checked : bool
+        
+        Returns
+        -------
+        None'''
+
+        self.console.lazyResults = checked
+        self.resultGrid.setVisible(checked)
+        self.statusBar().showMessage(f'Last Operation: Grid Results {"Enabled" if checked else "Disabled"}')
+
+
+    def runParameterized(self, text : str) -> None:
+        '''Prompts for the values of the placeholders of query text,
+        and queues it to be executed as a prepared statement. The
+        query is put back in entryField should the prompt be
+        cancelled
+        
+        Parameters
+        ----------
+        text : str
+            The query, with ? standing in for each parameter
+        
+        Returns
+        -------
+        None'''
+
+        self.parameterPrompt = parameterDialog.ParameterDialog(self, text, sqlUtils.placeholderCount(text))
+        if not self.parameterPrompt.exec():
+            self.entryField.setText(text)
+            self.entryField.moveCursor(QTextCursor.End)
+            self.statusBar().showMessage('Last Operation: Parameterized Query Cancelled')
+            return None
+
+        params = self.parameterPrompt.values()
+        self.console.appendEcho(f'{text} {tuple(params)!r}')
+        self.console.appendPrepared(text, params)
+
+
     def setMacroOne(self) -> None: #all of this could be simplified if it weren't for the signal not returning any text
         '''Sets entryField's text to macroOne
         
@@ -325,6 +707,203 @@ class EditingWindow(QMainWindow):
             for i in self.quickPoll:
                 self.entryField.wordParse(i)
 
+
+    def pollExecuteBatch(self) -> None:
+        '''Executes the text within quickPoll as a single transaction,
+        without echoing every query
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        if self.quickPoll != []:
+            self.console.appendBatch(list(self.quickPoll), self.rollbackAction.isChecked())
+            self.statusBar().showMessage('Last Operation: Polled Queries Executed (Batched)')
+
+
+    def pollExecuteParallel(self) -> None:
+        '''Executes the text within quickPoll, running consecutive
+        reads in parallel. Writes act as barriers, and results are
+        displayed in the order the queries were polled
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        if self.quickPoll != []:
+            self.console.appendParallel(list(self.quickPoll))
+            self.statusBar().showMessage('Last Operation: Polled Queries Executed (Parallel)')
+
+    def runScriptFile(self) -> None:
+        '''Prompts for a .sql script file and queues it to be executed
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        scriptPath, _ = QFileDialog.getOpenFileName(self, 'Run SQL File', '', 'SQL Files (*.sql);;All Files (*)')
+        if scriptPath:
+            self.console.appendScript(scriptPath)
+            self.statusBar().showMessage('Last Operation: SQL File Queued')
+
+
+    def launchImport(self) -> None:
+        '''Launches the CSV/TSV import wizard, and starts the import
+        in the background upon it being accepted
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        self.importDialog = importWizard.ImportDialog(self)
+        if not self.importDialog.exec():
+            return None
+
+        try:
+            job = importWizard.ImportJob(self.importDialog.importer(), self.sqlComp[2], self.console.worker.session.database)
+
+        except OSError as e: #the file doesn't exist
+            self.console.append(f'mysql> <font color = red>{html.escape(str(e))}</font>')
+            return None
+
+        job.progress.connect(self.showImportProgress)
+        job.finished.connect(self.showImportFinished)
+        self.importJobs.append(job)
+        job.start()
+        self.statusBar().showMessage(f'Last Operation: Import Into {job.importer.table} Started')
+
+
+    def showImportProgress(self, rows : int, done : int, total : int, elapsed : float) -> None:
+        '''Displays the progress of a running import in the status bar
+        
+        Parameters
+        ----------
+        rows : int
+            The number of rows imported so far
+        done : int
+            The number of bytes of the file read so far
+        total : int
+            The size of the file in bytes
+        elapsed : float
+            The time the import has taken so far, in seconds
+        
+        Returns
+        -------
+        None'''
+
+        self.statusBar().showMessage(f'Importing... {done / max(total, 1):.0%} ({rows} Rows, {rows / max(elapsed, 1e-6):.0f} Rows/s)')
+
+
+    def showImportFinished(self, table : str, rows : int, elapsed : float, method : str, error : str) -> None:
+        '''Displays a summary line for a finished import
+        
+        Parameters
+        ----------
+        table : str
+            The table imported into
+        rows : int
+            The number of rows imported
+        elapsed : float
+            The time the import took, in seconds
+        method : str
+            How the file was loaded
+        error : str
+            The error message, should the import have failed
+        
+        Returns
+        -------
+        None'''
+
+        if self.sender() in self.importJobs:
+            self.importJobs.remove(self.sender())
+        self.console.resultCache.invalidate(f'INSERT INTO {sqlUtils.quoteName(table)}')
+
+        self.console.appendPlain(f'Import: {rows} row(s) into {table}{f" via {method}" if method else ""} ({rows / max(elapsed, 1e-6):.0f} Rows/s, {elapsed:.2f}s)')
+        if error:
+            self.console.append(f'mysql> <font color = red>{html.escape(error)}</font>')
+        self.statusBar().showMessage(f'Last Operation: Import Into {table} {"Failed" if error else "Finished"} ({elapsed:.2f}s)')
+
+
+    def launchExport(self) -> None:
+        '''Launches the query export wizard, with the entry field's
+        query filled in, and starts the export in the background upon
+        it being accepted
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        self.exportDialog = exportWizard.ExportDialog(self, self.entryField.toPlainText().strip())
+        if not self.exportDialog.exec() or not self.exportDialog.pathEntry.text().strip():
+            return None
+
+        job = exportWizard.ExportJob(self.exportDialog.exporter(), self.sqlComp[2], self.console.worker.session.database)
+        job.progress.connect(self.showExportProgress)
+        job.finished.connect(self.showExportFinished)
+        self.exportJobs.append(job)
+        job.start()
+        self.statusBar().showMessage(f'Last Operation: Export To {job.exporter.path} Started')
+
+
+    def showExportProgress(self, rows : int, elapsed : float) -> None:
+        '''Displays the progress of a running export in the status bar
+        
+        Parameters
+        ----------
+        rows : int
+            The number of rows exported so far
+        elapsed : float
+            The time the export has taken so far, in seconds
+        
+        Returns
+        -------
+        None'''
+
+        self.statusBar().showMessage(f'Exporting... ({rows} Rows, {rows / max(elapsed, 1e-6):.0f} Rows/s)')
+
+
+    def showExportFinished(self, path : str, rows : int, elapsed : float, error : str) -> None:
+        '''Displays a summary line for a finished export
+        
+        Parameters
+        ----------
+        path : str
+            The file exported to
+        rows : int
+            The number of rows exported
+        elapsed : float
+            The time the export took, in seconds
+        error : str
+            The error message, should the export have failed
+        
+        Returns
+        -------
+        None'''
+
+        if self.sender() in self.exportJobs:
+            self.exportJobs.remove(self.sender())
+
+        self.console.appendPlain(f'Export: {rows} row(s) to {path} ({rows / max(elapsed, 1e-6):.0f} Rows/s, {elapsed:.2f}s)')
+        if error:
+            self.console.append(f'mysql> <font color = red>{html.escape(error)}</font>')
+        self.statusBar().showMessage(f'Last Operation: Export To {path} {"Failed" if error else "Finished"} ({elapsed:.2f}s)')
+
+
     def pollErase(self) -> None:
         '''Erases the contents of quickPoll
         
@@ -350,7 +929,7 @@ class EditingWindow(QMainWindow):
         -------
         None'''
 
-        self.quickPoll.append(text.rstrip().upper())
+        self.quickPoll.append(text.rstrip())
         self.entryField.clear()
         self.statusBar().showMessage('Last Operation: SQL Query Polled')
     
@@ -369,14 +948,27 @@ class EditingWindow(QMainWindow):
             fontObj.setPointSize(settingsDict['Font Size (Entry Field)'])
 
             self.entryField.setFont(fontObj) #For an odd reason, editing widget font properties causes conflicts with that of font families and sizes
+            self.console.document().setMaximumBlockCount(settingsDict.get('Scrollback Limit', ConsoleEdit.scrollbackLimit)) #absent from older settings files
+            self.console.keepAliveInterval = settingsDict.get('Keepalive Interval', ConsoleEdit.keepAliveInterval)
+            self.console.setKeepAlive.emit(self.console.keepAliveInterval * 1000)
+            self.console.pollConcurrency = settingsDict.get('Parallel Poll Concurrency', ConsoleEdit.pollConcurrency)
+            self.console.resultCache.maxEntries = settingsDict.get('Cache Max Entries', self.console.resultCache.maxEntries)
+            self.console.resultCache.maxBytes = settingsDict.get('Cache Max Size (MB)', self.console.resultCache.maxBytes // 1048576) * 1048576
+            self.console.resultCache.ttl = settingsDict.get('Cache TTL', self.console.resultCache.ttl)
+            self.console.worker.session.statementCache.maxStatements = settingsDict.get('Max Prepared Statements', self.console.worker.session.statementCache.maxStatements)
+            self.entryField.history.maxEntries = settingsDict.get('History Size', self.entryField.history.maxEntries)
+            self.console.scriptBatchSize = settingsDict.get('Script Batch Size', ConsoleEdit.scriptBatchSize)
+            self.console.slowQueryThreshold = settingsDict.get('Slow Query Threshold (ms)', ConsoleEdit.slowQueryThreshold)
+            self.schemaBrowser.schemaModel.ttl = settingsDict.get('Schema Cache TTL', schemaBrowser.SchemaModel.ttl)
+            RowStore.maxBytes = settingsDict.get('Result Memory Budget (MB)', RowStore.maxBytes // 1048576) * 1048576
 
             self.macroOne = settingsDict['Macro One']
             self.macroTwo = settingsDict['Macro Two']
             self.macroThree = settingsDict['Macro Three']
             
-            qApp.setPalette(themes.themesDict[settingsDict['Theme']])
+            qApp.setPalette(themes.palette(settingsDict['Theme']))
             panelPalette = self.panel.palette
-            panelPalette.setBrush(QPalette.Button, themes.themesDict[settingsDict['Theme']].base())
+            panelPalette.setBrush(QPalette.Button, themes.palette(settingsDict['Theme']).base())
             self.panel.setPalette(panelPalette)
 
 
@@ -384,28 +976,36 @@ class EditingWindow(QMainWindow):
 class EntryField(QTextEdit):
     '''Inherits QTextEdit
     Accepts queries as inputs and passes it to console for parsing
-    Widget performs minor syntax highlighting of its own
+    Widget performs syntax highlighting of its own as the user types
     
     Attributes
     ----------
 
     keyWords : set
         A set of all MySQL keywords, used to add syntax highlighting
-    queryArray : list
-        A list of queries entered in the past, acting as a command
-        history of sorts
-    curIndex : int
-        Stores the current position in queryArray
+    highlighter : SqlHighlighter
+        Highlights the blocks of the query as they are edited
+    history : CommandHistory
+        The queries entered in the past, kept across sessions
+    historyId : int
+        The id of the query of history currently flipped to
+    historySize : int
+        The default number of queries history keeps
+    completer : SqlCompleter
+        Suggests completions of the word being typed, None until
+        set with setCompleter
     
     Methods
     -------
     formatText : pyqtSignal
-        A signal that passes along syntax highlighted text
-        implemented using HTML color tags to console for
-        being displayed
+        A signal that passes along the query to console, to be
+        echoed with syntax highlighting
     parseText : pyqtSignal
         A signal that passes along the text itself, to be parsed
-        by console and executed as a query'''    
+        by console and executed as a query
+    parameterized : pyqtSignal
+        A signal that passes along text containing ? placeholders,
+        for the values of which the user is to be prompted'''    
 
     keyWords = {'ADD', 'ALL', 'ALTER', 'ANALYZE', 'AND', 'AS', 'ASC',
                      'AUTO_INCREMENT', 'BDB', 'BERKELEYDB', 'BETWEEN',
@@ -451,6 +1051,8 @@ class EntryField(QTextEdit):
     
     formatText = pyqtSignal(str) #yes, a custom signal had to be created just to cleanly pass data to the console :(
     parseText = pyqtSignal(str)
+    parameterized = pyqtSignal(str)
+    historySize = 100000
     
     def __init__(self):
         super().__init__()
@@ -459,16 +1061,90 @@ class EntryField(QTextEdit):
         self.sizeHint = lambda: QSize(800,60)
         self.palette = QPalette()
         self.setPalette(self.palette)
+        self.setAcceptRichText(False) #pasted formatting would clash with highlighter's
+        self.highlighter = SqlHighlighter(self.document(), self.keyWords)
+
+        self.history = CommandHistory(f'{path.dirname(path.abspath(__file__))}/assets/config/history.log', self.historySize)
+        self.history.load() #in the background, so as to not hold up startup
+        self.historyId = None
+        qApp.aboutToQuit.connect(self.history.close)
+        self.completer = None
+        
+
+    def setCompleter(self, completer) -> None:
+        '''Sets the completer whose popup lists completions of the
+        word being typed
+        
+        Parameters
+        ----------
+        completer : SqlCompleter
+        
+        Returns
+        -------
+        None'''
+
+        self.completer = completer
+        completer.setWidget(self)
+        completer.activated[str].connect(self.insertCompletion)
+
+
+    def showCompletions(self, force : bool = False) -> None:
+        '''Shows the completions of the word being typed below the
+        cursor, or hides them should there be none
+        
+        Parameters
+        ----------
+        force : bool
+            Whether completions are shown even though no word has
+            been typed yet
+        
+        Returns
+        -------
+        None'''
+
+        popup = self.completer.popup()
+        text = self.toPlainText()
+        before = text[ : self.textCursor().position()]
+        word = self.completer.update(before, text)
+
+        if (not word and not force and not before.endswith('.')) or self.completer.listModel.rowCount() == 0:
+            popup.hide()
+            return None
+
+        popup.setCurrentIndex(self.completer.completionModel().index(0, 0))
+        rect = self.cursorRect()
+        rect.setWidth(popup.sizeHintForColumn(0) + popup.verticalScrollBar().sizeHint().width())
+        self.completer.complete(rect)
 
-        self.queryArray = ['']
-        self.curIndex = 0      
+
+    def insertCompletion(self, name : str) -> None:
+        '''Replaces the word being typed with a completion, quoting
+        it should it need quoting
+        
+        Parameters
+        ----------
+        name : str
         
+        Returns
+        -------
+        None'''
+
+        cursor = self.textCursor()
+        typed = completionIndex.currentWord.search(self.toPlainText()[ : cursor.position()]).group(2)
+        if typed.startswith('`') or not re.fullmatch(r'[A-Za-z_$][\w$]*', name):
+            name = f'`{name.replace("`", "``")}`'
+
+        cursor.movePosition(QTextCursor.Left, QTextCursor.KeepAnchor, len(typed))
+        cursor.insertText(name)
+        self.setTextCursor(cursor)
+
 
     def keyPressEvent(self,e) -> None:
         '''Overrides keyPressEvent
-        Allows for accessing commands from queryArray, sending text
-        text to be parsed upon hitting enter, and auto-completion
-        of paranthesis
+        Allows for accessing commands from history, sending text
+        text to be parsed upon hitting enter, auto-completion
+        of paranthesis and completing words as they are typed, or
+        upon hitting Ctrl + Space
         
         Parameters
         ----------
@@ -478,34 +1154,51 @@ class EntryField(QTextEdit):
         -------
         None'''
 
+        completing = self.completer is not None and self.completer.popup().isVisible()
+        if completing and e.key() in (Qt.Key_Return, Qt.Key_Enter, Qt.Key_Tab, Qt.Key_Backtab, Qt.Key_Escape):
+            e.ignore() #left to the completer, which picks the completion or hides its popup
+            return None
+
+        if self.completer is not None and e.key() == Qt.Key_Space and e.modifiers() & Qt.ControlModifier:
+            self.showCompletions(True)
+            return None
+
         e.accept()
         super().keyPressEvent(e)
+
+        if self.completer is not None:
+            if e.text() and (e.text()[-1].isalnum() or e.text()[-1] in '_$.`'):
+                self.showCompletions()
+            elif completing and e.key() == Qt.Key_Backspace:
+                self.showCompletions()
+            elif completing:
+                self.completer.popup().hide()
         
         if e.key() == Qt.Key_ParenLeft:
             self.insertPlainText(')')
             self.moveCursor(QTextCursor.Left)
         
         elif e.key() == Qt.Key_Up: #command history feature
-            self.curIndex -= 1
-            self.setText(self.queryArray[self.curIndex % len(self.queryArray)])
+            self.historyId, text = self.history.step(self.history.nextId if self.historyId is None else self.historyId, True)
+            self.setText(text)
             self.moveCursor(QTextCursor.End)
 
         elif e.key() == Qt.Key_Down: 
-            self.curIndex += 1
-            self.setText(self.queryArray[self.curIndex % len(self.queryArray)])
+            self.historyId, text = self.history.step(self.history.nextId if self.historyId is None else self.historyId, False)
+            self.setText(text)
             self.moveCursor(QTextCursor.End)
 
         elif e.key() == Qt.Key_Return:
             cleanedText = self.toPlainText().strip()
             if len(cleanedText) > 0:
                 if cleanedText[-1] == ';':
-                    self.wordParse(cleanedText.upper())
-            
-        
+                    self.wordParse(cleanedText) #left as typed, as upper casing would alter string literals
+
 
     def wordParse(self, text):
-        '''Emits both the query and a version of the query with
-        syntax highlighting to console
+        '''Emits the query to console, both to be echoed and to be
+        executed. Queries with ? placeholders
+        are emitted through parameterized instead
         
         Parameters
         ----------
@@ -514,74 +1207,1203 @@ class EntryField(QTextEdit):
         Returns
         -------
         None'''
-        textArray = []
-
-        for i in text.split():
-            if i in self.keyWords:
-                textArray.append(f'<font color = orange>{i}</font>')
-            else:
-                textArray.append(i)
         
-        self.formatText.emit(f'{"mysql> "}{" ".join(textArray)}') #allows for cross-widget comms
-        self.parseText.emit(text)
-        self.queryArray.append(text)
-        self.curIndex = 0
-        self.clear()
-
-
-class ConsoleEdit(QTextEdit):
-    '''Inherits QTextEdit
-    Displays queries and their results, with syntax higlighting where
-    possible
+        self.history.add(text)
+        self.historyId = None
+        self.clear() #before emitting, as a cancelled parameter prompt puts text back
+
+        if sqlUtils.placeholderCount(text) > 0:
+            self.parameterized.emit(text)
+        else:
+            self.formatText.emit(text) #allows for cross-widget comms
+            self.parseText.emit(text)
+
+
+class HistorySearch(QLineEdit):
+    '''Inherits QLineEdit
+    Performs a reverse incremental search of an entryField's command
+    history. The latest matching query is put in entryField with every
+    keystroke, Ctrl + R moves on to the next older match, Return
+    accepts the match and Esc puts entryField's text back
     
     Attributes
     ----------
     callingWindow : EditingWindow
         Allows for the accessing of window widgets/properties
-    sqlComp : tuple
-        A tuple containing the db and cur objects
-    myDb
-        The database object
-    myCur
-        The cursor object'''
-
-    def __init__(self,  callingWindow,  sqlComp = None):
+    entryField : EntryField
+        The field whose history is searched, and whose text is set
+        to the current match
+    matchId : int
+        The id of the current match within the history
+    savedText : str
+        entryField's text from before the search started'''
+
+    def __init__(self, callingWindow, entryField):
         super().__init__()
         self.callingWindow = callingWindow
-        self.sqlComp = sqlComp
-        self.myDb = self.sqlComp[0]
-        self.myCur = self.sqlComp[1]
-        
-        self.setLineWrapMode(QTextEdit.NoWrap) #prevents letters and words from warping to the next line
-        self.setReadOnly(True)
-        self.setFont(QFont('Fira Code Medium', 10))
-        
-    def appendParse(self, text : str) -> None:
-        '''Executes query text and displays the result
-        In the case of an error, an error message is displayed in red
-        
-        Parameters
-        ----------
-        text : str
-            The query to be executed'''
-
-        try:
-           self.myCur.execute(text)
-           #self.myDb.commit()
-           
-           textArray = [i for i in self.myCur]
-           if textArray != []:
-                textArray.insert(0, self.myCur.column_names)
-                columnWidth = [max([len(str(j)) for j in i]) + 2 for i in zip(*textArray)]
+        self.entryField = entryField
+        self.matchId = None
+        self.savedText = ''
 
-                self.append(''.join(tableDraw(columnWidth, textArray[0], textArray[1:])))
-                self.callingWindow.statusBar().showMessage('Last Operation: SQL Query Entered')
+        self.setFixedWidth(800)
+        self.setPlaceholderText('Search History (Ctrl + R For Older Matches)')
+        self.textEdited.connect(lambda text: self.search(None))
 
-           for i in self.myCur:
-                self.append(f'{i}')
-                
 
-            
+    def start(self) -> None:
+        '''Shows the search field, or moves on to the next older match
+        should a search already be under way
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        if self.isVisible():
+            self.search(self.matchId)
+            return None
+
+        self.savedText = self.entryField.toPlainText()
+        self.matchId = None
+        self.clear()
+        self.setVisible(True)
+        self.setFocus()
+
+
+    def search(self, before : int) -> None:
+        '''Puts the latest query matching the search that is older than
+        the query of id before in entryField
+        
+        Parameters
+        ----------
+        before : int
+            None searches from the newest query
+        
+        Returns
+        -------
+        None'''
+
+        if self.text().strip() == '':
+            return None
+
+        found = self.entryField.history.search(self.text(), before)
+        if found == []:
+            self.callingWindow.statusBar().showMessage(f'No Older Match For "{self.text()}"')
+            return None
+
+        self.matchId, text = found[0]
+        self.entryField.setText(text)
+        self.entryField.moveCursor(QTextCursor.End)
+        self.callingWindow.statusBar().clearMessage()
+
+
+    def finish(self, accepted : bool) -> None:
+        '''Hides the search field, handing focus back to entryField
+        
+        Parameters
+        ----------
+        accepted : bool
+            Whether the match is kept, as opposed to entryField's text
+            from before the search
+        
+        Returns
+        -------
+        None'''
+
+        if not accepted:
+            self.entryField.setText(self.savedText)
+            self.entryField.moveCursor(QTextCursor.End)
+
+        self.setVisible(False)
+        self.entryField.setFocus()
+        self.callingWindow.statusBar().showMessage(f'Last Operation: History Search {"Accepted" if accepted else "Cancelled"}')
+
+
+    def event(self, e) -> bool:
+        '''Overrides event
+        Claims Esc from the application wide shortcut that cancels
+        queries, as it cancels the search instead while focused
+        
+        Parameters
+        ----------
+        e : QEvent
+        
+        Returns
+        -------
+        bool'''
+
+        if e.type() == QEvent.ShortcutOverride and e.key() == Qt.Key_Escape:
+            e.accept()
+            return True
+
+        return super().event(e)
+
+
+    def keyPressEvent(self, e) -> None:
+        '''Overrides keyPressEvent
+        Accepts the match upon hitting enter, and cancels the search
+        upon hitting Esc
+        
+        Parameters
+        ----------
+        e : QEvent
+        
+        Returns
+        -------
+        None'''
+
+        if e.key() in (Qt.Key_Return, Qt.Key_Enter):
+            self.finish(True)
+        elif e.key() == Qt.Key_Escape:
+            self.finish(False)
+        else:
+            super().keyPressEvent(e)
+
+
+    def focusOutEvent(self, e) -> None:
+        '''Overrides focusOutEvent
+        Keeps the match should focus move elsewhere
+        
+        Parameters
+        ----------
+        e : QEvent
+        
+        Returns
+        -------
+        None'''
+
+        super().focusOutEvent(e)
+        if self.isVisible() and e.reason() != Qt.PopupFocusReason:
+            self.finish(True)
+
+
+
+class ConsoleEdit(QTextEdit):
+    '''Inherits QTextEdit
+    Displays queries and their results, with syntax higlighting where
+    possible
+    Queries are executed by a QueryWorker living in its own QThread,
+    so the window remains responsive while a query runs
+    
+    Attributes
+    ----------
+    callingWindow : EditingWindow
+        Allows for the accessing of window widgets/properties
+    sqlComp : tuple
+        A tuple containing the db and cur objects, along with the
+        connection parameters and the connection pool
+    myDb
+        The database object
+    myCur
+        The cursor object
+    pending : deque
+        Echoes, queries and batches waiting for the running query to
+        finish, stored as (kind, text) pairs so that output keeps
+        its order
+    running : bool
+        Whether a query is currently being executed by the worker
+    startTime : float
+        The time at which the running query was dispatched
+    lazyResults : bool
+        Whether results are read lazily into the window's
+        resultGrid instead of being drawn in the console
+    streamResults : bool
+        Whether results are drawn in the console chunk by chunk as
+        rows are fetched, instead of once every row is fetched
+    gridRun : bool
+        Whether the running query's result goes to resultGrid
+    pollEchoes : list
+        The queries of the running parallel poll, to be echoed
+        along with their results
+    cacheResults : bool
+        Whether results are cached, and served from resultCache
+    resultCache : ResultCache
+        Caches results of SELECTs, keyed by the query and database
+    cacheKey : tuple
+        The query and database the running query's result is to be
+        cached under, should it be cacheable
+    resultModel : ResultModel
+        The model of the result currently shown in resultGrid
+    queryStats : QueryStats
+        The timings of the queries run this session
+    timing : list
+        The execute, fetch, format and render times of the running
+        query so far, followed by its rows and the bytes drawn
+    timedText : str
+        The running query, None should it not be timed
+    schemaRun : bool
+        Whether the running query may change the schema, in which
+        case the schema browser and completions are refreshed once
+        it finishes
+    explainJobs : list
+        The queries being explained in the background
+    stream : generator
+        Yields the chunks of the result currently being streamed
+    streamStore : RowStore
+        The spilled result being streamed, closed once drawn
+    fetchedRows : deque
+        The rows of the streamed result the worker has fetched and
+        that are yet to be drawn. None unless the result is read from
+        the connection
+    fetchedAll : bool
+        Whether the worker has fetched every row of the streamed
+        result
+    fetching : bool
+        Whether the worker is fetching rows of the streamed result
+    streamTimer : QTimer
+        Appends a chunk of stream per tick of the event loop
+    runTimer : QTimer
+        Periodically updates the status bar with the time the
+        running query has taken so far
+    workerThread : QThread
+        The thread the worker lives in
+    worker : QueryWorker
+        Executes queries and emits their results
+    connectionLabel : QLabel
+        Displays the reconnect count and latency in the status bar
+    scriptProgress : QProgressBar
+        Displays the progress of the running script file, along with
+        its throughput, in the status bar
+    scriptResume : tuple
+        The path, offset and delimiter of the running script file,
+        or those a failed script file can be resumed from. None once
+        a script file has been executed in full
+    scriptBatchSize : int
+        The maximum number of statements of a script file committed
+        together
+    scrollbackLimit : int
+        The default number of lines the console keeps, past which the
+        oldest lines are evicted
+    keepAliveInterval : int
+        The number of seconds between pings of the connection, 0
+        disables pinging
+    pollConcurrency : int
+        The maximum number of reads a parallel poll runs at once
+    streamChunkSize : int
+        The number of rows drawn per chunk of a streamed result
+    slowQueryThreshold : int
+        The number of milliseconds past which a SELECT is explained
+        once it finishes, its plan drawn below its result. 0
+        disables explaining slow queries
+
+    Methods
+    -------
+    runQuery : pyqtSignal
+        A signal that passes along a query to the worker
+    runBatch : pyqtSignal
+        A signal that passes along a batch of queries, and whether
+        an error rolls it back, to the worker
+    runParallel : pyqtSignal
+        A signal that passes along the queries of a parallel poll,
+        and the maximum number of reads run at once, to the worker
+    runPrepared : pyqtSignal
+        A signal that passes along a parameterized query and the
+        values of its parameters to the worker
+    runScript : pyqtSignal
+        A signal that passes along the path of a script file, the
+        offset and delimiter to start from and the batch size to the
+        worker
+    setKeepAlive : pyqtSignal
+        A signal that passes along the ping interval, in
+        milliseconds, to the worker
+    fetchRows : pyqtSignal
+        A signal that passes along the number of rows of the
+        streamed result the worker is to fetch next'''
+
+    runQuery = pyqtSignal(str, bool)
+    runBatch = pyqtSignal(list, bool)
+    runParallel = pyqtSignal(list, int)
+    runPrepared = pyqtSignal(str, list)
+    runScript = pyqtSignal(str, 'qint64', str, int)
+    setKeepAlive = pyqtSignal(int)
+    fetchRows = pyqtSignal(int)
+    scrollbackLimit = 100000
+    keepAliveInterval = 60
+    pollConcurrency = 4
+    streamChunkSize = 500
+    scriptBatchSize = 500
+    slowQueryThreshold = 1000
+
+    def __init__(self,  callingWindow,  sqlComp = None):
+        super().__init__()
+        self.callingWindow = callingWindow
+        self.sqlComp = sqlComp
+        self.myDb = self.sqlComp[0]
+        self.myCur = self.sqlComp[1]
+        
+        self.setLineWrapMode(QTextEdit.NoWrap) #prevents letters and words from warping to the next line
+        self.setReadOnly(True)
+        self.setUndoRedoEnabled(False) #the undo stack would otherwise hold on to every result ever appended
+        self.setFont(QFont('Fira Code Medium', 10))
+        self.document().setMaximumBlockCount(self.scrollbackLimit) #the oldest lines are evicted past the limit
+
+        self.pending = deque()
+        self.running = False
+        self.startTime = 0.0
+        self.lazyResults = False
+        self.streamResults = False
+        self.gridRun = False
+        self.pollEchoes = []
+        self.cacheResults = False
+        self.resultCache = ResultCache()
+        self.cacheKey = None
+        self.resultModel = None
+        self.stream = None
+        self.streamStore = None
+        self.fetchedRows = None
+        self.fetchedAll = False
+        self.fetching = False
+        self.queryStats = QueryStats()
+        self.timing = [0.0, 0.0, 0.0, 0.0, 0, 0]
+        self.timedText = None
+        self.schemaRun = False
+        self.explainJobs = []
+
+        self.streamTimer = QTimer(self)
+        self.streamTimer.setInterval(0)
+        self.streamTimer.timeout.connect(self.streamTick)
+
+        self.runTimer = QTimer(self)
+        self.runTimer.setInterval(100)
+        self.runTimer.timeout.connect(self.showRunning)
+
+        self.workerThread = QThread(self)
+        self.worker = QueryWorker(self.sqlComp)
+        self.worker.moveToThread(self.workerThread)
+        self.runQuery.connect(self.worker.execute) #queued, as the worker lives in another thread
+        self.runBatch.connect(self.worker.executeBatch)
+        self.worker.batchFinished.connect(self.showBatch)
+        self.runParallel.connect(self.worker.executeParallel)
+        self.runPrepared.connect(self.worker.executePrepared)
+        self.runScript.connect(self.worker.executeScript)
+        self.worker.scriptProgress.connect(self.showScriptProgress)
+        self.worker.scriptFinished.connect(self.showScriptFinished)
+        self.worker.pollResult.connect(self.showPollResult)
+        self.worker.pollFinished.connect(self.showPollFinished)
+        self.worker.resultReady.connect(self.showResult)
+        self.worker.resultPending.connect(self.showPending)
+        self.fetchRows.connect(self.worker.fetchRows)
+        self.worker.rowsFetched.connect(self.addFetched)
+        self.worker.errorRaised.connect(self.showError)
+        self.worker.timed.connect(self.setFetchTimes)
+        self.worker.reconnected.connect(self.showReconnected)
+        self.worker.reconnectFailed.connect(lambda: self.callingWindow.statusBar().showMessage('Connection Lost (Reconnecting Failed)'))
+        self.setKeepAlive.connect(self.worker.setKeepAliveInterval)
+        self.workerThread.finished.connect(self.worker.keepAliveTimer.stop, Qt.DirectConnection) #timers can only be stopped from their own thread
+        qApp.aboutToQuit.connect(self.stopWorker)
+        self.workerThread.start()
+        self.setKeepAlive.emit(self.keepAliveInterval * 1000)
+
+        self.connectionLabel = QLabel()
+        self.callingWindow.statusBar().addPermanentWidget(self.connectionLabel)
+
+        self.scriptResume = None
+        self.scriptProgress = QProgressBar()
+        self.scriptProgress.setRange(0, 1000)
+        self.scriptProgress.setMinimumWidth(400)
+        self.scriptProgress.setVisible(False)
+        self.callingWindow.statusBar().addPermanentWidget(self.scriptProgress)
+
+
+    def appendPlain(self, text : str, newParagraph : bool = True) -> None:
+        '''Appends text as plain text, skipping the rich text parsing
+        that append() performs. Meant for query output, which makes
+        up the bulk of the console
+        
+        Parameters
+        ----------
+        text : str
+        newParagraph : bool
+            Whether text starts a new paragraph, as with append(), or
+            continues the last one'''
+
+        self.appendRuns([(text, QTextCharFormat())], newParagraph)
+
+
+    def appendRuns(self, runs : list, newParagraph : bool = True) -> None:
+        '''Appends runs of text, each in a format of its own, without
+        any rich text parsing
+        
+        Parameters
+        ----------
+        runs : list
+            (text, QTextCharFormat) pairs
+        newParagraph : bool
+            Whether the runs start a new paragraph, as with append(),
+            or continue the last one'''
+
+        scrollBar = self.verticalScrollBar()
+        atBottom = scrollBar.value() == scrollBar.maximum()
+
+        cursor = QTextCursor(self.document())
+        cursor.movePosition(QTextCursor.End)
+        if newParagraph and not self.document().isEmpty():
+            cursor.insertBlock(QTextBlockFormat(), QTextCharFormat()) #don't carry over the format of an error line
+        for text, textFormat in runs:
+            cursor.insertText(text, textFormat)
+
+        if atBottom:
+            scrollBar.setValue(scrollBar.maximum())
+
+
+    def appendQuery(self, text : str) -> None:
+        '''Appends the echo of a query, highlighted with the same
+        tokens and formats as the entry field. Runs of whitespace
+        outside of strings are collapsed
+        
+        Parameters
+        ----------
+        text : str
+            The query'''
+
+        plain = QTextCharFormat()
+        runs = [['mysql> ', plain]]
+        tokens, _ = sqlTokenizer.tokenize(text, EntryField.keyWords)
+
+        for start, length, kind in tokens:
+            textFormat = tokenFormats.get(kind, plain)
+            token = ' ' if kind == 'space' else text[start : start + length]
+            if runs[-1][1] is textFormat:
+                runs[-1][0] += token #fewer, longer runs are quicker to insert
+            else:
+                runs.append([token, textFormat])
+
+        self.appendRuns(runs)
+
+
+    def appendEcho(self, text : str) -> None:
+        '''Queues an echo of a query to be appended once every query
+        before it has been executed
+        
+        Parameters
+        ----------
+        text : str
+            The query'''
+
+        self.pending.append(('echo', text))
+        self.dispatch()
+
+        
+    def appendParse(self, text : str) -> None:
+        '''Queues query text to be executed by the worker
+        The result is displayed by showResult, or by showError in the
+        case of an error
+        
+        Parameters
+        ----------
+        text : str
+            The query to be executed'''
+
+        self.pending.append(('query', text))
+        self.dispatch()
+
+
+    def appendBatch(self, statements : list, rollbackOnError : bool) -> None:
+        '''Queues statements to be executed by the worker as a single
+        transaction. A summary is displayed by showBatch
+        
+        Parameters
+        ----------
+        statements : list
+            The queries to be executed
+        rollbackOnError : bool
+            Whether an error rolls the whole batch back'''
+
+        self.pending.append(('batch', (statements, rollbackOnError)))
+        self.dispatch()
+
+
+    def appendParallel(self, statements : list) -> None:
+        '''Queues statements to be executed by the worker as a
+        parallel poll. Results are displayed by showPollResult
+        
+        Parameters
+        ----------
+        statements : list
+            The queries to be executed'''
+
+        self.pending.append(('parallel', statements))
+        self.dispatch()
+
+
+    def appendPrepared(self, text : str, params : list) -> None:
+        '''Queues a parameterized query to be executed by the worker
+        as a prepared statement. The result is displayed by
+        showResult
+        
+        Parameters
+        ----------
+        text : str
+            The query to be executed
+        params : list
+            The values of its parameters'''
+
+        self.pending.append(('prepared', (text, params)))
+        self.dispatch()
+
+
+    def appendScript(self, path : str, offset : int = 0, delimiter : str = ';') -> None:
+        '''Queues a script file to be executed by the worker. A
+        summary is displayed by showScriptFinished
+        
+        Parameters
+        ----------
+        path : str
+            The script file
+        offset : int
+            The byte offset to start from
+        delimiter : str
+            The delimiter in effect at offset'''
+
+        self.pending.append(('script', (path, offset, delimiter)))
+        self.dispatch()
+
+
+    def dispatch(self) -> None:
+        '''Appends queued echoes and passes the next queued query to
+        the worker, unless the worker is still busy
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        while self.pending and not self.running:
+            kind, text = self.pending.popleft()
+
+            if kind == 'echo':
+                self.appendQuery(text)
+                continue
+
+            if self.cacheResults and kind == 'script':
+                self.resultCache.clear() #a script may write to any table
+            elif self.cacheResults:
+                for statement in ({'query' : [text], 'prepared' : [text[0]], 'batch' : text[0]}.get(kind, text)):
+                    self.resultCache.invalidate(statement) #results a write may make stale are dropped before it runs
+
+                if kind == 'query' and self.showCached(text):
+                    continue
+
+            if self.resultModel is not None:
+                self.resultModel.detach() #frees the cursor up for the worker
+
+            self.running = True
+            self.gridRun = self.lazyResults
+            self.startTime = time.perf_counter()
+            self.runTimer.start()
+            self.showRunning()
+            self.timing = [0.0, 0.0, 0.0, 0.0, 0, 0]
+            self.timedText = text if kind == 'query' else text[0] if kind == 'prepared' else None
+            self.schemaRun = kind == 'script' or any(sqlUtils.firstKeyword(statement) in schemaBrowser.schemaKeywords
+                                                     for statement in {'query' : [text], 'prepared' : [], 'batch' : text[0]}.get(kind, text))
+
+            if kind == 'batch':
+                self.runBatch.emit(*text)
+            elif kind == 'parallel':
+                self.pollEchoes = text
+                self.runParallel.emit(text, self.pollConcurrency)
+            elif kind == 'prepared':
+                self.runPrepared.emit(*text)
+            elif kind == 'script':
+                self.scriptResume = text
+                self.callingWindow.resumeScriptAction.setEnabled(False)
+                self.scriptProgress.setValue(0)
+                self.scriptProgress.setVisible(True)
+                self.runScript.emit(*text, self.scriptBatchSize)
+            else:
+                self.cacheKey = (text, self.worker.session.database) if self.cacheResults and sqlUtils.isCacheable(text) else None
+                self.runQuery.emit(text, self.lazyResults or self.streamResults)
+
+
+    def finishQuery(self) -> None:
+        '''Marks the running query as finished and moves on to the
+        next queued one
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        self.running = False
+        self.cacheKey = None
+        self.runTimer.stop()
+        if self.schemaRun:
+            self.schemaRun = False
+            self.callingWindow.schemaBrowser.refresh()
+            self.callingWindow.completer.refresh()
+        self.dispatch()
+
+
+    def showRunning(self) -> None:
+        '''Displays the time the running query has taken so far in
+        the status bar
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        self.callingWindow.statusBar().showMessage(f'Running Query... ({time.perf_counter() - self.startTime:.1f}s)')
+
+
+    def setFetchTimes(self, execute : float, fetch : float) -> None:
+        '''Keeps the execute and fetch times of the running query
+        
+        Parameters
+        ----------
+        execute : float
+        fetch : float'''
+
+        self.timing[0 : 2] = execute, fetch
+
+
+    def recordTiming(self) -> str:
+        '''Records the timings of the finished query in queryStats,
+        explaining it should it be a SELECT slower than
+        slowQueryThreshold
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        str
+            A compact breakdown of the timings, for the status bar.
+            Empty should the query not be timed'''
+
+        if self.timedText is None:
+            return ''
+
+        execute, fetch, format, render, rows, size = self.timing
+        self.queryStats.record(self.timedText, execute, fetch, format, render, rows, size)
+        if (self.slowQueryThreshold > 0 and execute + fetch >= self.slowQueryThreshold / 1000
+            and sqlUtils.firstKeyword(self.timedText) == 'SELECT' and sqlUtils.placeholderCount(self.timedText) == 0):
+            self.explain(self.timedText, execute + fetch)
+        self.timedText = None
+
+        return (f' | Execute {execute * 1000:.1f}ms, Fetch {fetch * 1000:.1f}ms, Format {format * 1000:.1f}ms, '
+                f'Render {render * 1000:.1f}ms | {rows} Row(s), {size / 1024:.1f} KB')
+
+
+    def explain(self, text : str, elapsed : float = 0.0) -> None:
+        '''Explains a query in the background, on a connection of
+        its own, so that the worker may carry on with pending queries
+        
+        Parameters
+        ----------
+        text : str
+            The query
+        elapsed : float
+            The time the query took to run, should it be explained
+            for being slow. Its plan is then drawn in the console,
+            rather than in a dialog
+
+        Returns
+        -------
+        None'''
+
+        job = planView.ExplainJob(self.sqlComp[3], self.worker.session.database, text, elapsed)
+        job.finished.connect(self.showPlan)
+        self.explainJobs.append(job)
+        job.start()
+
+
+    def showPlan(self, job, root, suggestions : list, error : str) -> None:
+        '''Displays the plan of an explained query, drawn as a tree
+        in the console for slow queries, or in a dialog otherwise.
+        Operations with warnings are drawn in red
+        
+        Parameters
+        ----------
+        job : ExplainJob
+        root : PlanNode
+            The root of the plan, None should explaining have failed
+        suggestions : list
+            The suggested ALTER TABLE statements
+        error : str
+            The error message, should explaining have failed
+
+        Returns
+        -------
+        None'''
+
+        if job in self.explainJobs:
+            self.explainJobs.remove(job)
+
+        if error:
+            self.append(f'mysql> <font color = red>{html.escape(f"Explain: {error}")}</font>')
+            self.callingWindow.statusBar().showMessage('Last Operation: Explain Query (Error)')
+            return None
+
+        if not job.elapsed:
+            self.callingWindow.planDialog = planView.PlanDialog(self.callingWindow, job.text, root, suggestions)
+            self.callingWindow.planDialog.show()
+            self.callingWindow.statusBar().showMessage('Last Operation: Query Explained')
+            return None
+
+        warningFormat = charFormat('#FFFF5555')
+        self.appendPlain(f'Slow query ({job.elapsed:.2f}s) explained:')
+        for line, warned in queryPlan.planLines(root):
+            self.appendRuns([(line, warningFormat if warned else QTextCharFormat())])
+        for statement in suggestions:
+            self.appendPlain(f'Suggested: {statement}')
+
+
+    def showResult(self, columnNames : tuple, rows : list) -> None:
+        '''Displays the rows of an executed query as a table
+        
+        Parameters
+        ----------
+        columnNames : tuple
+            The column names of the result
+        rows : list or RowStore
+            The rows of the result. A RowStore holds a result too
+            large for memory, which is streamed to the console
+            instead, and never cached'''
+
+        if isinstance(rows, RowStore):
+            self.streamStore = rows
+            self.startStream(columnNames, rows.page(0, ResultModel.batchSize), itertools.islice(rows, ResultModel.batchSize, None))
+            self.timing[4] = len(rows)
+            return None
+
+        self.drawResult(columnNames, rows)
+        if self.cacheKey is not None:
+            self.resultCache.put(*self.cacheKey, columnNames, rows)
+
+        self.timing[4] = len(rows)
+        self.callingWindow.statusBar().showMessage(f'Last Operation: SQL Query Entered ({time.perf_counter() - self.startTime:.2f}s{self.recordTiming()})')
+        self.finishQuery()
+
+
+    def showCached(self, text : str) -> bool:
+        '''Displays the cached result of a query, if there is one
+        Only results drawn in the console in full are served from
+        the cache
+        
+        Parameters
+        ----------
+        text : str
+            The query
+
+        Returns
+        -------
+        bool'''
+
+        if self.lazyResults or self.streamResults or not sqlUtils.isCacheable(text):
+            return False
+
+        cached = self.resultCache.get(text, self.worker.session.database)
+        if cached is None:
+            return False
+
+        self.drawResult(*cached)
+        self.appendPlain(f'({len(cached[1])} row(s) served from cache)')
+        self.callingWindow.statusBar().showMessage('Last Operation: SQL Query Entered (Cached)')
+
+        return True
+
+
+    def drawResult(self, columnNames : tuple, rows : list) -> None:
+        '''Draws the rows of a result as a table, if there are any,
+        adding the time taken to format and render it to timing
+        
+        Parameters
+        ----------
+        columnNames : tuple
+            The column names of the result
+        rows : list
+            The rows of the result'''
+
+        if rows != []:
+            start = time.perf_counter()
+            table = TableRenderer(columnWidths(columnNames, rows)).draw(columnNames, rows)
+            formatted = time.perf_counter()
+            self.appendPlain(table)
+
+            self.timing[2] += formatted - start
+            self.timing[3] += time.perf_counter() - formatted
+            self.timing[5] += len(table.encode())
+
+
+    def showPollResult(self, index : int, columnNames : tuple, rows : list, error : str) -> None:
+        '''Displays the echo and the result of a query of the running
+        parallel poll
+        
+        Parameters
+        ----------
+        index : int
+            The position of the query within the poll
+        columnNames : tuple
+            The column names of the result
+        rows : list
+            The rows of the result
+        error : str
+            The error message, should the query have failed'''
+
+        self.appendQuery(self.pollEchoes[index])
+        if error:
+            self.append(f'mysql> <font color = red>{html.escape(error)}</font>')
+        else:
+            self.drawResult(columnNames, rows)
+
+
+    def showPollFinished(self, executed : int, elapsed : float) -> None:
+        '''Marks the running parallel poll as finished
+        
+        Parameters
+        ----------
+        executed : int
+            The number of queries executed
+        elapsed : float
+            The time the poll took, in seconds'''
+
+        self.pollEchoes = []
+        self.callingWindow.statusBar().showMessage(f'Last Operation: {executed} Polled Queries Executed ({elapsed:.2f}s)')
+        self.finishQuery()
+
+
+    def showPending(self, columnNames : tuple, firstRows : list) -> None:
+        '''Displays a lazily read result, either in the window's
+        resultGrid or by streaming it to the console
+        
+        Parameters
+        ----------
+        columnNames : tuple
+            The column names of the result
+        firstRows : list
+            The first batch of rows of the result'''
+
+        if self.gridRun:
+            self.showGrid(columnNames, firstRows)
+        else:
+            self.startStream(columnNames, firstRows)
+
+
+    def startStream(self, columnNames : tuple, firstRows : list, rows = None) -> None:
+        '''Starts drawing a lazily read result in the console, one
+        chunk per tick of the event loop. Column widths are based on
+        firstRows, and are grown should a later row not fit
+        
+        Parameters
+        ----------
+        columnNames : tuple
+            The column names of the result
+        firstRows : list
+            The first batch of rows of the result
+        rows : iterator
+            The rows past firstRows. Fetched by the worker should it
+            not be given'''
+
+        if firstRows == []:
+            self.showResult(columnNames, [])
+            return None
+
+        self.timing[4] = len(firstRows)
+
+        if rows is None: #fetched in the worker thread, as fetching blocks until the server sends the rows
+            fetched = self.fetchedRows = deque()
+            self.fetchedAll = False
+            self.requestRows()
+
+            def rowIter(): #only drawn from once a chunk's worth has been fetched, or every row has
+                while fetched:
+                    yield fetched.popleft()
+
+            rows = rowIter()
+
+        self.stream = streamTableDraw(columnNames, firstRows, rows, self.streamChunkSize)
+        self.appendPlain('') #new paragraph for the chunks to be inserted into
+        self.drawChunk() #firstRows are at hand already
+        self.streamTimer.start()
+
+
+    def requestRows(self) -> None:
+        '''Has the worker fetch the next rows of the streamed result,
+        unless it is fetching already, or enough rows are waiting to
+        be drawn
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        if not self.fetching and not self.fetchedAll and len(self.fetchedRows) < 2 * self.streamChunkSize: #fetched ahead of drawing, but no further
+            self.fetching = True
+            self.fetchRows.emit(self.streamChunkSize)
+
+
+    def addFetched(self, rows : list, elapsed : float) -> None:
+        '''Keeps the rows of the streamed result the worker fetched,
+        resuming the stream should it have been waiting for them
+        
+        Parameters
+        ----------
+        rows : list
+            The rows fetched, fewer than streamChunkSize only once
+            every row has been fetched
+        elapsed : float
+            The time the rows took to fetch'''
+
+        if self.fetchedRows is None: #the stream was stopped while the worker was fetching
+            return None
+
+        self.fetching = False
+        self.fetchedAll = len(rows) < self.streamChunkSize
+        self.fetchedRows.extend(rows)
+        self.timing[1] += elapsed
+        self.timing[4] += len(rows)
+
+        self.requestRows()
+        self.streamTimer.start()
+
+
+    def streamTick(self) -> None:
+        '''Draws and appends the next chunk of the streamed result,
+        pausing the stream while the worker has yet to fetch its rows
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        if self.fetchedRows is not None and len(self.fetchedRows) < self.streamChunkSize and not self.fetchedAll:
+            self.streamTimer.stop() #restarted by addFetched
+            return None
+
+        self.drawChunk()
+        if self.fetchedRows is not None:
+            self.requestRows()
+
+
+    def drawChunk(self) -> None:
+        '''Draws and appends the next chunk of the streamed result,
+        finishing the query once every chunk has been drawn
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        start = time.perf_counter()
+        try:
+            chunk = next(self.stream)
+
+        except StopIteration:
+            self.stopStream()
+            self.callingWindow.statusBar().showMessage(f'Last Operation: SQL Query Entered ({time.perf_counter() - self.startTime:.2f}s{self.recordTiming()})')
+            self.finishQuery()
+
         except Exception as e:
-            self.append(f'mysql> <font color = red>{e}</font>')
-            self.callingWindow.statusBar().showMessage('Last Operation: SQL Query Entered (Error)')
+            self.stopStream()
+            self.showError(str(e))
+
+        else:
+            formatted = time.perf_counter()
+            self.appendPlain(chunk, newParagraph = False)
+
+            self.timing[2] += formatted - start
+            self.timing[3] += time.perf_counter() - formatted
+            self.timing[5] += len(chunk.encode())
+
+
+    def stopStream(self) -> None:
+        '''Stops streaming the current result. Any rows left unread
+        are discarded by the worker before the next query
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        self.streamTimer.stop()
+        self.stream = None
+        self.fetchedRows = None
+        self.fetching = False
+        if self.streamStore is not None:
+            self.streamStore.close() #deletes the spilled rows
+            self.streamStore = None
+
+
+    def showGrid(self, columnNames : tuple, firstRows : list) -> None:
+        '''Displays a lazily read result in the window's resultGrid
+        Further rows are fetched by the model as the grid is scrolled
+        
+        Parameters
+        ----------
+        columnNames : tuple
+            The column names of the result
+        firstRows : list
+            The first batch of rows of the result'''
+
+        if self.resultModel is not None:
+            self.resultModel.close() #deletes the rows the last result spilled
+        self.resultModel = ResultModel(self.worker.session.result, columnNames, firstRows)
+        self.callingWindow.resultGrid.setModel(self.resultModel)
+        self.appendPlain(f'Result of {len(columnNames)} column(s) displayed in grid')
+
+        self.timing[4] = len(firstRows)
+        self.callingWindow.statusBar().showMessage(f'Last Operation: SQL Query Entered ({time.perf_counter() - self.startTime:.2f}s{self.recordTiming()})')
+        self.finishQuery()
+
+
+    def showError(self, message : str) -> None:
+        '''Displays the error message of a failed query in red
+        
+        Parameters
+        ----------
+        message : str
+            The error message'''
+
+        if self.stream is not None: #fetching the rest of a streamed result failed
+            self.stopStream()
+        self.append(f'mysql> <font color = red>{html.escape(message)}</font>')
+        self.callingWindow.statusBar().showMessage('Last Operation: SQL Query Entered (Error)')
+        self.finishQuery()
+
+
+    def showBatch(self, executed : int, affected : int, errors : int, elapsed : float, firstError : str) -> None:
+        '''Displays a single summary line for an executed batch
+        
+        Parameters
+        ----------
+        executed : int
+            The number of statements that were executed
+        affected : int
+            The number of rows affected
+        errors : int
+            The number of statements that raised an error
+        elapsed : float
+            The time the batch took, in seconds
+        firstError : str
+            The message of the first error raised, if any'''
+
+        self.appendPlain(f'Batch: {executed} statement(s) executed, {affected} row(s) affected, {errors} error(s) ({elapsed:.2f}s)')
+        if firstError:
+            self.append(f'mysql> <font color = red>{html.escape(firstError)}</font>')
+
+        self.callingWindow.statusBar().showMessage(f'Last Operation: Batch Executed ({elapsed:.2f}s)')
+        self.finishQuery()
+
+
+    def showScriptProgress(self, done : int, total : int, executed : int) -> None:
+        '''Displays the progress of the running script file, along
+        with its throughput
+        
+        Parameters
+        ----------
+        done : int
+            The number of bytes of the file read so far
+        total : int
+            The size of the file in bytes
+        executed : int
+            The number of statements executed so far'''
+
+        elapsed = max(time.perf_counter() - self.startTime, 1e-6)
+        self.scriptProgress.setValue(done * 1000 // max(total, 1))
+        self.scriptProgress.setFormat(f'{done / total:.1%} ({done / elapsed / 1048576:.1f} MB/s, {executed / elapsed:.0f} Statements/s)')
+
+
+    def showScriptFinished(self, committed : int, offset : int, delimiter : str, elapsed : float, error : str) -> None:
+        '''Displays a summary line for an executed script file. Should
+        it have failed, the offset it can be resumed from is kept in
+        scriptResume
+        
+        Parameters
+        ----------
+        committed : int
+            The number of statements committed
+        offset : int
+            The byte offset past the last committed statement
+        delimiter : str
+            The delimiter in effect at offset
+        elapsed : float
+            The time the script took, in seconds
+        error : str
+            The error message, should the script have failed'''
+
+        self.scriptProgress.setVisible(False)
+        self.appendPlain(f'Script: {committed} statement(s) committed ({elapsed:.2f}s)')
+
+        if error:
+            self.append(f'mysql> <font color = red>{html.escape(error)}</font>')
+            self.appendPlain(f'Stopped at byte {offset}, resume with Tools > Resume SQL File')
+            self.scriptResume = (self.scriptResume[0], offset, delimiter)
+        else:
+            self.scriptResume = None
+
+        self.callingWindow.resumeScriptAction.setEnabled(self.scriptResume is not None)
+        self.callingWindow.statusBar().showMessage(f'Last Operation: SQL File {"Stopped" if error else "Executed"} ({elapsed:.2f}s)')
+        self.finishQuery()
+
+
+    def showReconnected(self, count : int, latency : float) -> None:
+        '''Displays the reconnect count and the time the last
+        reconnect took in the status bar
+        
+        Parameters
+        ----------
+        count : int
+            The number of times the connection has been reestablished
+        latency : float
+            The time reconnecting took, in milliseconds'''
+
+        self.connectionLabel.setText(f'Reconnects: {count} (Last: {latency:.0f} ms)')
+        self.callingWindow.statusBar().showMessage('Last Operation: Connection Reestablished', msecs = 5000)
+
+
+    def cancelQuery(self) -> None:
+        '''Drops any queued queries and kills the running query over
+        a side connection
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        dropped = sum(1 for kind, _ in self.pending if kind != 'echo')
+        self.pending.clear()
+        self.worker.cancelled.set() #stops a parallel poll from starting any more queries
+
+        if self.stream is not None: #the query itself has finished, only the drawing has to stop
+            self.stopStream()
+            self.callingWindow.statusBar().showMessage(f'Last Operation: Query Cancelled ({dropped} Queued Queries Dropped)')
+            self.finishQuery()
+
+        elif self.running:
+            killQuery(self.sqlComp[3], self.myDb.connection_id)
+            self.callingWindow.statusBar().showMessage(f'Last Operation: Query Cancelled ({dropped} Queued Queries Dropped)')
+
+
+    def stopWorker(self) -> None:
+        '''Cancels any running query and stops the worker thread
+        before the application quits
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        self.cancelQuery()
+        self.workerThread.quit()
+        self.workerThread.wait(3000)
@@ -0,0 +1,223 @@
+'''batchMode
+Contains the headless mode of PySQL, which runs statements given on
+the command line, in a script file or piped in, and prints their
+results without a window, for use in cron jobs, CI and SSH sessions.
+PyQt5 is never imported, so it starts in a fraction of the time the
+window takes
+
+Run as main.py --batch, followed by the options listed by
+main.py --batch --help. Exits with 0 should every statement succeed,
+1 should any fail, 2 upon a usage error and 3 should connecting fail'''
+
+import argparse
+import getpass
+import itertools
+import os
+import sys
+import time
+import mysql.connector
+from resultExport import JsonLinesWriter, TsvWriter
+from scriptReader import ScriptReader, splitStatements
+from session import Session
+from tableDraw import streamTableDraw
+
+exitOk, exitFailed, exitUsage, exitConnect = 0, 1, 2, 3
+fetchSize = 500 #rows fetched and printed at a time
+
+writers = {'tsv' : TsvWriter, 'json' : JsonLinesWriter}
+
+
+def parseArgs(argv : list) -> argparse.Namespace:
+    '''Parses the command line. Connection options not given fall
+    back to the PYSQL_HOST, PYSQL_PORT, PYSQL_USER, PYSQL_PASSWORD
+    and PYSQL_DATABASE environment variables
+
+    Parameters
+    ----------
+    argv : list
+        The arguments, past --batch
+
+    Returns
+    -------
+    argparse.Namespace'''
+
+    environ = os.environ
+    parser = argparse.ArgumentParser(prog = 'main.py --batch', description = 'Runs MySQL statements without starting the PySQL window')
+    source = parser.add_mutually_exclusive_group()
+    source.add_argument('-e', '--execute', action = 'append', metavar = 'SQL', help = 'statements to run, may be given more than once')
+    source.add_argument('-f', '--file', metavar = 'PATH', help = 'a script file to run, - for standard input (the default)')
+
+    parser.add_argument('--host', default = environ.get('PYSQL_HOST', 'localhost'))
+    parser.add_argument('-P', '--port', type = int, default = int(environ.get('PYSQL_PORT', 3306)))
+    parser.add_argument('-u', '--user', default = environ.get('PYSQL_USER', getpass.getuser()))
+    parser.add_argument('-p', '--password', nargs = '?', const = None, default = environ.get('PYSQL_PASSWORD', ''),
+                        help = 'prompted for should no value follow')
+    parser.add_argument('-D', '--database', default = environ.get('PYSQL_DATABASE'))
+    parser.add_argument('--format', choices = ['table', 'tsv', 'json'], default = environ.get('PYSQL_FORMAT', 'table'),
+                        help = 'table draws results as the window does, json writes a JSON object per row')
+    parser.add_argument('--force', action = 'store_true', help = 'carry on past failed statements')
+    parser.add_argument('-v', '--verbose', action = 'store_true', help = 'report the rows and time of every statement on stderr')
+
+    return parser.parse_args(argv)
+
+
+def lineOf(data, offset : int) -> int:
+    '''Returns the line of a script a byte offset falls on
+
+    Parameters
+    ----------
+    data : bytes or mmap.mmap
+    offset : int
+
+    Returns
+    -------
+    int'''
+
+    return data[:offset].count(b'\n') + 1
+
+
+def printResult(result, format : str, out) -> int:
+    '''Prints the rows of an executed query as they are fetched
+
+    Parameters
+    ----------
+    result : Result
+        A result being streamed
+    format : str
+        table, tsv or json
+    out
+        The stream printed to
+
+    Returns
+    -------
+    int
+        The number of rows printed'''
+
+    columnNames = result.columnNames
+    batches = iter(lambda: result.fetchmany(fetchSize), [])
+
+    if format == 'table':
+        firstRows = next(batches, [])
+        if firstRows == []: #nothing is drawn for an empty result, as in the window
+            return 0
+        for chunk in streamTableDraw(columnNames, firstRows, itertools.chain.from_iterable(batches), fetchSize):
+            out.write(chunk)
+
+    else:
+        writer = writers[format](out, columnNames, 'result')
+        for rows in batches:
+            writer.write(rows)
+
+    return result.rowCount #that of a streamed result counts the rows fetched so far
+
+
+def runStatements(session : Session, statements, args, source : bytes = None) -> int:
+    '''Runs statements one after the other, printing their results
+
+    Parameters
+    ----------
+    session : Session
+    statements : iterable
+        Yields (statement, startOffset, endOffset, delimiter) tuples,
+        as splitStatements does
+    args : argparse.Namespace
+    source : bytes or mmap.mmap
+        The script statements were split from, used to point errors
+        to their lines
+
+    Returns
+    -------
+    int
+        The exit code'''
+
+    exitCode = exitOk
+
+    for statement, start, _, _ in statements:
+        startTime = time.perf_counter()
+        try:
+            result = session.execute(statement, stream = True)
+            if result.columnNames:
+                rows = printResult(result, args.format, sys.stdout)
+                summary = f'{rows} row(s) in set'
+            else:
+                summary = f'Query OK, {max(result.rowCount, 0)} row(s) affected'
+
+            if args.verbose:
+                print(f'{summary} ({time.perf_counter() - startTime:.2f}s)', file = sys.stderr)
+
+        except BrokenPipeError: #left to main, as the output is gone
+            raise
+
+        except Exception as e: #not only server errors, decoding a value can fail too
+            location = f' at line {lineOf(source, start)}' if source is not None else ''
+            print(f'ERROR{location}: {e}', file = sys.stderr)
+            exitCode = exitFailed
+            if not args.force:
+                break
+
+    sys.stdout.flush()
+    return exitCode
+
+
+def main(argv : list) -> int:
+    '''Runs the statements the command line asks for
+
+    Parameters
+    ----------
+    argv : list
+        The arguments, past --batch
+
+    Returns
+    -------
+    int
+        The exit code'''
+
+    try:
+        args = parseArgs(argv)
+    except SystemExit as e: #--help, or a usage error
+        return e.code
+
+    if args.password is None:
+        args.password = getpass.getpass('Enter password: ')
+
+    try:
+        session = Session(mysql.connector.connect(host = args.host, port = args.port, user = args.user, password = args.password,
+                                                  database = args.database, autocommit = True)) #as the mysql client does
+
+    except mysql.connector.Error as e:
+        print(f'ERROR: {e}', file = sys.stderr)
+        return exitConnect
+
+    reader = None
+    stopped = False #upon which rows left unread are dropped along with the connection, rather than drained
+    try:
+        if args.execute:
+            source = ';\n'.join(args.execute).encode()
+        elif args.file not in (None, '-'):
+            reader = ScriptReader(args.file) #memory-mapped, so scripts of any size run in constant memory
+            source = reader.map
+        else:
+            source = sys.stdin.buffer.read()
+
+        return runStatements(session, splitStatements(source) if source is not None else (), args, source)
+
+    except BrokenPipeError: #whatever read the output stopped reading, as head does
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        stopped = True
+        return exitOk
+
+    except OSError as e:
+        print(f'ERROR: {e}', file = sys.stderr)
+        return exitUsage
+
+    except KeyboardInterrupt:
+        stopped = True
+        return 130
+
+    finally:
+        if reader is not None:
+            reader.close()
+        if stopped:
+            session.abort()
+        else:
+            session.close()
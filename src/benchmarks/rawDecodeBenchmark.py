@@ -0,0 +1,147 @@
+'''rawDecodeBenchmark
+Measures the rows per second shown through a regular cursor, which
+converts every value to a Python object that is then turned back into
+a string, against a raw cursor whose values are wrapped in RawRows and
+decoded only once shown. Both the console, which shows every value,
+and the grid, which shows a screenful, are measured. Outputs of both
+are checked to be identical
+
+Without --user, rows are synthesized as the server would send them
+and converted with the connector's pure Python converter. With --user,
+--query is run against a server through both kinds of cursor
+
+Run from the src directory with
+    python benchmarks/rawDecodeBenchmark.py [--rows N] [--columns N]
+    python benchmarks/rawDecodeBenchmark.py --user USER [--password PASSWORD] [--query QUERY] [--pure]'''
+
+import argparse
+import sys
+import time
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from mysql.connector.constants import FieldType
+from mysql.connector.conversion import MySQLConverter
+from rawValues import RawCursor, RawRow
+from tableDraw import TableRenderer, columnWidths
+
+gridRows = 40 #the rows of a screenful of grid
+gridColumns = 10
+
+
+def consoleDraw(headerArr : tuple, rowArr : list) -> str:
+    return TableRenderer(columnWidths(headerArr, rowArr)).draw(headerArr, rowArr)
+
+
+def gridShow(rowArr : list) -> list:
+    return [str(row[column]) for row in rowArr[ : gridRows] for column in range(min(gridColumns, len(row)))]
+
+
+def makeRaw(columns : int, rows : int) -> tuple:
+    '''Builds the description and raw rows of a table of DECIMAL,
+    DATETIME, JSON and VARCHAR columns, with some NULLs
+
+    Parameters
+    ----------
+    columns : int
+    rows : int
+
+    Returns
+    -------
+    tuple'''
+
+    types = (FieldType.NEWDECIMAL, FieldType.DATETIME, FieldType.JSON, FieldType.VAR_STRING)
+    cells = (lambda r: b'%d.%02d' % (r * 7, r % 100), lambda r: b'2024-%02d-%02d 12:%02d:%02d' % (r % 12 + 1, r % 28 + 1, r % 60, r % 60),
+             lambda r: b'{"id": %d, "tags": ["a", "b"]}' % r, lambda r: b'name %d' % (r % 97))
+
+    description = [(f'column_{c}', types[c % 4], None, None, None, None, 1, 0, 45) for c in range(columns)]
+    rowArr = [tuple(None if (r + c) % 11 == 0 else cells[c % 4](r) for c in range(columns)) for r in range(rows)]
+
+    return description, rowArr
+
+
+def synthetic(rows : int, columns : int) -> None:
+    '''Times converting and drawing synthesized rows both ways
+
+    Parameters
+    ----------
+    rows : int
+    columns : int
+
+    Returns
+    -------
+    None'''
+
+    description, rawRows = makeRaw(columns, rows)
+    headerArr = tuple(column[0] for column in description)
+    converter = MySQLConverter()
+
+    def converted():
+        return [converter.row_to_python(row, description) for row in rawRows]
+
+    def raw():
+        return [RawRow(row) for row in rawRows]
+
+    print(f'{"view":<9}{"columns":>9}{"rows":>10}{"converted rows/s":>18}{"raw rows/s":>14}{"speedup":>9}')
+    for view, show in (('console', lambda rowArr: consoleDraw(headerArr, rowArr)), ('grid', gridShow)):
+        times, outputs = [], []
+        for read in (converted, raw):
+            start = time.perf_counter()
+            outputs.append(show(read()))
+            times.append(time.perf_counter() - start)
+        assert outputs[0] == outputs[1], f'output of the {view} differs'
+
+        print(f'{view:<9}{columns:>9}{rows:>10}{rows / times[0]:>18,.0f}{rows / times[1]:>14,.0f}{times[0] / times[1]:>8.1f}x')
+
+
+def server(args) -> None:
+    '''Times running query and drawing its result through a regular
+    cursor and through a raw cursor
+
+    Parameters
+    ----------
+    args : argparse.Namespace
+
+    Returns
+    -------
+    None'''
+
+    import mysql.connector
+
+    connection = mysql.connector.connect(host = args.host, user = args.user, password = args.password, use_pure = args.pure)
+    print(f'{type(connection).__name__}, {"pure Python" if args.pure else "C extension, where installed"}')
+
+    times = []
+    for cursor in (connection.cursor(), RawCursor(connection.cursor(raw = True))):
+        start = time.perf_counter()
+        cursor.execute(args.query)
+        rowArr = cursor.fetchall()
+        consoleDraw(tuple(cursor.column_names), rowArr)
+        times.append(time.perf_counter() - start)
+        cursor.close()
+    connection.close()
+
+    print(f'{"rows":>10}{"converted rows/s":>18}{"raw rows/s":>14}{"speedup":>9}')
+    print(f'{len(rowArr):>10}{len(rowArr) / times[0]:>18,.0f}{len(rowArr) / times[1]:>14,.0f}{times[0] / times[1]:>8.1f}x')
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[1])
+    parser.add_argument('--rows', type = int, default = 200_000, help = 'rows of the synthesized table')
+    parser.add_argument('--columns', type = int, default = 24, help = 'columns of the synthesized table')
+    parser.add_argument('--host', default = 'localhost')
+    parser.add_argument('--user', help = 'benchmarks against a server, signing in as this user')
+    parser.add_argument('--password', default = '')
+    parser.add_argument('--query', default = 'SELECT * FROM INFORMATION_SCHEMA.COLUMNS')
+    parser.add_argument('--pure', action = 'store_true', help = 'uses the pure Python connector instead of the C extension')
+    args = parser.parse_args()
+
+    if args.user is None:
+        synthetic(args.rows, args.columns)
+    else:
+        server(args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+'''startupBenchmark
+Measures how long PySQL takes from being launched to first painting
+the sign-in window (time-to-first-paint) and to being ready to sign
+in without waiting on imports (time-to-interactive). Every run is a
+fresh interpreter, so imports are measured cold, as they are upon
+launching main.py. --eager imports the modules the sign-in window
+defers upfront instead, as was once done, for comparison
+
+Run from the src directory with
+    python benchmarks/startupBenchmark.py [--runs N] [--eager]
+
+Without a display, the offscreen platform is used'''
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from os import path
+
+srcDir = path.dirname(path.dirname(path.abspath(__file__)))
+
+
+def child(eager : bool) -> None:
+    '''Starts the application as main.py does, printing the times
+    the sign-in window was first painted and warmed up, then quits
+
+    Parameters
+    ----------
+    eager : bool
+        Whether the deferred modules are imported upfront
+
+    Returns
+    -------
+    None'''
+
+    sys.path.insert(0, srcDir)
+    if eager:
+        import connectionPool, appwindow
+    import signinWindow
+    from PyQt5.QtCore import QEvent, QObject, QTimer
+    from PyQt5.QtGui import QIcon
+    from PyQt5.QtWidgets import QApplication
+
+    times = {}
+
+    class PaintWatcher(QObject):
+        def eventFilter(self, obj, e):
+            if e.type() == QEvent.Paint and 'firstPaint' not in times:
+                QTimer.singleShot(0, lambda: times.setdefault('firstPaint', time.time())) #once flushed, as warmUp is
+            return False
+
+    def finish():
+        times['interactive'] = time.time()
+        print(json.dumps(times), flush = True)
+        app.quit()
+
+    app = QApplication([])
+    app.setWindowIcon(QIcon(f'{srcDir}/assets/icons/logoblack.ico'))
+    app.setStyle('fusion')
+    signIn = signinWindow.SignIn()
+    watcher = PaintWatcher()
+    signIn.installEventFilter(watcher)
+    signIn.warmedUp.connect(finish)
+    QTimer.singleShot(30000, app.quit)
+
+    signIn.show()
+    app.exec()
+
+
+def measure(runs : int, eager : bool) -> list:
+    '''Launches runs fresh interpreters, returning the times to first
+    paint and to interactive of each, in milliseconds
+
+    Parameters
+    ----------
+    runs : int
+    eager : bool
+
+    Returns
+    -------
+    list'''
+
+    env = dict(os.environ)
+    if not env.get('DISPLAY') and not env.get('WAYLAND_DISPLAY') and sys.platform.startswith('linux'):
+        env.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+    results = []
+    for _ in range(runs):
+        start = time.time()
+        output = subprocess.run([sys.executable, path.abspath(__file__), '--child'] + (['--eager'] if eager else []),
+                                env = env, capture_output = True, text = True, check = True).stdout
+        times = json.loads(output.strip().splitlines()[-1])
+        results.append(((times['firstPaint'] - start) * 1000, (times['interactive'] - start) * 1000))
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--runs', type = int, default = 10)
+    parser.add_argument('--eager', action = 'store_true', help = 'also measure importing the deferred modules upfront')
+    parser.add_argument('--child', action = 'store_true', help = argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.eager)
+
+    print(f'{"startup":<10}{"first paint (ms)":>26}{"interactive (ms)":>26}')
+    print(f'{"":<10}{"median":>13}{"min":>13}{"median":>13}{"min":>13}')
+    for label, eager in [('lazy', False)] + ([('eager', True)] if args.eager else []):
+        firstPaints, interactives = zip(*measure(args.runs, eager))
+        print(f'{label:<10}{statistics.median(firstPaints):>13.0f}{min(firstPaints):>13.0f}'
+              f'{statistics.median(interactives):>13.0f}{min(interactives):>13.0f}')
+
+
+if __name__ == '__main__':
+    main()
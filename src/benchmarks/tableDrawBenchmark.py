@@ -0,0 +1,91 @@
+'''tableDrawBenchmark
+Measures the rows drawn per second by the original per-row drawing
+functions of tableDraw against those of TableRenderer, for narrow,
+wide and long tables. Outputs of both are checked to be identical
+
+Run from the src directory with
+    python benchmarks/tableDrawBenchmark.py [--long-rows N]'''
+
+import argparse
+import sys
+import time
+from decimal import Decimal
+from os import path
+
+sys.path.insert(0, path.dirname(path.dirname(path.abspath(__file__))))
+
+from tableDraw import TableRenderer, boundaryDraw, columnWidths, headerDraw, rowDraw
+
+
+def oldDraw(columnWidth : list, headerArr : tuple, rowArr : list) -> str:
+    '''Draws a table the way the console did before TableRenderer
+
+    Parameters
+    ----------
+    columnWidth : list
+    headerArr : tuple
+    rowArr : list
+
+    Returns
+    -------
+    str'''
+
+    returnArr = [headerDraw(columnWidth, headerArr)]
+    for i in rowArr:
+        returnArr.append(rowDraw(columnWidth, i))
+    returnArr.append(boundaryDraw(columnWidth))
+
+    return ''.join(returnArr)
+
+
+def newDraw(columnWidth : list, headerArr : tuple, rowArr : list) -> str:
+    return TableRenderer(columnWidth).draw(headerArr, rowArr)
+
+
+def makeTable(columns : int, rows : int) -> tuple:
+    '''Builds a table of mixed ints, strings, decimals and NULLs
+
+    Parameters
+    ----------
+    columns : int
+    rows : int
+
+    Returns
+    -------
+    tuple'''
+
+    headerArr = tuple(f'column_{i}' for i in range(columns))
+    cells = (lambda r: r, lambda r: f'name {r % 97}', lambda r: Decimal(r) / 8, lambda r: None)
+    rowArr = [tuple(cells[c % 4](r) for c in range(columns)) for r in range(rows)]
+
+    return headerArr, rowArr
+
+
+def timeDraw(drawFunc, columnWidth : list, headerArr : tuple, rowArr : list) -> tuple:
+    start = time.perf_counter()
+    output = drawFunc(columnWidth, headerArr, rowArr)
+
+    return time.perf_counter() - start, output
+
+
+def main():
+    parser = argparse.ArgumentParser(description = __doc__.splitlines()[1])
+    parser.add_argument('--long-rows', type = int, default = 1_000_000, help = 'rows in the long table')
+    args = parser.parse_args()
+
+    cases = (('narrow', 4, 100_000), ('wide', 60, 20_000), ('long', 6, args.long_rows))
+    print(f'{"table":<8}{"columns":>9}{"rows":>10}{"old rows/s":>14}{"new rows/s":>14}{"speedup":>9}')
+
+    for name, columns, rows in cases:
+        headerArr, rowArr = makeTable(columns, rows)
+        columnWidth = columnWidths(headerArr, rowArr)
+
+        oldTime, oldOutput = timeDraw(oldDraw, columnWidth, headerArr, rowArr)
+        newTime, newOutput = timeDraw(newDraw, columnWidth, headerArr, rowArr)
+        assert oldOutput == newOutput, f'output of the {name} table differs'
+
+        print(f'{name:<8}{columns:>9}{rows:>10}{rows / oldTime:>14,.0f}{rows / newTime:>14,.0f}{oldTime / newTime:>8.1f}x')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,414 @@
+'''commandHistory
+Contains the command history kept across sessions. Queries are
+appended to a file on disk by a background thread, and are indexed
+in memory so that even a history of hundreds of thousands of
+queries can be searched as the user types'''
+
+import json
+import os
+import queue
+import re
+import threading
+from bisect import bisect_left, bisect_right
+from collections import OrderedDict
+
+tokenPattern = re.compile(r'\w+')
+
+
+def newestFirst(ids : list, before : int):
+    '''Yields the ids of a list in increasing order that are below
+    before, in decreasing order
+
+    Parameters
+    ----------
+    ids : list
+    before : int
+
+    Returns
+    -------
+    generator'''
+
+    for i in range(bisect_left(ids, before) - 1, -1, -1):
+        yield ids[i]
+
+
+def contains(ids : list, entryId : int) -> bool:
+    '''Returns whether a list of ids in increasing order holds entryId
+
+    Parameters
+    ----------
+    ids : list
+    entryId : int
+
+    Returns
+    -------
+    bool'''
+
+    i = bisect_left(ids, entryId)
+    return i < len(ids) and ids[i] == entryId
+
+
+
+class TokenTrie:
+    '''A prefix trie over the tokens of the history. Every node lists
+    the ids of the queries holding a token below it, so that the
+    queries with a token beginning with a prefix are found in time
+    proportional to the prefix's length alone, however many tokens
+    begin with it
+
+    Attributes
+    ----------
+    root : dict
+        The root node. Nodes are dicts of child nodes, keyed by
+        character, with the ids of the queries below them listed in
+        increasing order under None'''
+
+    def __init__(self):
+        self.root = {None : []}
+
+
+    def add(self, token : str, entryId : int) -> None:
+        '''Lists a query under every node on the path of one of its
+        tokens. Ids are to be added in increasing order
+
+        Parameters
+        ----------
+        token : str
+        entryId : int
+
+        Returns
+        -------
+        None'''
+
+        node = self.root
+        for char in token:
+            child = node.get(char)
+            if child is None:
+                child = node[char] = {None : []}
+            node = child
+
+            ids = node[None]
+            if ids == [] or ids[-1] != entryId: #listed once, however many of its tokens share the node
+                ids.append(entryId)
+
+
+    def withPrefix(self, prefix : str) -> list:
+        '''Returns the ids of the queries holding a token beginning
+        with prefix, in increasing order
+
+        Parameters
+        ----------
+        prefix : str
+
+        Returns
+        -------
+        list'''
+
+        node = self.root
+        for char in prefix:
+            node = node.get(char)
+            if node is None:
+                return []
+
+        return node[None]
+
+
+    def compact(self, live : dict) -> None:
+        '''Cleans the ids not in live out of every node, dropping the
+        nodes left without any
+
+        Parameters
+        ----------
+        live : dict
+            The queries kept, keyed by id
+
+        Returns
+        -------
+        None'''
+
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            for char in [char for char in node if char is not None]:
+                child = node[char]
+                child[None] = [entryId for entryId in child[None] if entryId in live]
+                if child[None] == []:
+                    del node[char]
+                else:
+                    nodes.append(child)
+
+
+
+class CommandHistory:
+    '''Keeps every query entered, oldest first, without duplicates: a
+    query entered again is moved to the end. Once maxEntries is
+    exceeded, the oldest queries are forgotten
+
+    The history file is append-only, holding one JSON string per
+    line. Later lines win upon loading, and the file is compacted
+    by the writer thread once it grows well past the history itself
+
+    Every query is given an id, increasing with time. Ids are listed
+    in order, and per node of a trie over the tokens, so that the
+    latest queries matching a search are found by walking the
+    shortest of those lists backwards. Ids of forgotten queries are
+    skipped over, and cleaned out once they make up half of the
+    lists
+
+    Attributes
+    ----------
+    path : str
+        The history file
+    maxEntries : int
+        The maximum number of queries kept
+    entries : OrderedDict
+        Queries keyed by id, oldest first
+    ids : dict
+        Ids keyed by query
+    order : list
+        Every id given out, in increasing order, including those of
+        forgotten queries
+    trie : TokenTrie
+        The tokens of the history, listing the ids of the queries
+        holding them
+    nextId : int
+        The id given to the next query added
+    fileLines : int
+        The number of lines in the history file
+    ready : threading.Event
+        Set once the history file has been loaded
+    writes : queue.Queue
+        Lines to be appended to the history file, or lists of
+        queries the file is to be rewritten with
+    writer : threading.Thread
+        Appends lines to the history file'''
+
+    def __init__(self, path : str, maxEntries : int = 100000):
+        self.path = path
+        self.maxEntries = maxEntries
+        self.entries = OrderedDict()
+        self.ids = {}
+        self.order = []
+        self.trie = TokenTrie()
+        self.nextId = 0
+        self.fileLines = 0
+        self.ready = threading.Event()
+        self.writes = queue.Queue()
+        self.writer = threading.Thread(target = self.writeLines, daemon = True)
+
+
+    def load(self) -> None:
+        '''Starts loading the history file and the writer thread in
+        the background. Methods wait for loading to finish, should
+        they be called before it has
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        def read():
+            try:
+                if os.path.exists(self.path):
+                    with open(self.path, 'r', encoding = 'utf-8') as history:
+                        for line in history:
+                            self.fileLines += 1
+                            try:
+                                self.index(json.loads(line))
+                            except ValueError: #a line cut short by a crash
+                                continue
+            finally:
+                self.ready.set()
+                self.writer.start()
+
+        threading.Thread(target = read, daemon = True).start()
+
+
+    def add(self, text : str) -> None:
+        '''Adds a query to the end of the history, and queues it to
+        be appended to the history file
+
+        Parameters
+        ----------
+        text : str
+
+        Returns
+        -------
+        None'''
+
+        self.ready.wait()
+        if text == '' or (self.entries and next(reversed(self.entries.values())) == text):
+            return None
+
+        self.index(text)
+        self.writes.put(json.dumps(text))
+        self.fileLines += 1
+
+        if self.fileLines > 2 * max(self.maxEntries, 1000): #rewritten with the live queries alone
+            self.writes.put(list(self.entries.values()))
+            self.fileLines = len(self.entries)
+
+
+    def index(self, text : str) -> None:
+        '''Adds a query to the end of the in-memory history, forgetting
+        its previous occurrence and the oldest queries past
+        maxEntries
+
+        Parameters
+        ----------
+        text : str
+
+        Returns
+        -------
+        None'''
+
+        if text in self.ids:
+            del self.entries[self.ids[text]]
+
+        entryId = self.nextId
+        self.nextId += 1
+        self.entries[entryId] = text
+        self.ids[text] = entryId
+        self.order.append(entryId)
+
+        for token in set(tokenPattern.findall(text.lower())):
+            self.trie.add(token, entryId)
+
+        while len(self.entries) > max(self.maxEntries, 1):
+            del self.ids[self.entries.popitem(last = False)[1]]
+
+        if len(self.order) > 2 * len(self.entries) + 1000:
+            self.compact()
+
+
+    def compact(self) -> None:
+        '''Cleans the ids of forgotten queries out of order and the
+        trie
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.order = list(self.entries)
+        self.trie.compact(self.entries)
+
+
+    def step(self, entryId : int, older : bool) -> tuple:
+        '''Returns the query right before or after the query of id
+        entryId, for flipping through the history one query at a
+        time
+
+        Parameters
+        ----------
+        entryId : int
+            The id of the query stepped from. nextId steps from past
+            the newest query
+        older : bool
+            Whether to step back in time, as opposed to forward
+
+        Returns
+        -------
+        tuple
+            The id and text of the query, or (nextId, '') should
+            there be none'''
+
+        self.ready.wait()
+        if older:
+            for i in range(bisect_left(self.order, entryId) - 1, -1, -1):
+                if self.order[i] in self.entries:
+                    return self.order[i], self.entries[self.order[i]]
+        else:
+            for i in range(bisect_right(self.order, entryId), len(self.order)):
+                if self.order[i] in self.entries:
+                    return self.order[i], self.entries[self.order[i]]
+
+        return self.nextId, ''
+
+
+    def search(self, text : str, before : int = None, limit : int = 1) -> list:
+        '''Returns the latest queries matching a search, newest first.
+        A query matches should every word of the search begin some
+        word of the query, regardless of case
+
+        Parameters
+        ----------
+        text : str
+            The search
+        before : int
+            Only queries with ids below before are considered, so as
+            to find older matches than one already found
+        limit : int
+            The maximum number of queries returned
+
+        Returns
+        -------
+        list
+            (id, text) pairs'''
+
+        self.ready.wait()
+        before = self.nextId if before is None else before
+        lists = sorted((self.trie.withPrefix(term) for term in set(tokenPattern.findall(text.lower()))), key = len)
+        rarest, others = (lists[0], lists[1 : ]) if lists else (self.order, [])
+
+        found = []
+        for entryId in newestFirst(rarest, before):
+            if entryId in self.entries and all(contains(ids, entryId) for ids in others): #unless forgotten
+                found.append((entryId, self.entries[entryId]))
+                if len(found) == limit:
+                    break
+
+        return found
+
+
+    def writeLines(self) -> None:
+        '''Appends queued lines to the history file, or rewrites it
+        with a queued list of queries, until None is queued. Runs in
+        the writer thread
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        while True:
+            item = self.writes.get()
+            if item is None:
+                return None
+
+            try:
+                if isinstance(item, list):
+                    with open(f'{self.path}.tmp', 'w', encoding = 'utf-8') as history:
+                        history.writelines(f'{json.dumps(text)}\n' for text in item)
+                    os.replace(f'{self.path}.tmp', self.path)
+                    continue
+
+                lines = [item]
+                while not self.writes.empty() and isinstance(self.writes.queue[0], str): #written together when queued together
+                    lines.append(self.writes.get())
+                with open(self.path, 'a', encoding = 'utf-8') as history:
+                    history.writelines(f'{line}\n' for line in lines)
+
+            except OSError: #the history is still kept in memory
+                pass
+
+
+    def close(self) -> None:
+        '''Waits for the writer thread to write every queued line
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        if self.writer.is_alive():
+            self.writes.put(None)
+            self.writer.join(5)
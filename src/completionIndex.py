@@ -0,0 +1,305 @@
+'''completionIndex
+Contains the prefix tries completions are looked up in, and the
+snapshot of the server's schemas, tables and columns they are filled
+from. Looking up a prefix walks at most a few trie nodes and then
+slices a sorted list, so it takes microseconds even with hundreds of
+thousands of columns'''
+
+import re
+import time
+from bisect import bisect_left, bisect_right
+from queryPlan import tableAliases
+
+currentWord = re.compile(r'(?:(`[^`]*`|[\w$]+)\.)?(`?[\w$]*)$') #an optionally qualified word, up to the cursor
+keywordToken = re.compile(r'[A-Za-z_]+')
+clauseKeywords = {'SELECT', 'FROM', 'JOIN', 'WHERE', 'ON', 'USING', 'SET', 'INTO', 'UPDATE', 'TABLE', 'TRUNCATE', 'DESCRIBE',
+                  'DESC', 'BY', 'HAVING', 'AND', 'OR', 'NOT', 'VALUES', 'USE', 'DATABASE', 'SCHEMA', 'CASE', 'WHEN', 'THEN', 'ELSE'}
+tableKeywords = {'FROM', 'JOIN', 'INTO', 'UPDATE', 'TABLE', 'TRUNCATE'} #clauses naming tables
+schemaKeywords = {'USE', 'DATABASE', 'SCHEMA'} #clauses naming schemas
+
+schemasQuery = 'SELECT SCHEMA_NAME FROM INFORMATION_SCHEMA.SCHEMATA'
+tablesQuery = 'SELECT TABLE_SCHEMA, TABLE_NAME FROM INFORMATION_SCHEMA.TABLES'
+columnsQuery = 'SELECT TABLE_SCHEMA, TABLE_NAME, COLUMN_NAME FROM INFORMATION_SCHEMA.COLUMNS ORDER BY TABLE_SCHEMA, TABLE_NAME, ORDINAL_POSITION'
+
+
+class PrefixTrie:
+    '''A burst trie of names. Names are kept in a list sorted by
+    their lower cased form, and each trie node maps a character to
+    the range of that list starting with the prefix so far, along
+    with its own child node. Ranges of bucketSize names or fewer
+    have no child node, and are narrowed down by bisection instead,
+    which keeps the trie to a handful of nodes per bucketSize names
+
+    Attributes
+    ----------
+    bucketSize : int
+        The number of names past which a range is split into
+        child nodes
+    keys : list
+        The lower cased names, sorted
+    names : list
+        The names as given, in the order of keys
+    root : dict
+        Maps characters to (start, end, child) tuples, None should
+        there be bucketSize names or fewer'''
+
+    bucketSize = 64
+
+    def __init__(self, names):
+        pairs = sorted({name.lower() : name for name in names}.items()) #case insensitively distinct
+        self.keys = [key for key, _ in pairs]
+        self.names = [name for _, name in pairs]
+        self.root = self.build(0, len(self.keys), 0)
+
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+
+    def build(self, start : int, end : int, depth : int):
+        '''Returns the node for the keys from start up to end, which
+        share their first depth characters
+
+        Parameters
+        ----------
+        start : int
+        end : int
+        depth : int
+
+        Returns
+        -------
+        dict
+            None should the range be small enough to bisect'''
+
+        if end - start <= self.bucketSize:
+            return None
+
+        node = {}
+        i = start
+        while i < end and len(self.keys[i]) <= depth: #keys no longer than the prefix sort first
+            i += 1
+        while i < end:
+            prefix = self.keys[i][ : depth + 1]
+            j = bisect_right(self.keys, prefix + '\uffff', i, end)
+            node[prefix[-1]] = (i, j, self.build(i, j, depth + 1))
+            i = j
+
+        return node
+
+
+    def lookup(self, prefix : str, limit : int = 50) -> list:
+        '''Returns up to limit names starting with prefix, case
+        insensitively, in alphabetical order
+
+        Parameters
+        ----------
+        prefix : str
+        limit : int
+
+        Returns
+        -------
+        list'''
+
+        prefix = prefix.lower()
+        start, end, node = 0, len(self.keys), self.root
+        for char in prefix:
+            if node is None:
+                break
+            if char not in node:
+                return []
+            start, end, node = node[char]
+
+        start = bisect_left(self.keys, prefix, start, end)
+        end = bisect_right(self.keys, prefix + '\uffff', start, end)
+        return self.names[start : min(end, start + limit)]
+
+
+
+class MetadataSnapshot:
+    '''The keywords, schemas, tables and columns completions are
+    drawn from, as of builtAt. Snapshots are never modified once
+    built, so one can be swapped for a newer one in a single
+    assignment while completions are being looked up
+
+    Attributes
+    ----------
+    keywords : PrefixTrie
+    schemas : PrefixTrie
+    tables : dict
+        Maps lower cased schemas to a PrefixTrie of their tables
+    columns : dict
+        Maps lower cased (schema, table) pairs to a PrefixTrie of
+        their columns
+    schemaColumns : dict
+        Maps lower cased schemas to a PrefixTrie of the columns of
+        every table of theirs
+    builtAt : float'''
+
+    def __init__(self, keywords, schemas = (), tables = (), columns = ()):
+        '''
+        Parameters
+        ----------
+        keywords
+            The keywords
+        schemas
+            The schema names
+        tables
+            (schema, table) pairs
+        columns
+            (schema, table, column) tuples, grouped by table'''
+
+        self.keywords = PrefixTrie(keywords)
+        self.schemas = PrefixTrie(schemas)
+
+        grouped = {}
+        for schema, table in tables:
+            grouped.setdefault(schema.lower(), []).append(table)
+        self.tables = {schema : PrefixTrie(names) for schema, names in grouped.items()}
+
+        grouped, bySchema = {}, {}
+        for schema, table, column in columns:
+            grouped.setdefault((schema.lower(), table.lower()), []).append(column)
+            bySchema.setdefault(schema.lower(), set()).add(column)
+        self.columns = {key : PrefixTrie(names) for key, names in grouped.items()}
+        self.schemaColumns = {schema : PrefixTrie(names) for schema, names in bySchema.items()}
+
+        self.builtAt = time.time()
+
+
+    def tableColumns(self, name : str, database : str) -> PrefixTrie:
+        '''Returns the columns of a possibly schema qualified table,
+        None should the table be unknown
+
+        Parameters
+        ----------
+        name : str
+        database : str
+            The schema unqualified tables are looked up in
+
+        Returns
+        -------
+        PrefixTrie'''
+
+        schema, _, table = name.replace('`', '').rpartition('.')
+        return self.columns.get(((schema or database or '').lower(), table.lower()))
+
+
+
+def readSnapshot(connection, keywords, batchSize : int = 5000) -> MetadataSnapshot:
+    '''Reads a snapshot of the server's schemas, tables and columns
+    from INFORMATION_SCHEMA. Rows are fetched batchSize at a time
+
+    Parameters
+    ----------
+    connection
+    keywords
+    batchSize : int
+
+    Returns
+    -------
+    MetadataSnapshot'''
+
+    def rows(query):
+        cursor.execute(query)
+        while batch := cursor.fetchmany(batchSize):
+            yield from ((*map(str, row),) for row in batch)
+
+    cursor = connection.cursor()
+    try:
+        schemas = [schema for schema, in rows(schemasQuery)]
+        tables = list(rows(tablesQuery))
+        columns = list(rows(columnsQuery))
+    finally:
+        cursor.close()
+
+    return MetadataSnapshot(keywords, schemas, tables, columns)
+
+
+def completionContext(text : str) -> tuple:
+    '''Returns what the word being typed at the end of text names
+
+    Parameters
+    ----------
+    text : str
+        The text up to the cursor
+
+    Returns
+    -------
+    tuple
+        The context (qualified, schema, table or column), the
+        qualifier before the dot, if any, and the word typed so
+        far'''
+
+    match = currentWord.search(text)
+    qualifier, word = match.group(1), match.group(2).lstrip('`')
+    if qualifier is not None:
+        return 'qualified', qualifier.strip('`'), word
+
+    before = keywordToken.findall(text[max(0, match.start() - 2000) : match.start()])
+    clause = next((token.upper() for token in reversed(before) if token.upper() in clauseKeywords), '')
+    if clause in schemaKeywords:
+        return 'schema', None, word
+    if clause in tableKeywords or (clause in ('DESC', 'DESCRIBE') and before[0].upper() == clause):
+        return 'table', None, word
+
+    return 'column', None, word
+
+
+def complete(snapshot : MetadataSnapshot, text : str, statement : str, database : str, limit : int = 50) -> tuple:
+    '''Returns the completions of the word being typed, drawn from
+    whatever its context names. Columns are drawn from the tables the
+    statement reads, should it read any, and from every table of the
+    database otherwise
+
+    Parameters
+    ----------
+    snapshot : MetadataSnapshot
+    text : str
+        The statement up to the cursor
+    statement : str
+        The whole statement, as tables may be named past the cursor
+    database : str
+        The current database
+    limit : int
+
+    Returns
+    -------
+    tuple
+        The word typed so far, and a list of (name, kind) pairs'''
+
+    context, qualifier, word = completionContext(text)
+    sources = [] #(trie, kind) pairs, drawn from in order
+
+    if context == 'qualified':
+        aliases = {alias.lower() : table for alias, table in tableAliases(statement).items()}
+        columns = snapshot.tableColumns(aliases.get(qualifier.lower(), qualifier), database)
+        if columns is not None:
+            sources.append((columns, 'column'))
+        if qualifier.lower() in snapshot.tables:
+            sources.append((snapshot.tables[qualifier.lower()], 'table'))
+
+    elif context == 'schema':
+        sources.append((snapshot.schemas, 'schema'))
+
+    elif context == 'table':
+        if (database or '').lower() in snapshot.tables:
+            sources.append((snapshot.tables[database.lower()], 'table'))
+        sources.append((snapshot.schemas, 'schema'))
+
+    else:
+        tables = [snapshot.tableColumns(table, database) for table in dict.fromkeys(tableAliases(statement).values())]
+        sources.extend((columns, 'column') for columns in tables if columns is not None)
+        if not sources and (database or '').lower() in snapshot.schemaColumns:
+            sources.append((snapshot.schemaColumns[database.lower()], 'column'))
+        sources.append((snapshot.keywords, 'keyword'))
+
+    completions, seen = [], set()
+    for trie, kind in sources:
+        for name in trie.lookup(word, limit - len(completions)):
+            if name.lower() not in seen:
+                seen.add(name.lower())
+                completions.append((name, kind))
+        if len(completions) >= limit:
+            break
+
+    return word, completions
@@ -0,0 +1,159 @@
+'''connectionPool
+Contains the pool of connections created at sign-in. The interactive
+console checks out one connection for itself, while background work
+(cancelling queries and the like) checks out connections of its own
+instead of opening new ones every time'''
+
+import threading
+import time
+from mysql.connector.pooling import MySQLConnectionPool, PooledMySQLConnection
+from mysql.connector.errors import PoolError
+
+
+class ConnectionPool(MySQLConnectionPool):
+    '''Inherits MySQLConnectionPool
+    Starts out with minSize connections and grows up to maxSize as
+    demand requires. Once maxSize connections are checked out,
+    checkout() waits for one to be checked back in rather than
+    failing outright
+
+    Connections are checked back in by calling close() on them
+
+    Attributes
+    ----------
+    minSize : int
+        The number of connections opened upfront
+    maxSize : int
+        The maximum number of connections the pool can hold
+    timeout : float
+        The default number of seconds checkout() waits for a
+        connection before raising a PoolError
+    created : int
+        The number of connections opened by the pool
+    hits : int
+        The number of checkouts served by an already idle connection
+    waits : int
+        The number of checkouts that had to wait for a checkin
+    checkedOut : int
+        The number of connections currently checked out
+    available : threading.Condition
+        Notified whenever a connection is checked back in'''
+
+    def __init__(self, minSize : int = 1, maxSize : int = 5, timeout : float = 10.0, **connParams):
+        super().__init__(pool_size = maxSize, pool_name = 'PySQL')
+        self.set_config(**connParams)
+        self.minSize = max(1, min(minSize, maxSize))
+        self.maxSize = maxSize
+        self.timeout = timeout
+
+        self.created = 0
+        self.hits = 0
+        self.waits = 0
+        self.checkedOut = 0
+        self.available = threading.Condition()
+
+        for _ in range(self.minSize):
+            self.createConnection()
+
+
+    def createConnection(self) -> None:
+        '''Opens a new connection and adds it to the idle connections
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        super().add_connection()
+        with self.available:
+            self.created += 1
+
+
+    def add_connection(self, cnx = None) -> None:
+        '''Overrides add_connection
+        Called by PooledMySQLConnection.close() upon checkin, wakes
+        up a checkout waiting for a connection
+
+        Parameters
+        ----------
+        cnx : MySQLConnection
+            The connection being checked in
+
+        Returns
+        -------
+        None'''
+
+        if cnx is None:
+            self.createConnection()
+            return None
+
+        super().add_connection(cnx)
+        with self.available:
+            self.checkedOut -= 1
+            self.available.notify()
+
+
+    def checkout(self, timeout : float = None) -> PooledMySQLConnection:
+        '''Checks out an idle connection, opening a new one if none
+        are idle and the pool hasn't reached maxSize. Otherwise waits
+        up to timeout seconds for a connection to be checked in
+
+        Parameters
+        ----------
+        timeout : float
+            Overrides the pool's default timeout
+
+        Returns
+        -------
+        PooledMySQLConnection'''
+
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        waited = False
+        opened = False
+
+        with self.available:
+            while True:
+                try:
+                    cnx = self.get_connection()
+                    break
+
+                except PoolError:
+                    if self.created < self.maxSize:
+                        self.createConnection()
+                        opened = True
+                        continue
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise PoolError(f'Timed out waiting for a connection ({self.maxSize} connections in use)')
+
+                    waited = True
+                    self.available.wait(remaining)
+
+            if waited:
+                self.waits += 1
+            elif not opened:
+                self.hits += 1
+            self.checkedOut += 1
+
+        return cnx
+
+
+    def stats(self) -> dict:
+        '''Returns the pool's counters, for diagnostics
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        dict'''
+
+        with self.available:
+            return {
+                'Min Size' : self.minSize, 'Max Size' : self.maxSize,
+                'Checked Out' : self.checkedOut, 'Idle' : self.created - self.checkedOut,
+                'Hits' : self.hits, 'Waits' : self.waits, 'Connections Created' : self.created
+                }
@@ -0,0 +1,319 @@
+'''csvImport
+Contains the bulk import of CSV/TSV files into a table. Files are
+loaded with LOAD DATA LOCAL INFILE where the server allows it, and
+otherwise with multi-row inserts committed a batch at a time.
+Either way, files are streamed rather than read into memory'''
+
+import csv
+import os
+import threading
+import sqlUtils
+
+localInfileErrnos = {1148, 2068, 3948, 3950} #LOAD DATA LOCAL disallowed by the server or refused by the client
+nullFields = {'NULL', '\\N'} #fields read as NULL, as LOAD DATA does
+
+
+def quoteString(text : str) -> str:
+    '''Returns text as a string literal
+
+    Parameters
+    ----------
+    text : str
+
+    Returns
+    -------
+    str'''
+
+    return "'" + text.replace('\\', '\\\\').replace("'", "\\'").replace('\n', '\\n').replace('\r', '\\r').replace('\t', '\\t') + "'"
+
+
+def sniffDelimiter(path : str, encoding : str = 'utf-8', sampleSize : int = 65536) -> str:
+    '''Guesses the field delimiter of a file from its first bytes.
+    Files named .tsv are taken to be tab separated
+
+    Parameters
+    ----------
+    path : str
+    encoding : str
+    sampleSize : int
+        The number of characters sniffed
+
+    Returns
+    -------
+    str'''
+
+    if path.lower().endswith('.tsv'):
+        return '\t'
+
+    with open(path, 'r', encoding = encoding, newline = '') as sampleFile:
+        sample = sampleFile.read(sampleSize)
+
+    try:
+        return csv.Sniffer().sniff(sample, delimiters = ',\t;|').delimiter
+    except csv.Error: #too little to go by
+        return ','
+
+
+def tableColumns(cursor, table : str) -> list:
+    '''Returns the column names of a table, in order
+
+    Parameters
+    ----------
+    cursor
+    table : str
+
+    Returns
+    -------
+    list'''
+
+    cursor.execute(f'SHOW COLUMNS FROM {sqlUtils.quoteName(table)}')
+    return [row[0] for row in cursor.fetchall()]
+
+
+def mapColumns(header : list, columns : list, fieldCount : int) -> list:
+    '''Maps the fields of a file to the columns of a table. Fields
+    are matched by name, regardless of case, should the file have a
+    header, and by position otherwise
+
+    Parameters
+    ----------
+    header : list
+        The field names, None should the file have no header
+    columns : list
+        The column names of the table
+    fieldCount : int
+        The number of fields per row
+
+    Returns
+    -------
+    list
+        The column each field is loaded into, None for fields that
+        are skipped'''
+
+    if header is None:
+        mapping = [columns[i] if i < len(columns) else None for i in range(fieldCount)]
+    else:
+        lookup = {column.lower() : column for column in columns}
+        mapping = [lookup.get(name.strip().lower()) for name in header]
+
+    if not any(mapping):
+        raise ValueError('No field of the file matches a column of the table')
+
+    return mapping
+
+
+def countedLines(binaryFile, encoding : str, counter : list):
+    '''Yields the decoded lines of a file opened in binary mode,
+    adding the number of bytes read to counter[0]
+
+    Parameters
+    ----------
+    binaryFile
+    encoding : str
+    counter : list
+
+    Returns
+    -------
+    generator'''
+
+    for line in binaryFile:
+        counter[0] += len(line)
+        yield line.decode(encoding)
+
+
+class CsvImport:
+    '''Imports a CSV/TSV file into a table over a connection of its
+    own, reporting progress through a callback
+
+    Attributes
+    ----------
+    path : str
+        The file imported
+    table : str
+        The table imported into
+    delimiter : str
+        The field delimiter, sniffed from the file should it be None
+    header : bool
+        Whether the first row of the file holds field names
+    mapping : list
+        The column each field is loaded into, None for fields that
+        are skipped. Inferred from the header or the table's columns
+        should it be None
+    batchSize : int
+        The number of rows per multi-row insert, each committed on
+        its own
+    useLoadData : bool
+        Whether to try LOAD DATA LOCAL INFILE before falling back to
+        multi-row inserts
+    encoding : str
+        The encoding of the file
+    size : int
+        The size of the file in bytes
+    rows : int
+        The number of rows imported so far
+    method : str
+        How the file was loaded, LOAD DATA or INSERT
+    cancelled : threading.Event
+        Set to stop the import after the batch at hand'''
+
+    def __init__(self, path : str, table : str, delimiter : str = None, header : bool = True, mapping : list = None,
+                 batchSize : int = 1000, useLoadData : bool = True, encoding : str = 'utf-8'):
+        self.path = path
+        self.table = table
+        self.delimiter = delimiter
+        self.header = header
+        self.mapping = mapping
+        self.batchSize = max(1, batchSize)
+        self.useLoadData = useLoadData
+        self.encoding = encoding
+        self.size = os.path.getsize(path)
+        self.rows = 0
+        self.method = ''
+        self.cancelled = threading.Event()
+
+
+    def run(self, connection, progress = None) -> int:
+        '''Imports the file. Rows committed before an error are kept
+
+        Parameters
+        ----------
+        connection
+            A connection to the table's database, opened with
+            allow_local_infile should LOAD DATA be used
+        progress : func
+            Called with the rows imported and bytes read so far,
+            after every batch
+
+        Returns
+        -------
+        int
+            The number of rows imported'''
+
+        if self.delimiter is None:
+            self.delimiter = sniffDelimiter(self.path, self.encoding)
+
+        cursor = connection.cursor()
+        columns = tableColumns(cursor, self.table)
+
+        with open(self.path, 'r', encoding = self.encoding, newline = '') as sampleFile:
+            firstRow = next(csv.reader(sampleFile, delimiter = self.delimiter), [])
+            sampleFile.seek(0)
+            lineEnd = '\r\n' if '\r\n' in sampleFile.read(65536) else '\n'
+
+        if self.mapping is None:
+            self.mapping = mapColumns(firstRow if self.header else None, columns, len(firstRow))
+
+        if self.useLoadData:
+            try:
+                return self.loadData(connection, cursor, lineEnd, progress)
+
+            except Exception as e:
+                if getattr(e, 'errno', None) not in localInfileErrnos:
+                    raise
+                connection.rollback()
+
+        return self.insertBatches(connection, cursor, progress)
+
+
+    def loadData(self, connection, cursor, lineEnd : str, progress) -> int:
+        '''Imports the file with LOAD DATA LOCAL INFILE, in a single
+        transaction. The connector streams the file to the server
+
+        Parameters
+        ----------
+        connection
+        cursor
+        lineEnd : str
+            The line terminator of the file
+        progress : func
+
+        Returns
+        -------
+        int'''
+
+        self.method = 'LOAD DATA'
+        targets = ', '.join(sqlUtils.quoteName(column) if column else '@skipped' for column in self.mapping)
+        cursor.execute(
+            f'LOAD DATA LOCAL INFILE {quoteString(os.path.abspath(self.path))} INTO TABLE {sqlUtils.quoteName(self.table)} '
+            f'{"CHARACTER SET utf8mb4 " if self.encoding.replace("-", "").lower() == "utf8" else ""}'
+            f"FIELDS TERMINATED BY {quoteString(self.delimiter)} OPTIONALLY ENCLOSED BY '\"' ESCAPED BY '' "
+            f'LINES TERMINATED BY {quoteString(lineEnd)} {"IGNORE 1 LINES " if self.header else ""}({targets})'
+            )
+        connection.commit()
+
+        self.rows = max(cursor.rowcount, 0)
+        if progress is not None:
+            progress(self.rows, self.size)
+
+        return self.rows
+
+
+    def insertBatches(self, connection, cursor, progress) -> int:
+        '''Imports the file with multi-row inserts of batchSize rows,
+        committing every batch
+
+        Parameters
+        ----------
+        connection
+        cursor
+        progress : func
+
+        Returns
+        -------
+        int'''
+
+        self.method = 'INSERT'
+        kept = [i for i, column in enumerate(self.mapping) if column]
+        statement = (f'INSERT INTO {sqlUtils.quoteName(self.table)} ({", ".join(sqlUtils.quoteName(self.mapping[i]) for i in kept)}) '
+                     f'VALUES ({", ".join(["%s"] * len(kept))})')
+
+        bytesRead = [0]
+        with open(self.path, 'rb') as binaryFile:
+            reader = csv.reader(countedLines(binaryFile, self.encoding, bytesRead), delimiter = self.delimiter)
+            if self.header:
+                next(reader, None)
+
+            batch = []
+            for row in reader:
+                if row == []: #a blank line
+                    continue
+                if len(row) != len(self.mapping):
+                    raise ValueError(f'Row {self.rows + len(batch) + 1} has {len(row)} fields, {len(self.mapping)} were expected')
+
+                batch.append(tuple(None if row[i] in nullFields else row[i] for i in kept))
+                if len(batch) >= self.batchSize:
+                    self.insertBatch(connection, cursor, statement, batch)
+                    if progress is not None:
+                        progress(self.rows, bytesRead[0])
+
+            self.insertBatch(connection, cursor, statement, batch)
+            if progress is not None:
+                progress(self.rows, bytesRead[0])
+
+        return self.rows
+
+
+    def insertBatch(self, connection, cursor, statement : str, batch : list) -> None:
+        '''Inserts and commits a batch of rows, then empties it
+
+        Parameters
+        ----------
+        connection
+        cursor
+        statement : str
+            The insert, with a placeholder per column
+        batch : list
+            The rows
+
+        Returns
+        -------
+        None'''
+
+        if self.cancelled.is_set():
+            raise InterruptedError('Cancelled')
+
+        if batch:
+            cursor.executemany(statement, batch) #rewritten by the connector into a single multi-row insert
+            connection.commit()
+            self.rows += len(batch)
+            batch.clear()
@@ -0,0 +1,242 @@
+'''exportWizard
+A file used to store the ExportDialog class, which prompts for the
+query to export and the file to export it to, along with the
+ExportJob class, which runs the export in the background on a
+connection of its own'''
+
+import os
+import threading
+import time
+import mysql.connector
+import sqlUtils
+from resultExport import ResultExport, formats
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import (
+
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QFormLayout,
+    QHBoxLayout,
+    QLineEdit,
+    QPlainTextEdit,
+    QPushButton,
+    QSpinBox,
+)
+
+
+class ExportDialog(QDialog):
+    '''Inherits QDialog
+    A modal dialog prompting for the query to export, the file to
+    export it to and the format to write it in
+
+    Attributes
+    ----------
+    queryEntry : QPlainTextEdit
+        The query to export
+    pathEntry : QLineEdit
+        The file to export to
+    formatComboBox : QComboBox
+        The format to write
+    gzipCheckBox : QCheckBox
+        Whether to gzip the file
+    tableEntry : QLineEdit
+        The table named in INSERT statements
+    batchSizeSpinBox : QSpinBox
+        The number of rows fetched at a time
+
+    Methods
+    -------
+    browse
+        Prompts for the file to export to
+    updatePath
+        Matches the extension of the file to the format and gzipping
+        chosen
+    exporter
+        Returns a ResultExport set up as the dialog's fields describe'''
+
+    def __init__(self, window, query : str = ''):
+        super().__init__(window)
+
+        self.setWindowTitle('Export Query')
+        self.setMinimumWidth(600)
+        self.layout = QFormLayout()
+        self.setLayout(self.layout)
+
+        self.queryEntry = QPlainTextEdit(query)
+
+        self.pathEntry = QLineEdit()
+        browseButton = QPushButton('Browse...')
+        browseButton.clicked.connect(self.browse)
+        pathLayout = QHBoxLayout()
+        pathLayout.addWidget(self.pathEntry)
+        pathLayout.addWidget(browseButton)
+
+        self.formatComboBox = QComboBox()
+        self.formatComboBox.addItems(formats.keys())
+        self.formatComboBox.currentTextChanged.connect(self.updatePath)
+
+        self.gzipCheckBox = QCheckBox()
+        self.gzipCheckBox.toggled.connect(self.updatePath)
+
+        tables = sorted(sqlUtils.tablesIn(query))
+        self.tableEntry = QLineEdit(tables[0] if tables else 'exported')
+
+        self.batchSizeSpinBox = QSpinBox()
+        self.batchSizeSpinBox.setRange(1, 1000000)
+        self.batchSizeSpinBox.setValue(5000)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        self.layout.addRow('Query', self.queryEntry)
+        self.layout.addRow('File', pathLayout)
+        self.layout.addRow('Format', self.formatComboBox)
+        self.layout.addRow('Gzip', self.gzipCheckBox)
+        self.layout.addRow('Table (SQL INSERT)', self.tableEntry)
+        self.layout.addRow('Rows Per Fetch', self.batchSizeSpinBox)
+        self.layout.addRow(buttons)
+
+
+    def browse(self) -> None:
+        '''Prompts for the file to export to
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        path, _ = QFileDialog.getSaveFileName(self, 'Export Query', self.pathEntry.text(), 'All Files (*)')
+        if path:
+            self.pathEntry.setText(path)
+            self.updatePath()
+
+
+    def updatePath(self) -> None:
+        '''Matches the extension of the file to the format and
+        gzipping chosen
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        path = self.pathEntry.text().strip()
+        if not path:
+            return None
+
+        root = path[:-3] if path.lower().endswith('.gz') else path
+        stem, extension = os.path.splitext(root)
+        if extension.lower() in [extension for _, extension in formats.values()]:
+            root = stem + formats[self.formatComboBox.currentText()][1]
+
+        self.pathEntry.setText(root + ('.gz' if self.gzipCheckBox.isChecked() else ''))
+
+
+    def exporter(self) -> ResultExport:
+        '''Returns a ResultExport set up as the dialog's fields
+        describe
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        ResultExport'''
+
+        return ResultExport(
+            self.queryEntry.toPlainText().strip().rstrip(';'), self.pathEntry.text().strip(),
+            format = self.formatComboBox.currentText(),
+            table = self.tableEntry.text().strip() or 'exported',
+            batchSize = self.batchSizeSpinBox.value()
+            )
+
+
+
+class ExportJob(QObject):
+    '''Inherits QObject
+    Runs a ResultExport in a thread of its own, over a connection of
+    its own, so that neither the window nor the console wait on it.
+    Signals are emitted from that thread, and are queued to the
+    thread of whichever object they are connected to
+
+    Attributes
+    ----------
+    exporter : ResultExport
+        The export being run
+    connParams : dict
+        The parameters to connect with
+    database : str
+        The database to switch to
+    startTime : float
+        The time at which the export was started
+    thread : threading.Thread
+        The thread the export runs in
+
+    Methods
+    -------
+    progress : pyqtSignal
+        A signal that passes along the rows exported so far and the
+        time taken so far
+    finished : pyqtSignal
+        A signal that passes along the file exported to, the rows
+        exported, the time taken and the error message, if any'''
+
+    progress = pyqtSignal(int, float)
+    finished = pyqtSignal(str, int, float, str)
+
+    def __init__(self, exporter : ResultExport, connParams : dict, database : str = None):
+        super().__init__()
+        self.exporter = exporter
+        self.connParams = connParams
+        self.database = database
+        self.startTime = 0.0
+        self.thread = threading.Thread(target = self.run, daemon = True)
+
+
+    def start(self) -> None:
+        '''Starts the export
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.startTime = time.perf_counter()
+        self.thread.start()
+
+
+    def run(self) -> None:
+        '''Connects and runs the export. Runs in the job's thread
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        error = ''
+        try:
+            connection = mysql.connector.connect(**self.connParams)
+            try:
+                if self.database is not None:
+                    connection.database = self.database
+                self.exporter.run(connection, lambda rows: self.progress.emit(rows, time.perf_counter() - self.startTime))
+
+            finally:
+                connection.close()
+
+        except Exception as e:
+            error = str(e)
+
+        self.finished.emit(self.exporter.path, self.exporter.rows, time.perf_counter() - self.startTime, error)
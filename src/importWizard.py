@@ -0,0 +1,227 @@
+'''importWizard
+A file used to store the ImportDialog class, which prompts for the
+details of a CSV/TSV import, along with the ImportJob class, which
+runs the import in the background on a connection of its own'''
+
+import threading
+import time
+import mysql.connector
+from csvImport import CsvImport
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtWidgets import (
+
+    QCheckBox,
+    QComboBox,
+    QDialog,
+    QDialogButtonBox,
+    QFileDialog,
+    QFormLayout,
+    QHBoxLayout,
+    QLineEdit,
+    QPushButton,
+    QSpinBox,
+)
+
+
+class ImportDialog(QDialog):
+    '''Inherits QDialog
+    A modal dialog prompting for the file to import, the table to
+    import it into and how the file is to be read
+
+    Attributes
+    ----------
+    delimiters : dict
+        The field delimiters on offer, keyed by their names. None
+        sniffs the delimiter from the file
+    pathEntry : QLineEdit
+        The file to import
+    tableEntry : QLineEdit
+        The table to import into
+    delimiterComboBox : QComboBox
+        The field delimiter
+    headerCheckBox : QCheckBox
+        Whether the first row of the file holds field names
+    columnsEntry : QLineEdit
+        The column each field is loaded into, comma separated. Left
+        blank, the columns are inferred
+    batchSizeSpinBox : QSpinBox
+        The number of rows per insert, should LOAD DATA not be used
+    loadDataCheckBox : QCheckBox
+        Whether to try LOAD DATA LOCAL INFILE first
+
+    Methods
+    -------
+    browse
+        Prompts for the file to import
+    importer
+        Returns a CsvImport set up as the dialog's fields describe'''
+
+    delimiters = {'Auto' : None, 'Comma' : ',', 'Tab' : '\t', 'Semicolon' : ';', 'Pipe' : '|'}
+
+    def __init__(self, window):
+        super().__init__(window)
+
+        self.setWindowTitle('Import CSV/TSV')
+        self.setMinimumWidth(600)
+        self.layout = QFormLayout()
+        self.setLayout(self.layout)
+
+        self.pathEntry = QLineEdit()
+        browseButton = QPushButton('Browse...')
+        browseButton.clicked.connect(self.browse)
+        pathLayout = QHBoxLayout()
+        pathLayout.addWidget(self.pathEntry)
+        pathLayout.addWidget(browseButton)
+
+        self.tableEntry = QLineEdit()
+        self.tableEntry.setPlaceholderText('table or database.table')
+
+        self.delimiterComboBox = QComboBox()
+        self.delimiterComboBox.addItems(self.delimiters.keys())
+
+        self.headerCheckBox = QCheckBox()
+        self.headerCheckBox.setChecked(True)
+
+        self.columnsEntry = QLineEdit()
+        self.columnsEntry.setPlaceholderText('Blank to infer, empty entries skip a field')
+
+        self.batchSizeSpinBox = QSpinBox()
+        self.batchSizeSpinBox.setRange(1, 100000)
+        self.batchSizeSpinBox.setValue(1000)
+
+        self.loadDataCheckBox = QCheckBox()
+        self.loadDataCheckBox.setChecked(True)
+
+        buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        buttons.accepted.connect(self.accept)
+        buttons.rejected.connect(self.reject)
+
+        self.layout.addRow('File', pathLayout)
+        self.layout.addRow('Table', self.tableEntry)
+        self.layout.addRow('Delimiter', self.delimiterComboBox)
+        self.layout.addRow('First Row Is A Header', self.headerCheckBox)
+        self.layout.addRow('Columns', self.columnsEntry)
+        self.layout.addRow('Rows Per Insert', self.batchSizeSpinBox)
+        self.layout.addRow('Use LOAD DATA When Allowed', self.loadDataCheckBox)
+        self.layout.addRow(buttons)
+
+
+    def browse(self) -> None:
+        '''Prompts for the file to import
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        path, _ = QFileDialog.getOpenFileName(self, 'Import CSV/TSV', '', 'Delimited Files (*.csv *.tsv *.txt);;All Files (*)')
+        if path:
+            self.pathEntry.setText(path)
+
+
+    def importer(self) -> CsvImport:
+        '''Returns a CsvImport set up as the dialog's fields describe
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        CsvImport'''
+
+        columns = self.columnsEntry.text().strip()
+        return CsvImport(
+            self.pathEntry.text().strip(), self.tableEntry.text().strip(),
+            delimiter = self.delimiters[self.delimiterComboBox.currentText()],
+            header = self.headerCheckBox.isChecked(),
+            mapping = [column.strip() or None for column in columns.split(',')] if columns else None,
+            batchSize = self.batchSizeSpinBox.value(),
+            useLoadData = self.loadDataCheckBox.isChecked()
+            )
+
+
+
+class ImportJob(QObject):
+    '''Inherits QObject
+    Runs a CsvImport in a thread of its own, over a connection of its
+    own, so that neither the window nor the console wait on it.
+    Signals are emitted from that thread, and are queued to the
+    thread of whichever object they are connected to
+
+    Attributes
+    ----------
+    importer : CsvImport
+        The import being run
+    connParams : dict
+        The parameters to connect with
+    database : str
+        The database to switch to, should the table not be qualified
+    startTime : float
+        The time at which the import was started
+    thread : threading.Thread
+        The thread the import runs in
+
+    Methods
+    -------
+    progress : pyqtSignal
+        A signal that passes along the rows imported so far, the
+        bytes read so far, the size of the file and the time taken
+        so far
+    finished : pyqtSignal
+        A signal that passes along the table imported into, the rows
+        imported, the time taken, how the file was loaded and the
+        error message, if any'''
+
+    progress = pyqtSignal(int, 'qint64', 'qint64', float)
+    finished = pyqtSignal(str, int, float, str, str)
+
+    def __init__(self, importer : CsvImport, connParams : dict, database : str = None):
+        super().__init__()
+        self.importer = importer
+        self.connParams = connParams
+        self.database = database
+        self.startTime = 0.0
+        self.thread = threading.Thread(target = self.run, daemon = True)
+
+
+    def start(self) -> None:
+        '''Starts the import
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.startTime = time.perf_counter()
+        self.thread.start()
+
+
+    def run(self) -> None:
+        '''Connects and runs the import. Runs in the job's thread
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        error = ''
+        try:
+            connection = mysql.connector.connect(**self.connParams, allow_local_infile = True)
+            try:
+                if self.database is not None:
+                    connection.database = self.database
+                self.importer.run(connection, lambda rows, done: self.progress.emit(rows, done, self.importer.size, time.perf_counter() - self.startTime))
+
+            finally:
+                connection.close()
+
+        except Exception as e:
+            error = str(e)
+
+        self.finished.emit(self.importer.table, self.importer.rows, time.perf_counter() - self.startTime, self.importer.method, error)
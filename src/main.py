@@ -9,12 +9,13 @@ program files included with this file
 
 It is preferred if the user has the Fira Code Medium font installed,
 as opposed to the default monospace fonts found on most systems
-The Open Sans font is also recommended to be installed'''
+The Open Sans font is also recommended to be installed
 
-import signinWindow
+Run with --batch to run statements without the window, see
+batchMode. PyQt5 is then never imported'''
+
+import sys
 from os import path
-from PyQt5.QtGui import QIcon
-from PyQt5.QtWidgets import QApplication
 
 def main():
     '''Instantiates QApplication and runs the event loop
@@ -26,6 +27,10 @@ def main():
     -------
     None'''
 
+    import signinWindow #imported here, so that batch mode never loads Qt
+    from PyQt5.QtGui import QIcon
+    from PyQt5.QtWidgets import QApplication
+
     app = QApplication([])
     app.setWindowIcon(QIcon(f'{path.dirname(path.abspath(__file__))}/assets/icons/logoblack.ico'))
     app.setStyle("fusion")
@@ -35,4 +40,8 @@ def main():
     app.exec()
 
 
+if '--batch' in sys.argv[1:]:
+    import batchMode
+    sys.exit(batchMode.main([arg for arg in sys.argv[1:] if arg != '--batch']))
+
 main()
@@ -0,0 +1,67 @@
+'''parameterDialog
+A file used to store the ParameterDialog class, which prompts for the
+values of the placeholders of a parameterized query'''
+
+from PyQt5.QtWidgets import (
+
+    QDialog,
+    QDialogButtonBox,
+    QFormLayout,
+    QLabel,
+    QLineEdit,
+)
+
+
+class ParameterDialog(QDialog):
+    '''Inherits QDialog
+    A modal dialog with a text entry field per ? placeholder of a
+    query. Values are bound as text, save for NULL which is bound as
+    a NULL
+
+    Attributes
+    ----------
+    entries : list
+        The text entry fields, one per placeholder, in order
+    buttons : QDialogButtonBox
+        Accepts or rejects the dialog
+
+    Methods
+    -------
+    values
+        Returns the entered values, in order'''
+
+    def __init__(self, window, text : str, count : int):
+        super().__init__(window)
+
+        self.setWindowTitle('Query Parameters')
+        self.layout = QFormLayout()
+        self.setLayout(self.layout)
+
+        query = QLabel(text)
+        query.setWordWrap(True)
+        self.layout.addRow(query)
+
+        self.entries = []
+        for i in range(count):
+            entry = QLineEdit()
+            self.entries.append(entry)
+            self.layout.addRow(f'Parameter {i + 1}', entry)
+
+        self.buttons = QDialogButtonBox(QDialogButtonBox.Ok | QDialogButtonBox.Cancel)
+        self.buttons.accepted.connect(self.accept)
+        self.buttons.rejected.connect(self.reject)
+        self.layout.addRow(self.buttons)
+
+
+    def values(self) -> list:
+        '''Returns the entered values, in order. An entry of NULL is
+        returned as None
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        list'''
+
+        return [None if entry.text() == 'NULL' else entry.text() for entry in self.entries]
@@ -0,0 +1,183 @@
+'''planView
+A file used to store the ExplainJob class, which explains a query on
+a connection checked out from the pool, along with the PlanDialog
+class, which displays the plan as a tree'''
+
+import threading
+import queryPlan
+from sqlUtils import quoteName
+from PyQt5.QtCore import QObject, pyqtSignal
+from PyQt5.QtGui import QColor, QFont
+from PyQt5.QtWidgets import (
+
+    QDialog,
+    QHeaderView,
+    QLabel,
+    QPlainTextEdit,
+    QTreeWidget,
+    QTreeWidgetItem,
+    QVBoxLayout,
+)
+
+
+class ExplainJob(QObject):
+    '''Inherits QObject
+    Explains a query in a thread of its own, on a connection checked
+    out from the pool, so that neither the window nor the worker wait
+    on it. Signals are emitted from that thread, and are queued to
+    the thread of whichever object they are connected to
+
+    Attributes
+    ----------
+    pool : ConnectionPool
+        The pool the connection is checked out from
+    database : str
+        The database to switch to
+    text : str
+        The query explained
+    elapsed : float
+        The time the query took to run, should it have been
+        explained for being slow, 0 otherwise
+    thread : threading.Thread
+        The thread the query is explained in
+
+    Methods
+    -------
+    finished : pyqtSignal
+        A signal that passes along the job, the root PlanNode of the
+        plan and the suggested indexes, or the error message should
+        explaining the query have failed'''
+
+    finished = pyqtSignal(object, object, list, str)
+
+    def __init__(self, pool, database : str, text : str, elapsed : float = 0.0):
+        super().__init__()
+        self.pool = pool
+        self.database = database
+        self.text = text
+        self.elapsed = elapsed
+        self.thread = threading.Thread(target = self.run, daemon = True)
+
+
+    def start(self) -> None:
+        '''Starts explaining the query
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.thread.start()
+
+
+    def run(self) -> None:
+        '''Checks out a connection and explains the query. Runs in
+        the job's thread
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        try:
+            connection = self.pool.checkout()
+            try:
+                if self.database is not None: #the pooled wrapper doesn't forward setting database, so USE is sent instead
+                    cursor = connection.cursor()
+                    cursor.execute(f'USE {quoteName(self.database)}')
+                    cursor.close()
+                root, suggestions = queryPlan.explain(connection, self.text)
+
+            finally:
+                connection.close() #checks the connection back in
+
+        except Exception as e:
+            self.finished.emit(self, None, [], str(e))
+            return None
+
+        self.finished.emit(self, root, suggestions, '')
+
+
+
+class PlanDialog(QDialog):
+    '''Inherits QDialog
+    Displays the plan of a query as a tree, operations with warnings
+    (full scans, filesorts and temporary tables) drawn in red, along
+    with the indexes suggested for it
+
+    Attributes
+    ----------
+    warningColor : QColor
+        The color operations with warnings are drawn in
+    tree : QTreeWidget
+        The operations of the plan
+    suggestions : QPlainTextEdit
+        The suggested ALTER TABLE statements, ready to be copied
+
+    Methods
+    -------
+    addNode
+        Adds an operation and those feeding into it to the tree'''
+
+    warningColor = QColor('#FFFF5555')
+
+    def __init__(self, window, text : str, root, suggestions : list):
+        super().__init__(window)
+
+        self.setWindowTitle('Query Plan')
+        self.resize(1000, 600)
+        self.layout = QVBoxLayout()
+        self.setLayout(self.layout)
+
+        query = QLabel(text)
+        query.setWordWrap(True)
+
+        self.tree = QTreeWidget()
+        self.tree.setHeaderLabels(['Operation', 'Access Type', 'Rows', 'Filtered', 'Key', 'Possible Keys', 'Notes', 'Condition'])
+        self.addNode(self.tree.invisibleRootItem(), root)
+        self.tree.expandAll()
+        self.tree.header().setSectionResizeMode(QHeaderView.ResizeToContents)
+
+        self.suggestions = QPlainTextEdit('\n'.join(suggestions) or 'No indexes to suggest')
+        self.suggestions.setReadOnly(True)
+        self.suggestions.setMaximumHeight(120)
+        self.suggestions.setFont(QFont('Fira Code Medium', 10))
+
+        self.layout.addWidget(query)
+        self.layout.addWidget(self.tree)
+        self.layout.addWidget(QLabel('Suggested Indexes'))
+        self.layout.addWidget(self.suggestions)
+
+
+    def addNode(self, parent, node) -> None:
+        '''Adds an operation and those feeding into it to the tree
+
+        Parameters
+        ----------
+        parent : QTreeWidgetItem
+            The item the operation is added under
+        node : PlanNode
+
+        Returns
+        -------
+        None'''
+
+        item = QTreeWidgetItem(parent, [
+            node.label, node.accessType or '', '' if node.rows is None else str(node.rows),
+            '' if node.filtered is None else f'{node.filtered:g}%', node.key or '', ', '.join(node.possibleKeys),
+            ', '.join(node.details + node.warnings), node.condition or ''
+            ])
+
+        if node.warnings:
+            for column in range(item.columnCount()):
+                item.setForeground(column, self.warningColor)
+            font = item.font(0)
+            font.setBold(True)
+            item.setFont(0, font)
+
+        for child in node.children:
+            self.addNode(item, child)
@@ -0,0 +1,357 @@
+'''queryPlan
+Contains the reading of MySQL's EXPLAIN FORMAT=JSON output into a
+tree of operations, each with its access type, estimated rows and
+chosen index, flagging full scans and filesorts. Indexes are
+suggested for the columns full scans filter on that no index starts
+with'''
+
+import json
+import re
+import sqlUtils
+from sqlUtils import quoteName
+
+operations = { #keys of EXPLAIN's JSON that are operations : their labels
+    'query_block' : 'Query Block',
+    'table' : 'Table',
+    'nested_loop' : 'Nested Loop Join',
+    'ordering_operation' : 'Order By',
+    'grouping_operation' : 'Group By',
+    'duplicates_removal' : 'Distinct',
+    'windowing' : 'Window',
+    'union_result' : 'Union',
+    'materialized_from_subquery' : 'Materialized Subquery',
+    'attached_subqueries' : 'Attached Subqueries',
+    'optimized_away_subqueries' : 'Optimized Away Subqueries',
+    'having_subqueries' : 'HAVING Subqueries',
+    'select_list_subqueries' : 'SELECT List Subqueries',
+    'order_by_subqueries' : 'ORDER BY Subqueries',
+    'group_by_subqueries' : 'GROUP BY Subqueries',
+    }
+skippedKeys = {'cost_info', 'used_columns', 'possible_keys', 'used_key_parts', 'ref', 'key_length'} #details, rather than operations
+
+explainable = {'SELECT', 'TABLE', 'WITH', 'INSERT', 'REPLACE', 'UPDATE', 'DELETE'} #statements EXPLAIN accepts
+fullScans = {'ALL' : 'Full table scan', 'index' : 'Full index scan'}
+qualifiedColumn = re.compile(r'`([^`]+)`\.`([^`]+)`\.`([^`]+)`') #as conditions name columns, `database`.`table`.`column`
+aliasKeywords = r'(?:WHERE|ON|USING|JOIN|INNER|LEFT|RIGHT|OUTER|CROSS|NATURAL|STRAIGHT_JOIN|GROUP|ORDER|LIMIT|HAVING|UNION|WINDOW|FOR|LOCK|PARTITION|USE|FORCE|IGNORE)\b'
+tableAlias = re.compile(rf'\b(?:FROM|JOIN)\s+({sqlUtils.tableName.pattern})(?:\s+(?:AS\s+)?(?!{aliasKeywords})(`[^`]+`|[\w$]+))?', re.I)
+
+
+class PlanNode:
+    '''An operation of a query plan
+
+    Attributes
+    ----------
+    label : str
+        What the operation is
+    table : str
+        The table, or its alias, read by a Table operation
+    accessType : str
+        How the table is read, ALL being a full table scan
+    rows : int
+        The estimated rows read per scan of the table
+    key : str
+        The index chosen, if any
+    possibleKeys : list
+        The indexes that could have been chosen
+    filtered : float
+        The estimated percentage of rows left past the condition
+    condition : str
+        The condition rows are filtered on
+    details : list
+        Further notes, such as the cost or the use of a covering
+        index
+    warnings : list
+        Notes that point to a slow plan, such as full scans and
+        filesorts
+    children : list
+        The operations feeding into this one'''
+
+    def __init__(self, label : str):
+        self.label = label
+        self.table = None
+        self.accessType = None
+        self.rows = None
+        self.key = None
+        self.possibleKeys = []
+        self.filtered = None
+        self.condition = None
+        self.details = []
+        self.warnings = []
+        self.children = []
+
+
+def children(value) -> list:
+    '''Returns the operations within a part of EXPLAIN's JSON,
+    passing through keys that aren't operations themselves
+
+    Parameters
+    ----------
+    value : dict or list
+
+    Returns
+    -------
+    list'''
+
+    nodes = []
+    if isinstance(value, list):
+        for item in value:
+            nodes.extend(children(item))
+
+    elif isinstance(value, dict):
+        for key, item in value.items():
+            if key in operations:
+                nodes.append(planNode(key, item))
+            elif key not in skippedKeys and isinstance(item, (dict, list)):
+                nodes.extend(children(item))
+
+    return nodes
+
+
+def planNode(key : str, value) -> PlanNode:
+    '''Returns the operation a key of EXPLAIN's JSON holds, along
+    with the operations within it
+
+    Parameters
+    ----------
+    key : str
+        A key of operations
+    value : dict or list
+
+    Returns
+    -------
+    PlanNode'''
+
+    node = PlanNode(operations[key])
+    details = value if isinstance(value, dict) else {}
+
+    if key == 'query_block':
+        node.label += f' #{details.get("select_id", 1)}'
+        if 'message' in details:
+            node.details.append(details['message'])
+
+    elif key == 'table':
+        node.table = details.get('table_name')
+        node.label += f' {node.table}'
+        node.accessType = details.get('access_type')
+        node.rows = details.get('rows_examined_per_scan')
+        node.key = details.get('key')
+        node.possibleKeys = details.get('possible_keys', [])
+        node.filtered = float(details['filtered']) if 'filtered' in details else None
+        node.condition = details.get('attached_condition')
+        if details.get('using_index'):
+            node.details.append('Using index')
+        if 'using_join_buffer' in details:
+            node.details.append(f'Join buffer ({details["using_join_buffer"]})')
+        if node.accessType in fullScans:
+            node.warnings.append(fullScans[node.accessType])
+
+    if 'query_cost' in details.get('cost_info', {}):
+        node.details.append(f'Cost {details["cost_info"]["query_cost"]}')
+    if details.get('using_filesort'):
+        node.warnings.append('Using filesort')
+    if details.get('using_temporary_table'):
+        node.warnings.append('Using temporary table')
+
+    node.children = children(value)
+    return node
+
+
+def planTree(plan : dict) -> PlanNode:
+    '''Returns the tree of operations of EXPLAIN's JSON
+
+    Parameters
+    ----------
+    plan : dict
+        The parsed output of EXPLAIN FORMAT=JSON
+
+    Returns
+    -------
+    PlanNode'''
+
+    nodes = children(plan)
+    if len(nodes) == 1:
+        return nodes[0]
+
+    root = PlanNode('Query')
+    root.children = nodes
+    return root
+
+
+def walk(node : PlanNode):
+    '''Yields every operation of a tree, depth first
+
+    Parameters
+    ----------
+    node : PlanNode
+
+    Returns
+    -------
+    generator'''
+
+    yield node
+    for child in node.children:
+        yield from walk(child)
+
+
+def tableAliases(text : str) -> dict:
+    '''Returns the tables of a query keyed by their aliases, as the
+    plan only names tables by their aliases
+
+    Parameters
+    ----------
+    text : str
+
+    Returns
+    -------
+    dict'''
+
+    return {(alias or name).rsplit('.', 1)[-1].strip().strip('`') : name.replace('`', '').replace(' ', '')
+            for name, alias in tableAlias.findall(text)}
+
+
+def predicateColumns(condition : str, alias : str) -> list:
+    '''Returns the columns of a table a condition filters on, in the
+    order they are first named in
+
+    Parameters
+    ----------
+    condition : str
+    alias : str
+        The table's alias, as the plan names it
+
+    Returns
+    -------
+    list'''
+
+    columns = []
+    for _, table, column in qualifiedColumn.findall(condition or ''):
+        if table == alias and column not in columns:
+            columns.append(column)
+
+    return columns
+
+
+def leadingColumns(columnNames : tuple, rows : list) -> set:
+    '''Returns the lower cased columns that an index starts with,
+    from the output of SHOW INDEX
+
+    Parameters
+    ----------
+    columnNames : tuple
+    rows : list
+
+    Returns
+    -------
+    set'''
+
+    seq, column = columnNames.index('Seq_in_index'), columnNames.index('Column_name')
+    return {str(row[column]).lower() for row in rows if int(row[seq]) == 1}
+
+
+def suggestIndexes(root : PlanNode, indexes : dict, aliases : dict) -> list:
+    '''Suggests an index for every fully scanned table, on the
+    columns its condition filters on that no index starts with
+
+    Parameters
+    ----------
+    root : PlanNode
+    indexes : dict
+        Maps tables to the columns their indexes start with, None
+        for those whose indexes couldn't be read, which are skipped
+    aliases : dict
+        Maps aliases to tables, as tableAliases returns
+
+    Returns
+    -------
+    list
+        ALTER TABLE statements'''
+
+    suggestions = []
+    for node in walk(root):
+        if node.accessType not in fullScans:
+            continue
+
+        table = aliases.get(node.table, node.table)
+        if table in indexes and indexes[table] is None:
+            continue
+        unindexed = [column for column in predicateColumns(node.condition, node.table) if column.lower() not in indexes.get(table, set())]
+        if unindexed:
+            name = 'idx_' + '_'.join(unindexed[:3])
+            statement = f'ALTER TABLE {quoteName(table)} ADD INDEX {quoteName(name)} ({", ".join(map(quoteName, unindexed[:3]))});'
+            if statement not in suggestions:
+                suggestions.append(statement)
+
+    return suggestions
+
+
+def explain(connection, text : str) -> tuple:
+    '''Explains a query, and suggests indexes for it
+
+    Parameters
+    ----------
+    connection
+        A connection switched to the query's database
+    text : str
+        The query
+
+    Returns
+    -------
+    tuple
+        The PlanNode at the root of the plan, and the suggested
+        ALTER TABLE statements'''
+
+    cursor = connection.cursor()
+    try:
+        cursor.execute(f'EXPLAIN FORMAT=JSON {text.strip().rstrip(";")}')
+        root = planTree(json.loads(cursor.fetchall()[0][0]))
+
+        aliases = tableAliases(text)
+        indexes = {}
+        for node in walk(root):
+            table = aliases.get(node.table, node.table)
+            if node.accessType in fullScans and table not in indexes:
+                try:
+                    cursor.execute(f'SHOW INDEX FROM {quoteName(table)}')
+                    indexes[table] = leadingColumns(tuple(cursor.column_names), cursor.fetchall())
+                except Exception: #derived tables and CTEs, such as <derived2>, aren't tables that can be indexed
+                    indexes[table] = None
+
+        return root, suggestIndexes(root, indexes, aliases)
+
+    finally:
+        cursor.close()
+
+
+def planLines(node : PlanNode, prefix : str = '', last : bool = True, top : bool = True) -> list:
+    '''Draws a plan as a tree, a line per operation
+
+    Parameters
+    ----------
+    node : PlanNode
+    prefix : str
+        The drawing of the branches leading up to node
+    last : bool
+        Whether node is the last child of its parent
+    top : bool
+        Whether node is the root of the tree
+
+    Returns
+    -------
+    list
+        (line, warned) pairs, where warned is whether the operation
+        has warnings'''
+
+    parts = [node.label]
+    if node.accessType is not None:
+        parts.append(f'{node.accessType}{f" on {node.key}" if node.key else ""}')
+    if node.rows is not None:
+        parts.append(f'~{node.rows} row(s){f" ({node.filtered:g}% kept)" if node.filtered not in (None, 100.0) else ""}')
+    parts.extend(node.details)
+    parts.extend(f'[{warning}]' for warning in node.warnings)
+
+    lines = [(('' if top else prefix + ('└─ ' if last else '├─ ')) + ', '.join(parts), bool(node.warnings))]
+    childPrefix = '' if top else prefix + ('   ' if last else '│  ')
+    for i, child in enumerate(node.children):
+        lines.extend(planLines(child, childPrefix, i == len(node.children) - 1, False))
+
+    return lines
@@ -0,0 +1,121 @@
+'''queryStats
+Contains the per-session record of how long queries took, broken
+down into the phases of running one: executing it on the server,
+fetching its rows, formatting them into a table and rendering that
+table in the console. Recording a query costs little more than a
+couple of appends, so it is left on at all times'''
+
+import math
+import time
+import sqlUtils
+from collections import OrderedDict, deque
+
+phases = ('Execute', 'Fetch', 'Format', 'Render')
+
+
+def percentile(samples : list, fraction : float) -> float:
+    '''Returns a percentile of sorted samples, by the nearest rank
+
+    Parameters
+    ----------
+    samples : list
+        Sorted, and not empty
+    fraction : float
+        The percentile, between 0 and 1
+
+    Returns
+    -------
+    float'''
+
+    return samples[max(0, math.ceil(fraction * len(samples)) - 1)]
+
+
+class QueryStats:
+    '''Keeps the timings of the latest queries run, and the latencies
+    of the latest runs of the distinct queries run most recently,
+    telling queries apart by their sqlUtils.fingerprint. Past
+    maxFingerprints distinct queries, those run least recently are
+    forgotten
+
+    Attributes
+    ----------
+    recent : deque
+        The latest maxRecent queries, as (finishedAt, text, execute,
+        fetch, format, render, rows, size) tuples, times being in
+        seconds and size in bytes drawn
+    latencies : OrderedDict
+        Maps fingerprints to a deque of the total times of their
+        latest maxSamples runs, the least recently run first
+    counts : dict
+        Maps fingerprints to the number of times they were run
+    maxRecent : int
+    maxSamples : int
+    maxFingerprints : int'''
+
+    def __init__(self, maxRecent : int = 1000, maxSamples : int = 1000, maxFingerprints : int = 1000):
+        self.recent = deque(maxlen = maxRecent)
+        self.latencies = OrderedDict()
+        self.counts = {}
+        self.maxRecent = maxRecent
+        self.maxSamples = maxSamples
+        self.maxFingerprints = maxFingerprints
+
+
+    def record(self, text : str, execute : float, fetch : float, format : float, render : float, rows : int, size : int) -> None:
+        '''Records the timings of a finished query
+
+        Parameters
+        ----------
+        text : str
+            The query
+        execute, fetch, format, render : float
+            The time each phase took, in seconds
+        rows : int
+            The number of rows fetched
+        size : int
+            The number of bytes drawn
+
+        Returns
+        -------
+        None'''
+
+        self.recent.append((time.time(), text, execute, fetch, format, render, rows, size))
+
+        key = sqlUtils.fingerprint(text)
+        if key in self.latencies:
+            self.latencies.move_to_end(key)
+        else:
+            self.latencies[key] = deque(maxlen = self.maxSamples)
+            self.counts[key] = 0
+        self.latencies[key].append(execute + fetch + format + render)
+        self.counts[key] += 1
+
+        while len(self.latencies) > max(self.maxFingerprints, 1):
+            del self.counts[self.latencies.popitem(last = False)[0]]
+
+
+    def summary(self) -> list:
+        '''Returns the latency percentiles of every distinct query.
+        Samples are only sorted here, so recording stays cheap
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        list
+            (fingerprint, runs, p50, p95, max) tuples, times being in
+            seconds'''
+
+        summary = []
+        for key, samples in self.latencies.items():
+            ordered = sorted(samples)
+            summary.append((key, self.counts[key], percentile(ordered, 0.5), percentile(ordered, 0.95), ordered[-1]))
+
+        return summary
+
+
+    def clear(self) -> None:
+        self.recent.clear()
+        self.latencies.clear()
+        self.counts.clear()
@@ -0,0 +1,99 @@
+'''queryStatsDialog
+A file used to store the QueryStatsDialog class, which lists the
+timings of the queries run this session in sortable tables'''
+
+import time
+from queryStats import phases
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import (
+
+    QAbstractItemView,
+    QDialog,
+    QHeaderView,
+    QTableWidget,
+    QTableWidgetItem,
+    QTabWidget,
+    QVBoxLayout,
+)
+
+
+def tableItem(value) -> QTableWidgetItem:
+    '''Returns a read-only table item. Numbers are stored as such, so
+    that columns of them sort numerically
+
+    Parameters
+    ----------
+    value
+
+    Returns
+    -------
+    QTableWidgetItem'''
+
+    item = QTableWidgetItem()
+    item.setData(Qt.DisplayRole, value)
+    item.setFlags(item.flags() & ~Qt.ItemIsEditable)
+
+    return item
+
+
+def statsTable(headers : list, rows : list) -> QTableWidget:
+    '''Returns a sortable table of rows
+
+    Parameters
+    ----------
+    headers : list
+    rows : list
+
+    Returns
+    -------
+    QTableWidget'''
+
+    table = QTableWidget(len(rows), len(headers))
+    table.setHorizontalHeaderLabels(headers)
+    table.setSelectionBehavior(QAbstractItemView.SelectRows)
+    for i, row in enumerate(rows):
+        for j, value in enumerate(row):
+            table.setItem(i, j, tableItem(value))
+
+    table.setSortingEnabled(True) #only once filled, as rows would otherwise move about mid-fill
+    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+    table.horizontalHeader().setStretchLastSection(True)
+
+    return table
+
+
+class QueryStatsDialog(QDialog):
+    '''Inherits QDialog
+    Lists the latest queries with the time each phase of running
+    them took, along with the latency percentiles of every distinct
+    query. Columns are sorted by clicking their headers
+
+    Attributes
+    ----------
+    tabs : QTabWidget
+        Holds recentTable and summaryTable
+    recentTable : QTableWidget
+        The latest queries, latest first
+    summaryTable : QTableWidget
+        The distinct queries, slowest p95 first'''
+
+    def __init__(self, window, stats):
+        super().__init__(window)
+
+        self.setWindowTitle('Query Timings')
+        self.resize(1100, 600)
+        self.layout = QVBoxLayout()
+        self.setLayout(self.layout)
+
+        recent = [(time.strftime('%H:%M:%S', time.localtime(finishedAt)), text, *[round(i * 1000, 2) for i in times],
+                   round(sum(times) * 1000, 2), rows, size) for finishedAt, text, *times, rows, size in reversed(stats.recent)]
+        self.recentTable = statsTable(['Finished', 'Query', *[f'{i} (ms)' for i in phases], 'Total (ms)', 'Rows', 'Bytes'], recent)
+
+        summary = [(key, runs, round(p50 * 1000, 2), round(p95 * 1000, 2), round(slowest * 1000, 2)) for key, runs, p50, p95, slowest in stats.summary()]
+        self.summaryTable = statsTable(['Query', 'Runs', 'p50 (ms)', 'p95 (ms)', 'Max (ms)'], summary)
+        self.summaryTable.sortItems(3, Qt.DescendingOrder)
+
+        self.tabs = QTabWidget()
+        self.tabs.addTab(self.recentTable, 'Recent Queries')
+        self.tabs.addTab(self.summaryTable, 'By Query')
+        self.layout.addWidget(self.tabs)
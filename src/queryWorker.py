@@ -0,0 +1,523 @@
+'''queryWorker
+Contains the worker that executes queries away from the GUI thread,
+so that long running queries don't freeze the application window.
+Queries are executed through a Session, and their results passed back
+to the GUI thread with the help of signals'''
+
+import threading
+import time
+import sqlUtils
+from concurrent.futures import ThreadPoolExecutor
+from resultModel import ResultModel
+from scriptReader import ScriptReader
+from session import Session
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal, pyqtSlot
+
+transactionalKeywords = {'INSERT', 'UPDATE', 'DELETE', 'REPLACE', 'SELECT'} #statements that can be batched within a transaction
+
+
+class QueryWorker(QObject):
+    '''Inherits QObject
+    Meant to be moved to a QThread. Executes queries it receives
+    through execute() one after the other and emits the result
+
+    The connection is pinged at a set interval while idle. A dropped
+    connection is reconnected with exponential backoff, after which
+    the current database and any session variables are restored.
+    Reads that failed due to the dropped connection are retried once
+
+    Attributes
+    ----------
+    session : Session
+        Executes queries on the connection checked out at sign-in,
+        keeping track of the state to be restored upon reconnecting
+    cancelled : threading.Event
+        Set to stop a parallel poll from starting any more statements
+    keepAliveTimer : QTimer
+        Pings the connection periodically
+
+    Methods
+    -------
+    resultReady : pyqtSignal
+        A signal that passes along the column names and the rows
+        of an executed query, as a list, or as a RowStore should
+        they not have fit in its memory budget
+    resultPending : pyqtSignal
+        A signal that passes along the column names and the first
+        rows of a result set that is to be read lazily
+    rowsFetched : pyqtSignal
+        A signal that passes along the next rows of a lazily read
+        result, empty once every row has been fetched, and the time
+        they took to fetch
+    errorRaised : pyqtSignal
+        A signal that passes along the error message of a failed
+        query
+    timed : pyqtSignal
+        A signal that passes along the time a query took to execute
+        and the time its rows took to fetch, emitted just before its
+        result
+    reconnected : pyqtSignal
+        A signal that passes along the reconnect count and the time
+        reconnecting took in milliseconds
+    reconnectFailed : pyqtSignal
+        A signal emitted when every reconnect attempt has failed
+    batchFinished : pyqtSignal
+        A signal that passes along the number of statements executed,
+        the rows affected, the errors raised, the time taken and the
+        first error message of a batch
+    pollResult : pyqtSignal
+        A signal that passes along the index of a statement within a
+        parallel poll, its column names, rows and error message
+    pollFinished : pyqtSignal
+        A signal that passes along the number of statements executed
+        in a parallel poll and the time taken
+    scriptProgress : pyqtSignal
+        A signal that passes along the bytes of a script file read so
+        far, the size of the file and the statements executed so far
+    scriptFinished : pyqtSignal
+        A signal that passes along the number of statements of a
+        script file committed, the offset and delimiter to resume
+        from, the time taken and the error message, if any'''
+
+    resultReady = pyqtSignal(tuple, object)
+    resultPending = pyqtSignal(tuple, list)
+    rowsFetched = pyqtSignal(list, float)
+    errorRaised = pyqtSignal(str)
+    timed = pyqtSignal(float, float)
+    reconnected = pyqtSignal(int, float)
+    reconnectFailed = pyqtSignal()
+    batchFinished = pyqtSignal(int, int, int, float, str)
+    pollResult = pyqtSignal(int, tuple, list, str)
+    pollFinished = pyqtSignal(int, float)
+    scriptProgress = pyqtSignal('qint64', 'qint64', int)
+    scriptFinished = pyqtSignal(int, 'qint64', str, float, str)
+
+    def __init__(self, sqlComp):
+        super().__init__()
+        self.session = Session(sqlComp[0], sqlComp[3], sqlComp[1])
+        self.session.onReconnect = self.reportReconnect
+        self.cancelled = threading.Event()
+
+        self.keepAliveTimer = QTimer(self) #a child, so that it moves threads along with the worker
+        self.keepAliveTimer.timeout.connect(self.keepAlive)
+
+
+    @pyqtSlot(str, bool)
+    def execute(self, text : str, lazy : bool = False) -> None:
+        '''Executes query text and emits the fetched rows
+        In the case of an error, the error message is emitted instead
+        
+        If lazy is set, only the first batch of rows is fetched and
+        the cursor is left for a ResultModel to read from. The
+        model must be detached before the next query is executed
+
+        Parameters
+        ----------
+        text : str
+            The query to be executed
+        lazy : bool
+            Whether the rows should be read lazily
+
+        Returns
+        -------
+        None'''
+
+        try:
+            self.run(text, lazy)
+
+        except Exception as e: #reads that failed due to a dropped connection have already been retried
+            self.errorRaised.emit(str(e))
+
+
+    @pyqtSlot(str, list)
+    def executePrepared(self, text : str, params : list) -> None:
+        '''Executes query text as a server-side prepared statement,
+        with params bound to its ? placeholders, and emits the
+        fetched rows. The statement is kept prepared, so running it
+        again skips parsing it. Rows are always fetched in full
+
+        Parameters
+        ----------
+        text : str
+            The query to be executed
+        params : list
+            The values bound to the placeholders, in order
+
+        Returns
+        -------
+        None'''
+
+        try:
+            self.runPrepared(text, params)
+
+        except Exception as e:
+            self.errorRaised.emit(str(e))
+
+
+    def run(self, text : str, lazy : bool) -> None:
+        '''Executes query text and emits the result, keeping track of
+        the state that has to be restored upon reconnecting
+
+        Parameters
+        ----------
+        text : str
+            The query to be executed
+        lazy : bool
+            Whether the rows should be read lazily
+
+        Returns
+        -------
+        None'''
+
+        result = self.session.execute(text, stream = lazy)
+        if result.unread:
+            firstRows = result.fetchmany(ResultModel.batchSize)
+            self.timed.emit(result.executeTime, result.fetchTime)
+            self.resultPending.emit(result.columnNames, firstRows)
+            return None
+
+        self.timed.emit(result.executeTime, result.fetchTime)
+        self.resultReady.emit(result.columnNames, result.rows)
+
+
+    @pyqtSlot(int)
+    def fetchRows(self, size : int) -> None:
+        '''Fetches the next rows of the lazily read result and emits
+        them, so that the console can draw them without waiting on
+        the connection. In the case of an error, the error message is
+        emitted instead
+
+        Parameters
+        ----------
+        size : int
+            The maximum number of rows fetched
+
+        Returns
+        -------
+        None'''
+
+        try:
+            start = time.perf_counter()
+            rows = [] if self.session.result is None else self.session.result.fetchmany(size)
+            self.rowsFetched.emit(rows, time.perf_counter() - start)
+
+        except Exception as e:
+            self.errorRaised.emit(str(e))
+
+
+    def runPrepared(self, text : str, params : list) -> None:
+        '''Executes query text as a prepared statement and emits the
+        result
+
+        Parameters
+        ----------
+        text : str
+            The query to be executed
+        params : list
+            The values bound to the placeholders, in order
+
+        Returns
+        -------
+        None'''
+
+        result = self.session.execute(text, params)
+        self.timed.emit(result.executeTime, result.fetchTime)
+        self.resultReady.emit(result.columnNames, result.rows)
+
+
+    @pyqtSlot(list, bool)
+    def executeBatch(self, statements : list, rollbackOnError : bool) -> None:
+        '''Executes statements within a single transaction, merging
+        runs of single-row inserts into multi-row inserts. Results
+        aren't displayed, only a summary is emitted
+
+        Parameters
+        ----------
+        statements : list
+            The statements to be executed, in order
+        rollbackOnError : bool
+            Whether the first error rolls the whole batch back, as
+            opposed to being skipped over
+
+        Returns
+        -------
+        None'''
+
+        start = time.perf_counter()
+        executed, affected, errors, firstError = self.session.executeBatch(statements, rollbackOnError)
+        self.batchFinished.emit(executed, affected, errors, time.perf_counter() - start, firstError)
+
+
+    @pyqtSlot(list, int)
+    def executeParallel(self, statements : list, concurrency : int) -> None:
+        '''Executes runs of consecutive reads in parallel, on up to
+        concurrency connections checked out from the pool. Any other
+        statement is a barrier: it runs on the worker's own connection
+        once every statement before it is done, and those after it
+        wait for it in turn. Results are emitted in submission order
+
+        While the worker's connection has a transaction open, reads
+        run on it one after the other instead, as other connections
+        would not see its uncommitted changes
+
+        Parameters
+        ----------
+        statements : list
+            The statements to be executed, in order
+        concurrency : int
+            The maximum number of reads in flight at once
+
+        Returns
+        -------
+        None'''
+
+        start = time.perf_counter()
+        self.cancelled.clear()
+        index = 0
+
+        try:
+            self.session.drain()
+
+        except Exception as e:
+            self.errorRaised.emit(str(e)) #finishes the poll, so pollFinished mustn't be emitted as well
+            return None
+
+        with ThreadPoolExecutor(max_workers = max(1, concurrency)) as executor:
+            while index < len(statements) and not self.cancelled.is_set():
+                end = index
+                while end < len(statements) and sqlUtils.isReadOnly(statements[end]):
+                    end += 1
+
+                if end == index: #a barrier
+                    self.pollResult.emit(index, *self.runOwn(statements[index]))
+                    index += 1
+
+                elif self.session.myDb.in_transaction:
+                    for i in range(index, end):
+                        if self.cancelled.is_set():
+                            break
+                        self.pollResult.emit(i, *self.runOwn(statements[i]))
+                    index = end
+
+                else:
+                    reads = [executor.submit(self.runPooled, i) for i in statements[index:end]]
+                    for i, future in enumerate(reads, index):
+                        self.pollResult.emit(i, *future.result()) #in submission order, whichever finishes first
+                    index = end
+
+        self.pollFinished.emit(index, time.perf_counter() - start)
+
+
+    @pyqtSlot(str, 'qint64', str, int)
+    def executeScript(self, path : str, offset : int, delimiter : str, batchSize : int) -> None:
+        '''Executes the statements of a script file from byte offset
+        offset onwards, committing every batchSize statements. Any
+        statement other than an insert, update, delete or select is
+        committed on its own, as MySQL would implicitly commit it
+        anyway. The first error rolls back the uncommitted statements
+        and stops the script, which can then be resumed from the
+        offset past the last committed statement
+
+        Parameters
+        ----------
+        path : str
+            The script file
+        offset : int
+            The byte offset to start from, 0 or one emitted by
+            scriptFinished
+        delimiter : str
+            The delimiter in effect at offset
+        batchSize : int
+            The maximum number of statements per transaction
+
+        Returns
+        -------
+        None'''
+
+        start = time.perf_counter()
+        lastProgress = start
+        self.cancelled.clear()
+        committed, uncommitted, error = 0, 0, ''
+        resume = position = (offset, delimiter.encode())
+
+        session = self.session
+        try:
+            session.drain()
+            reader = ScriptReader(path)
+
+        except Exception as e:
+            self.scriptFinished.emit(0, offset, delimiter, 0.0, str(e))
+            return None
+
+        try:
+            if not session.myDb.in_transaction:
+                session.myDb.start_transaction()
+
+            for statement, _, end, nextDelimiter in reader.statements(*position):
+                if self.cancelled.is_set():
+                    raise InterruptedError('Cancelled')
+
+                batched = sqlUtils.firstKeyword(statement) in transactionalKeywords
+                if not batched and uncommitted:
+                    session.myDb.commit()
+                    committed, uncommitted, resume = committed + uncommitted, 0, position
+
+                session.myCur.execute(statement)
+                if session.myCur.with_rows:
+                    session.myCur.fetchall()
+                session.trackState(statement)
+                uncommitted += 1
+                position = (end, nextDelimiter)
+
+                if not batched or uncommitted >= batchSize:
+                    session.myDb.commit()
+                    committed, uncommitted, resume = committed + uncommitted, 0, position
+
+                if time.perf_counter() - lastProgress > 0.1:
+                    lastProgress = time.perf_counter()
+                    self.scriptProgress.emit(end, reader.size, committed + uncommitted)
+
+            session.myDb.commit()
+            committed, resume = committed + uncommitted, position
+
+        except Exception as e:
+            error = str(e)
+            try:
+                session.myDb.rollback()
+            except Exception: #the connection may have been lost
+                pass
+
+        finally:
+            reader.close()
+
+        self.scriptFinished.emit(committed, resume[0], resume[1].decode(), time.perf_counter() - start, error)
+
+
+    def runOwn(self, text : str) -> tuple:
+        '''Executes a statement on the worker's own connection
+
+        Parameters
+        ----------
+        text : str
+
+        Returns
+        -------
+        tuple
+            The column names, rows and error message'''
+
+        try:
+            result = self.session.execute(text)
+            return result.columnNames, result.fetchall(), ''
+
+        except Exception as e:
+            return (), [], str(e)
+
+
+    def runPooled(self, text : str) -> tuple:
+        '''Executes a read on a connection checked out from the pool,
+        switched to the worker connection's database
+
+        Parameters
+        ----------
+        text : str
+
+        Returns
+        -------
+        tuple
+            The column names, rows and error message'''
+
+        if self.cancelled.is_set():
+            return (), [], 'Cancelled'
+
+        try:
+            result = self.session.executePooled(text)
+            return result.columnNames, result.fetchall(), ''
+
+        except Exception as e:
+            return (), [], str(e)
+
+
+    @pyqtSlot(int)
+    def setKeepAliveInterval(self, msecs : int) -> None:
+        '''Sets the interval the connection is pinged at
+        An interval of 0 disables pinging
+
+        Parameters
+        ----------
+        msecs : int
+
+        Returns
+        -------
+        None'''
+
+        self.keepAliveTimer.stop()
+        if msecs > 0:
+            self.keepAliveTimer.start(msecs)
+
+
+    def keepAlive(self) -> None:
+        '''Pings the connection, reconnecting should it have been
+        dropped. Skipped while a lazily read result may be using the
+        connection
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.session.ping()
+
+
+    def reportReconnect(self, succeeded : bool, msecs : float) -> None:
+        '''Emits the outcome of the session reconnecting
+
+        Parameters
+        ----------
+        succeeded : bool
+        msecs : float
+            The time reconnecting took in milliseconds
+
+        Returns
+        -------
+        None'''
+
+        if succeeded:
+            self.reconnected.emit(self.session.reconnects, msecs)
+        else:
+            self.reconnectFailed.emit()
+
+
+
+def killQuery(pool, connectionId : int) -> threading.Thread:
+    '''Sends KILL QUERY for connectionId over a side connection
+    The side connection is checked out in a separate thread, as the
+    pool may have to wait for a connection to be checked in
+
+    Parameters
+    ----------
+    pool : ConnectionPool
+        The pool created at sign-in
+    connectionId : int
+        The id of the connection running the query to be killed
+
+    Returns
+    -------
+    threading.Thread'''
+
+    def kill():
+        try:
+            sideDb = pool.checkout()
+            sideCur = sideDb.cursor()
+            sideCur.execute(f'KILL QUERY {int(connectionId)}')
+            sideCur.close()
+            sideDb.close() #checks the connection back in
+
+        except Exception: #the query may have finished in the meantime, nothing to cancel
+            pass
+
+    killThread = threading.Thread(target = kill, daemon = True)
+    killThread.start()
+
+    return killThread
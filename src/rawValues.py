@@ -0,0 +1,143 @@
+'''rawValues
+Contains the lazily decoded rows read through raw cursors. A raw
+cursor leaves every value as the bytes the server sent, which for
+DECIMAL, DATETIME, JSON and the like already is the text to be shown,
+so values are only decoded into display strings once they are shown,
+rather than converted into Python objects and back into strings'''
+
+from decimal import Decimal, InvalidOperation
+
+
+def displayText(value) -> str:
+    '''Returns the text a raw value is shown as. Values that aren't
+    valid UTF-8, such as those of binary columns, are shown in hex
+
+    Parameters
+    ----------
+    value : bytes
+        None for NULL
+
+    Returns
+    -------
+    str'''
+
+    if value is None:
+        return 'None' #as str() shows NULLs converted by a regular cursor
+    if not isinstance(value, (bytes, bytearray)):
+        return str(value)
+
+    try:
+        return value.decode('utf-8')
+    except UnicodeDecodeError:
+        return f'0x{value.hex()}'
+
+
+def sortKey(value) -> tuple:
+    '''Returns the key a raw value is sorted by. Numbers sort
+    numerically and before text, NULLs last
+
+    Parameters
+    ----------
+    value : bytes
+
+    Returns
+    -------
+    tuple'''
+
+    if value is None:
+        return (2, 0, '')
+
+    text = displayText(value)
+    try:
+        number = Decimal(text)
+    except InvalidOperation:
+        return (1, 0, text)
+
+    return (0, number, '') if number.is_finite() else (1, 0, text)
+
+
+class RawRow:
+    '''A row of raw values that decodes each value into its display
+    string upon first being indexed, and caches the decoded string.
+    Rows are pickled as their raw values only
+
+    Attributes
+    ----------
+    raw : tuple
+        The values as the server sent them
+    text : list
+        The decoded values, None where not decoded yet. None until
+        a value is first decoded'''
+
+    __slots__ = ('raw', 'text')
+
+    def __init__(self, raw : tuple):
+        self.raw = raw
+        self.text = None
+
+
+    def __len__(self) -> int:
+        return len(self.raw)
+
+
+    def __getitem__(self, i : int) -> str:
+        if self.text is None:
+            self.text = [None] * len(self.raw)
+
+        text = self.text[i]
+        if text is None:
+            text = self.text[i] = displayText(self.raw[i])
+
+        return text
+
+
+    def __iter__(self): #iterating shows every value, so every value is decoded in one go
+        if self.text is None:
+            self.text = list(map(displayText, self.raw))
+        elif None in self.text:
+            self.text = [displayText(value) if text is None else text for value, text in zip(self.raw, self.text)]
+
+        return iter(self.text)
+
+
+    def __reduce__(self):
+        return (RawRow, (self.raw,))
+
+
+    def __repr__(self) -> str:
+        return f'RawRow({tuple(self)!r})'
+
+
+
+class RawCursor:
+    '''Wraps a raw cursor, so that the rows it fetches are RawRows.
+    Everything else is passed through to the cursor
+
+    Attributes
+    ----------
+    cursor
+        A cursor opened with raw = True'''
+
+    def __init__(self, cursor):
+        self.cursor = cursor
+
+
+    def __getattr__(self, name : str):
+        return getattr(self.cursor, name)
+
+
+    def __iter__(self):
+        return map(RawRow, iter(self.cursor))
+
+
+    def fetchone(self):
+        row = self.cursor.fetchone()
+        return None if row is None else RawRow(row)
+
+
+    def fetchmany(self, size : int = 1) -> list:
+        return [RawRow(row) for row in self.cursor.fetchmany(size)]
+
+
+    def fetchall(self) -> list:
+        return [RawRow(row) for row in self.cursor.fetchall()]
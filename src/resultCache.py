@@ -0,0 +1,187 @@
+'''resultCache
+Contains an opt-in, client-side cache of query results. Repeatedly
+running the same SELECT (from the command history, a macro or the
+poll queue) is then served without a round trip to the server'''
+
+import time
+import sqlUtils
+from collections import OrderedDict
+
+
+class ResultCache:
+    '''A least recently used cache of results, keyed by the
+    normalized statement and the database it was run against
+    
+    Entries expire ttl seconds after being stored. Statements that
+    write drop every entry reading a table they touch, or every
+    entry when the tables touched can't be told or a whole database
+    is touched
+
+    Attributes
+    ----------
+    maxEntries : int
+        The maximum number of results kept
+    maxBytes : int
+        The maximum (estimated) size of the results kept
+    ttl : float
+        The number of seconds a result is kept for
+    entries : OrderedDict
+        Maps keys to (columnNames, rows, tables, size, expiry), the
+        least recently used first
+    size : int
+        The estimated size of every result kept
+    hits : int
+        The number of lookups served from the cache
+    misses : int
+        The number of lookups that weren't
+    evictions : int
+        The number of results dropped to make room
+    invalidations : int
+        The number of results dropped due to writes'''
+
+    def __init__(self, maxEntries : int = 256, maxBytes : int = 64 * 1024 * 1024, ttl : float = 300):
+        self.maxEntries = maxEntries
+        self.maxBytes = maxBytes
+        self.ttl = ttl
+        self.entries = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+
+    @staticmethod
+    def key(text : str, database : str) -> tuple:
+        return (sqlUtils.normalize(text), database)
+
+
+    @staticmethod
+    def estimateSize(columnNames : tuple, rows : list) -> int:
+        '''Roughly estimates the memory taken up by a result, counting
+        the length of every value plus a fixed overhead per value
+
+        Parameters
+        ----------
+        columnNames : tuple
+        rows : list
+
+        Returns
+        -------
+        int'''
+
+        return sum([len(str(j)) + 16 for i in rows for j in i]) + 64 * (len(rows) + len(columnNames))
+
+
+    def get(self, text : str, database : str):
+        '''Returns the cached column names and rows of a statement, or
+        None should they not be cached
+
+        Parameters
+        ----------
+        text : str
+            The statement
+        database : str
+            The current database
+
+        Returns
+        -------
+        tuple'''
+
+        key = self.key(text, database)
+        entry = self.entries.get(key)
+
+        if entry is None or entry[4] < time.monotonic():
+            if entry is not None:
+                self.remove(key)
+            self.misses += 1
+            return None
+
+        self.entries.move_to_end(key)
+        self.hits += 1
+
+        return entry[0], entry[1]
+
+
+    def put(self, text : str, database : str, columnNames : tuple, rows : list) -> None:
+        '''Caches the result of a statement, evicting the least
+        recently used results should the cache be full
+
+        Parameters
+        ----------
+        text : str
+            The statement
+        database : str
+            The current database
+        columnNames : tuple
+        rows : list
+
+        Returns
+        -------
+        None'''
+
+        size = self.estimateSize(columnNames, rows)
+        if size > self.maxBytes or self.maxEntries <= 0:
+            return None
+
+        key = self.key(text, database)
+        if key in self.entries:
+            self.remove(key)
+
+        self.entries[key] = (columnNames, rows, sqlUtils.tablesIn(text), size, time.monotonic() + self.ttl)
+        self.size += size
+
+        while len(self.entries) > self.maxEntries or self.size > self.maxBytes:
+            self.remove(next(iter(self.entries)))
+            self.evictions += 1
+
+
+    def remove(self, key : tuple) -> None:
+        self.size -= self.entries.pop(key)[3]
+
+
+    def invalidate(self, text : str) -> None:
+        '''Drops the results a write statement may have made stale
+
+        Parameters
+        ----------
+        text : str
+            The statement
+
+        Returns
+        -------
+        None'''
+
+        if sqlUtils.isReadOnly(text) or sqlUtils.firstKeyword(text) in ('USE', 'SET'):
+            return None
+
+        tables = set() if sqlUtils.databaseClause.search(text) else sqlUtils.tablesIn(text) #a whole database's tables are dropped or changed
+        stale = [key for key, entry in self.entries.items() if not tables or tables & entry[2]]
+        for key in stale:
+            self.remove(key)
+        self.invalidations += len(stale)
+
+
+    def clear(self) -> None:
+        self.entries.clear()
+        self.size = 0
+
+
+    def stats(self) -> dict:
+        '''Returns the cache's counters, for diagnostics
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        dict'''
+
+        lookups = self.hits + self.misses
+        return {
+            'Entries' : f'{len(self.entries)} / {self.maxEntries}',
+            'Size' : f'{self.size / 1048576:.2f} MB / {self.maxBytes / 1048576:.0f} MB',
+            'Hits' : self.hits, 'Misses' : self.misses,
+            'Hit Rate' : f'{self.hits / lookups:.0%}' if lookups else 'N/A',
+            'Evictions' : self.evictions, 'Invalidations' : self.invalidations
+            }
@@ -0,0 +1,291 @@
+'''resultExport
+Contains the streaming export of query results to CSV, JSON Lines and
+SQL INSERT files, optionally gzipped. Rows are fetched off an
+unbuffered cursor a batch at a time and written as they arrive, so
+memory use doesn't grow with the size of the result'''
+
+import csv
+import datetime
+import decimal
+import gzip
+import json
+import threading
+from csvImport import quoteString
+from sqlUtils import quoteName
+
+
+def sqlLiteral(value) -> str:
+    '''Returns a value as a MySQL literal
+
+    Parameters
+    ----------
+    value
+
+    Returns
+    -------
+    str'''
+
+    if value is None:
+        return 'NULL'
+    if isinstance(value, bool):
+        return str(int(value))
+    if isinstance(value, (int, float, decimal.Decimal)):
+        return str(value)
+    if isinstance(value, (bytes, bytearray)):
+        return f"X'{bytes(value).hex()}'" if value else "''"
+    if isinstance(value, set): #SET columns
+        return quoteString(','.join(sorted(value)))
+
+    return quoteString(str(value))
+
+
+def jsonValue(value):
+    '''Returns a value JSON can't encode as one it can. Passed as
+    json.dumps's default
+
+    Parameters
+    ----------
+    value
+
+    Returns
+    -------
+    str or list'''
+
+    if isinstance(value, (datetime.date, datetime.time)):
+        return value.isoformat()
+    if isinstance(value, (bytes, bytearray)):
+        try:
+            return bytes(value).decode('utf-8')
+        except UnicodeDecodeError:
+            return '0x' + bytes(value).hex()
+    if isinstance(value, set):
+        return sorted(value)
+
+    return str(value) #Decimal and timedelta
+
+
+def csvValue(value):
+    '''Returns a value as a CSV field. NULL is written as \\N, as
+    SELECT ... INTO OUTFILE does and imports read back
+
+    Parameters
+    ----------
+    value
+
+    Returns
+    -------
+    str or value'''
+
+    if value is None:
+        return '\\N'
+    if isinstance(value, (bytes, bytearray)):
+        return jsonValue(value)
+    if isinstance(value, set):
+        return ','.join(sorted(value))
+
+    return value
+
+
+class CsvWriter:
+    '''Writes rows as CSV, behind a header of column names
+
+    Attributes
+    ----------
+    writer
+        The csv writer rows are passed to'''
+
+    def __init__(self, file, columns : list, table : str, delimiter : str = ','):
+        self.writer = csv.writer(file, delimiter = delimiter, lineterminator = '\n')
+        self.writer.writerow(columns)
+
+
+    def write(self, rows : list) -> None:
+        '''Writes a batch of rows
+
+        Parameters
+        ----------
+        rows : list
+
+        Returns
+        -------
+        None'''
+
+        self.writer.writerows([csvValue(value) for value in row] for row in rows)
+
+
+
+class TsvWriter(CsvWriter):
+    '''Writes rows as tab separated values, behind a header of column
+    names'''
+
+    def __init__(self, file, columns : list, table : str):
+        super().__init__(file, columns, table, delimiter = '\t')
+
+
+
+class JsonLinesWriter:
+    '''Writes rows as JSON objects keyed by column name, one a line
+
+    Attributes
+    ----------
+    file
+        The file written to
+    columns : list
+        The column names
+    encoder : json.JSONEncoder'''
+
+    def __init__(self, file, columns : list, table : str):
+        self.file = file
+        self.columns = columns
+        self.encoder = json.JSONEncoder(default = jsonValue, ensure_ascii = False)
+
+
+    def write(self, rows : list) -> None:
+        '''Writes a batch of rows
+
+        Parameters
+        ----------
+        rows : list
+
+        Returns
+        -------
+        None'''
+
+        self.file.writelines(self.encoder.encode(dict(zip(self.columns, row))) + '\n' for row in rows)
+
+
+
+class InsertWriter:
+    '''Writes rows as a script of multi-row INSERT statements, a
+    statement per batch fetched
+
+    Attributes
+    ----------
+    file
+        The file written to
+    prefix : str
+        The start of every statement, up to its values'''
+
+    def __init__(self, file, columns : list, table : str):
+        self.file = file
+        self.prefix = f'INSERT INTO {quoteName(table)} ({", ".join(quoteName(column) for column in columns)}) VALUES\n'
+
+
+    def write(self, rows : list) -> None:
+        '''Writes a batch of rows
+
+        Parameters
+        ----------
+        rows : list
+
+        Returns
+        -------
+        None'''
+
+        if rows:
+            self.file.write(self.prefix + ',\n'.join(f'({", ".join(map(sqlLiteral, row))})' for row in rows) + ';\n')
+
+
+
+formats = { #names : (writer, extension)
+    'CSV' : (CsvWriter, '.csv'),
+    'TSV' : (TsvWriter, '.tsv'),
+    'JSON Lines' : (JsonLinesWriter, '.jsonl'),
+    'SQL INSERT' : (InsertWriter, '.sql'),
+    }
+
+
+class ResultExport:
+    '''Exports the result of a query to a file over a connection of
+    its own, reporting progress through a callback
+
+    Attributes
+    ----------
+    query : str
+        The query exported
+    path : str
+        The file exported to. Written through gzip should it end in
+        .gz
+    format : str
+        The name of the format written, a key of formats
+    table : str
+        The table named in INSERT statements
+    batchSize : int
+        The number of rows fetched and written at a time
+    rows : int
+        The number of rows exported so far
+    cancelled : threading.Event
+        Set to stop the export after the batch at hand'''
+
+    def __init__(self, query : str, path : str, format : str = 'CSV', table : str = 'exported', batchSize : int = 5000):
+        self.query = query
+        self.path = path
+        self.format = format
+        self.table = table
+        self.batchSize = max(1, batchSize)
+        self.rows = 0
+        self.cancelled = threading.Event()
+
+
+    def open(self):
+        '''Opens the file exported to, for writing text
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        file'''
+
+        if self.path.lower().endswith('.gz'):
+            return gzip.open(self.path, 'wt', encoding = 'utf-8', newline = '', compresslevel = 6)
+
+        return open(self.path, 'w', encoding = 'utf-8', newline = '')
+
+
+    def run(self, connection, progress = None) -> int:
+        '''Runs the query and exports its result. The file is left as
+        far as it got should the export fail or be cancelled
+
+        Parameters
+        ----------
+        connection
+            A connection to the query's database, dedicated to the
+            export
+        progress : func
+            Called with the rows exported so far, after every batch
+
+        Returns
+        -------
+        int
+            The number of rows exported'''
+
+        cursor = connection.cursor(buffered = False) #rows stay on the server until fetched
+        try:
+            cursor.execute(self.query)
+            if cursor.description is None:
+                raise ValueError('The query returns no rows')
+
+            columns = [column[0] for column in cursor.description]
+            with self.open() as file:
+                writer = formats[self.format][0](file, columns, self.table)
+                while True:
+                    if self.cancelled.is_set():
+                        raise InterruptedError('Cancelled')
+
+                    rows = cursor.fetchmany(self.batchSize)
+                    if not rows:
+                        break
+
+                    writer.write(rows)
+                    self.rows += len(rows)
+                    if progress is not None:
+                        progress(self.rows)
+
+        finally:
+            try:
+                cursor.close()
+            except Exception: #unread rows, the connection is closed anyway
+                pass
+
+        return self.rows
@@ -0,0 +1,169 @@
+'''resultModel
+Contains a table model that pulls rows lazily from an unbuffered
+cursor. Rows are only fetched once the view scrolls near them, so
+the first rows of even a huge result set show up instantly. Fetched
+rows are kept in a RowStore, so that scrolling through a huge result
+spills it to disk rather than filling up memory'''
+
+from array import array
+from rawValues import RawRow, sortKey
+from rowStore import RowStore
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex, QVariant
+
+
+class ResultModel(QAbstractTableModel):
+    '''Inherits QAbstractTableModel
+    Exposes the result set of an unbuffered cursor to a QTableView,
+    fetching batchSize rows at a time through fetchmany()
+
+    Attributes
+    ----------
+    batchSize : int
+        The number of rows fetched per call to fetchMore
+    cursor
+        The unbuffered cursor the result set is read from
+    columnNames : tuple
+        The column names of the result set
+    rows : RowStore
+        The rows fetched so far
+    order : array
+        The positions within rows of the rows shown, in the order
+        they are shown, once sorted. None while unsorted
+    exhausted : bool
+        Whether every row of the result set has been fetched, or
+        whether the model has been detached from the cursor'''
+
+    batchSize = 256
+
+    def __init__(self, cursor, columnNames : tuple, firstRows : list):
+        super().__init__()
+        self.cursor = cursor
+        self.columnNames = columnNames
+        self.rows = RowStore()
+        self.rows.extend(firstRows)
+        self.order = None
+        self.exhausted = len(self.rows) < self.batchSize
+
+
+    def rowCount(self, parent = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.rows)
+
+
+    def columnCount(self, parent = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.columnNames)
+
+
+    def data(self, index, role = Qt.DisplayRole):
+        if role == Qt.DisplayRole and index.isValid():
+            return str(self.rows[index.row() if self.order is None else self.order[index.row()]][index.column()])
+
+        return QVariant()
+
+
+    def headerData(self, section, orientation, role = Qt.DisplayRole):
+        if role == Qt.DisplayRole:
+            if orientation == Qt.Horizontal:
+                return self.columnNames[section]
+            return section + 1
+
+        return QVariant()
+
+
+    def canFetchMore(self, parent = QModelIndex()) -> bool:
+        return not parent.isValid() and not self.exhausted
+
+
+    def fetchMore(self, parent = QModelIndex()) -> None:
+        '''Fetches the next batch of rows from the cursor
+
+        Parameters
+        ----------
+        parent : QModelIndex
+
+        Returns
+        -------
+        None'''
+
+        if parent.isValid() or self.exhausted:
+            return None
+
+        batch = self.cursor.fetchmany(self.batchSize)
+        if len(batch) < self.batchSize:
+            self.exhausted = True
+
+        if batch:
+            self.beginInsertRows(QModelIndex(), len(self.rows), len(self.rows) + len(batch) - 1)
+            self.rows.extend(batch)
+            self.endInsertRows()
+
+
+    def detach(self) -> None:
+        '''Stops the model from reading the cursor any further, so
+        that the connection can be used for the next query. Rows that
+        were already fetched remain viewable
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.exhausted = True
+
+
+    def sort(self, column : int, order = Qt.AscendingOrder) -> None:
+        '''Overrides sort
+        Fetches every row left, then sorts the rows by a column. Raw
+        rows are sorted numerically where their values are numbers. Only
+        the column's values and the resulting order are held in
+        memory, the rows themselves stay wherever rows keeps them
+
+        Parameters
+        ----------
+        column : int
+        order : Qt.SortOrder
+
+        Returns
+        -------
+        None'''
+
+        self.layoutAboutToBeChanged.emit()
+        while not self.exhausted:
+            batch = self.cursor.fetchmany(self.batchSize * 16)
+            self.rows.extend(batch)
+            self.exhausted = len(batch) < self.batchSize * 16
+
+        descending = order == Qt.DescendingOrder
+        if len(self.rows) and isinstance(self.rows[0], RawRow): #sorted by raw value, so numbers needn't be decoded to sort numerically
+            keys = [sortKey(row.raw[column]) for row in self.rows]
+            self.order = array('q', sorted(range(len(keys)), key = keys.__getitem__, reverse = descending))
+            self.layoutChanged.emit()
+            return None
+
+        keys = [row[column] for row in self.rows]
+        try:
+            positions = sorted(range(len(keys)), key = lambda i: (keys[i] is None, keys[i]), reverse = descending)
+        except TypeError: #values of differing types, compared as shown instead
+            positions = sorted(range(len(keys)), key = lambda i: (keys[i] is None, str(keys[i])), reverse = descending)
+
+        self.order = array('q', positions)
+        self.layoutChanged.emit()
+
+
+    def close(self) -> None:
+        '''Detaches the model and drops its rows, deleting any
+        spilled to disk
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.beginResetModel()
+        self.exhausted = True
+        self.rows.close()
+        self.order = None
+        self.endResetModel()
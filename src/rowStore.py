@@ -0,0 +1,197 @@
+'''rowStore
+Contains the RowStore class, a list-like store of the rows of a
+result that keeps them in memory up to a budget, and spills the rest
+to a temporary file. Spilled rows are read back through mmap only
+when they are asked for, so a result of any size takes up no more
+memory than the budget, plus an offset per spilled row'''
+
+import mmap
+import pickle
+import tempfile
+from array import array
+from collections import OrderedDict
+from rawValues import RawRow
+from resultCache import ResultCache
+
+
+class RowStore:
+    '''Holds the rows of a result, in memory up to maxBytes (as
+    estimated by ResultCache.estimateSize) and in a temporary file
+    past that. The file is deleted once the store is closed
+
+    Attributes
+    ----------
+    maxBytes : int
+        The estimated size past which rows are spilled to disk
+    cacheSize : int
+        The number of spilled rows kept decoded, so that views
+        asking for the same row once per cell only decode it once
+    memoryRows : list
+        The rows kept in memory, which are the first rows
+    size : int
+        The estimated size of memoryRows
+    file : tempfile.TemporaryFile
+        The spilled rows, pickled back to back. None until rows are
+        first spilled
+    offsets : array
+        The offset of every spilled row within file, followed by the
+        end of the last
+    map : mmap.mmap
+        A read only mapping of file, remapped as file grows
+    decoded : OrderedDict
+        The latest cacheSize spilled rows read, keyed by position'''
+
+    maxBytes = 64 * 1024 * 1024
+    cacheSize = 1024
+
+    def __init__(self, maxBytes : int = None):
+        self.maxBytes = self.maxBytes if maxBytes is None else maxBytes
+        self.memoryRows = []
+        self.size = 0
+        self.file = None
+        self.offsets = array('q', [0])
+        self.map = None
+        self.decoded = OrderedDict()
+
+
+    @property
+    def spilled(self) -> bool:
+        return self.file is not None
+
+
+    def __len__(self) -> int:
+        return len(self.memoryRows) + len(self.offsets) - 1
+
+
+    def extend(self, rows : list) -> None:
+        '''Adds rows to the end of the store, spilling them to disk
+        once the budget is used up
+
+        Parameters
+        ----------
+        rows : list
+
+        Returns
+        -------
+        None'''
+
+        if self.file is None:
+            if rows and isinstance(rows[0], RawRow): #measured raw, as estimateSize would decode every value
+                size = sum([len(j or b'') + 16 for i in rows for j in i.raw]) + 64 * len(rows)
+            else:
+                size = ResultCache.estimateSize((), rows)
+            if self.size + size <= self.maxBytes:
+                self.memoryRows.extend(rows)
+                self.size += size
+                return None
+
+            self.file = tempfile.TemporaryFile(prefix = 'pysql-rows-') #deleted upon being closed
+
+        end = self.offsets[-1]
+        chunks = []
+        for row in rows:
+            chunk = pickle.dumps(row, pickle.HIGHEST_PROTOCOL)
+            end += len(chunk)
+            self.offsets.append(end)
+            chunks.append(chunk)
+        self.file.write(b''.join(chunks))
+
+
+    def __getitem__(self, i : int):
+        if i < 0:
+            i += len(self)
+        if i < len(self.memoryRows):
+            return self.memoryRows[i]
+
+        j = i - len(self.memoryRows)
+        if j in self.decoded:
+            self.decoded.move_to_end(j)
+            return self.decoded[j]
+
+        row = self.read(j)
+        self.decoded[j] = row
+        if len(self.decoded) > self.cacheSize:
+            self.decoded.popitem(last = False)
+
+        return row
+
+
+    def read(self, j : int):
+        '''Decodes the jth spilled row
+
+        Parameters
+        ----------
+        j : int
+
+        Returns
+        -------
+        tuple'''
+
+        if j < 0 or j >= len(self.offsets) - 1:
+            raise IndexError('row out of range')
+
+        if self.map is None or self.offsets[j + 1] > len(self.map):
+            self.remap()
+
+        return pickle.loads(self.map[self.offsets[j] : self.offsets[j + 1]])
+
+
+    def remap(self) -> None:
+        '''Maps file anew, so that rows spilled since the last mapping
+        can be read
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.file.flush()
+        if self.map is not None:
+            self.map.close()
+        self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ)
+
+
+    def __iter__(self):
+        yield from self.memoryRows
+        for j in range(len(self.offsets) - 1):
+            yield self.read(j)
+
+
+    def page(self, start : int, stop : int) -> list:
+        '''Returns the rows from start up to, but not including, stop
+
+        Parameters
+        ----------
+        start : int
+        stop : int
+
+        Returns
+        -------
+        list'''
+
+        return [self[i] for i in range(max(0, start), min(stop, len(self)))]
+
+
+    def close(self) -> None:
+        '''Drops every row, deleting the temporary file
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+        self.memoryRows = []
+        self.size = 0
+        self.offsets = array('q', [0])
+        self.decoded.clear()
@@ -0,0 +1,609 @@
+'''schemaBrowser
+A file used to store the SchemaBrowser class, a sidebar tree of the
+server's schemas, their tables, and the columns and indexes of those.
+Each level is read from INFORMATION_SCHEMA only once expanded, on a
+connection of its own checked out from the pool, and is kept for ttl
+seconds before being refreshed in the background, in place'''
+
+import queue
+import threading
+import time
+from sqlUtils import quoteName
+from PyQt5.QtCore import Qt, QAbstractItemModel, QModelIndex, QObject, QTimer, QVariant, pyqtSignal
+from PyQt5.QtWidgets import QAbstractItemView, QTreeView
+
+expandable = {'server', 'schema', 'table', 'indexes'} #kinds of nodes with children
+schemaKeywords = {'CREATE', 'DROP', 'ALTER', 'RENAME'} #statements after which the tree is refreshed
+
+schemasQuery = 'SELECT SCHEMA_NAME FROM INFORMATION_SCHEMA.SCHEMATA ORDER BY SCHEMA_NAME'
+tablesQuery = ('SELECT TABLE_NAME, TABLE_TYPE, TABLE_ROWS FROM INFORMATION_SCHEMA.TABLES '
+               'WHERE TABLE_SCHEMA = %s ORDER BY TABLE_NAME')
+columnsQuery = ('SELECT COLUMN_NAME, COLUMN_TYPE, IS_NULLABLE, COLUMN_KEY FROM INFORMATION_SCHEMA.COLUMNS '
+                'WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s ORDER BY ORDINAL_POSITION')
+indexesQuery = ('SELECT INDEX_NAME, NON_UNIQUE, COLUMN_NAME FROM INFORMATION_SCHEMA.STATISTICS '
+                'WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s ORDER BY INDEX_NAME, SEQ_IN_INDEX')
+
+
+class SchemaNode:
+    '''A schema, table, column or index of the tree
+
+    Attributes
+    ----------
+    kind : str
+        server, schema, table, column, indexes or index
+    name : str
+    detail : str
+        Shown beside the name, such as a column's type
+    parent : SchemaNode
+        None for the root, or once removed from the tree
+    row : int
+        The node's position among its parent's children
+    children : list
+        Every child read so far, the first shown of which are in
+        the tree
+    shown : int
+        The number of children inserted into the tree, as they are
+        inserted a batch at a time
+    loaded : bool
+        Whether the children have been read
+    loading : bool
+        Whether the children are being read
+    expiry : float
+        The time past which the children are stale
+    error : str
+        The error message, should reading the children have failed'''
+
+    def __init__(self, kind : str, name : str = '', detail : str = '', parent = None, row : int = 0):
+        self.kind = kind
+        self.name = name
+        self.detail = detail
+        self.parent = parent
+        self.row = row
+        self.children = []
+        self.shown = 0
+        self.loaded = kind not in expandable
+        self.loading = False
+        self.expiry = 0.0
+        self.error = ''
+
+
+    def key(self) -> tuple:
+        return (self.kind, self.name)
+
+
+    def path(self) -> list:
+        '''Returns the names of the node and its ancestors, schema
+        first, skipping the root and the indexes folder'''
+
+        node, names = self, []
+        while node.parent is not None:
+            if node.kind != 'indexes':
+                names.insert(0, node.name)
+            node = node.parent
+
+        return names
+
+
+def readLevel(cursor, node : SchemaNode) -> list:
+    '''Reads the children of a node from INFORMATION_SCHEMA
+
+    Parameters
+    ----------
+    cursor
+    node : SchemaNode
+
+    Returns
+    -------
+    list
+        (kind, name, detail) tuples, in the order they are shown'''
+
+    if node.kind == 'server':
+        cursor.execute(schemasQuery)
+        return [('schema', str(name), '') for name, in cursor.fetchall()]
+
+    if node.kind == 'schema':
+        cursor.execute(tablesQuery, (node.name,))
+        return [('table', str(name), 'view' if 'VIEW' in str(kind) else f'~{rows or 0} row(s)') for name, kind, rows in cursor.fetchall()]
+
+    schema, table = node.path()[ : 2]
+    cursor.execute(columnsQuery, (schema, table))
+    entries = [('column', str(name), f'{kind}{" NOT NULL" if nullable == "NO" else ""}{f" {key}" if key else ""}')
+               for name, kind, nullable, key in cursor.fetchall()]
+
+    cursor.execute(indexesQuery, (schema, table))
+    indexes = {} #index : (unique, columns), in the order read
+    for name, nonUnique, column in cursor.fetchall():
+        indexes.setdefault(str(name), (not int(nonUnique), []))[1].append(str(column))
+    entries.append(('indexes', 'Indexes', f'{len(indexes)} index(es)'))
+
+    return entries + [('index', name, f'{"UNIQUE " if unique else ""}({", ".join(columns)})') for name, (unique, columns) in indexes.items()]
+
+
+
+class MetadataLoader(QObject):
+    '''Inherits QObject
+    Reads the levels of the tree requested of it one after another
+    in a thread of its own, on a single connection checked out from
+    the pool. The connection is checked back in whenever there is
+    nothing left to read, so it doesn't hold on to a connection
+    the rest of the application could use
+
+    Attributes
+    ----------
+    pool : ConnectionPool
+    requests : queue.SimpleQueue
+        The nodes waiting to be read
+    thread : threading.Thread
+        Started upon the first request
+
+    Methods
+    -------
+    loaded : pyqtSignal
+        A signal that passes along a node, its children as read by
+        readLevel and the error message, should reading have failed'''
+
+    loaded = pyqtSignal(object, list, str)
+
+    def __init__(self, pool):
+        super().__init__()
+        self.pool = pool
+        self.requests = queue.SimpleQueue()
+        self.thread = None
+
+
+    def request(self, node : SchemaNode) -> None:
+        '''Queues a node to be read
+
+        Parameters
+        ----------
+        node : SchemaNode
+
+        Returns
+        -------
+        None'''
+
+        self.requests.put(node)
+        if self.thread is None:
+            self.thread = threading.Thread(target = self.run, daemon = True)
+            self.thread.start()
+
+
+    def run(self) -> None:
+        '''Reads queued nodes for as long as the application runs
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        while True:
+            node = self.requests.get()
+            try:
+                connection = self.pool.checkout()
+            except Exception as e:
+                self.loaded.emit(node, [], str(e))
+                continue
+
+            try:
+                cursor = connection.cursor()
+                while node is not None:
+                    try:
+                        self.loaded.emit(node, readLevel(cursor, node), '')
+                    except Exception as e:
+                        self.loaded.emit(node, [], str(e))
+
+                    try:
+                        node = self.requests.get_nowait()
+                    except queue.Empty:
+                        node = None
+                cursor.close()
+
+            except Exception:
+                pass
+            finally:
+                connection.close() #checks the connection back in
+
+
+
+class SchemaModel(QAbstractItemModel):
+    '''Inherits QAbstractItemModel
+    Exposes the tree of SchemaNodes to a QTreeView. Children are
+    requested of the loader once their parent is expanded, and
+    inserted batchSize at a time as the view scrolls near them, so
+    that schemas with thousands of tables don't stall the view
+
+    Attributes
+    ----------
+    batchSize : int
+        The number of children inserted per call to fetchMore
+    ttl : float
+        The number of seconds a level is kept before being refreshed
+    root : SchemaNode
+        The server, whose children are the schemas
+    loader : MetadataLoader
+    inserting : bool
+        Whether a batch of children is being inserted'''
+
+    batchSize = 256
+    ttl = 300
+
+    def __init__(self, pool):
+        super().__init__()
+        self.root = SchemaNode('server')
+        self.inserting = False
+        self.loader = MetadataLoader(pool)
+        self.loader.loaded.connect(self.merge)
+
+
+    def nodeOf(self, index : QModelIndex) -> SchemaNode:
+        return index.internalPointer() if index.isValid() else self.root
+
+
+    def indexOf(self, node : SchemaNode) -> QModelIndex:
+        return QModelIndex() if node is self.root else self.createIndex(node.row, 0, node)
+
+
+    def index(self, row, column, parent = QModelIndex()) -> QModelIndex:
+        node = self.nodeOf(parent)
+        if 0 <= row < node.shown and 0 <= column < 2:
+            return self.createIndex(row, column, node.children[row])
+
+        return QModelIndex()
+
+
+    def parent(self, index) -> QModelIndex:
+        if not index.isValid():
+            return QModelIndex()
+
+        parent = index.internalPointer().parent
+        return QModelIndex() if parent is None or parent is self.root else self.createIndex(parent.row, 0, parent)
+
+
+    def rowCount(self, parent = QModelIndex()) -> int:
+        return self.nodeOf(parent).shown if parent.column() <= 0 else 0
+
+
+    def columnCount(self, parent = QModelIndex()) -> int:
+        return 2
+
+
+    def hasChildren(self, parent = QModelIndex()) -> bool:
+        node = self.nodeOf(parent)
+        return node.kind in expandable and (not node.loaded or bool(node.children))
+
+
+    def data(self, index, role = Qt.DisplayRole):
+        if role in (Qt.DisplayRole, Qt.ToolTipRole) and index.isValid():
+            node = index.internalPointer()
+            if index.column() == 0:
+                return node.name
+            return f'Error: {node.error}' if node.error else 'Loading...' if node.loading and not node.loaded else node.detail
+
+        return QVariant()
+
+
+    def headerData(self, section, orientation, role = Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return ('Name', 'Details')[section]
+
+        return QVariant()
+
+
+    def canFetchMore(self, parent = QModelIndex()) -> bool:
+        node = self.nodeOf(parent)
+        return node.kind in expandable and (not node.loaded or node.shown < len(node.children))
+
+
+    def fetchMore(self, parent = QModelIndex()) -> None:
+        '''Requests the children of a node, or inserts the next batch
+        of them should they have been read
+
+        Parameters
+        ----------
+        parent : QModelIndex
+
+        Returns
+        -------
+        None'''
+
+        node = self.nodeOf(parent)
+        if not node.loaded:
+            self.load(node)
+        elif node.shown < len(node.children) and not self.inserting:
+            count = min(self.batchSize, len(node.children) - node.shown)
+            self.inserting = True #views may ask for more mid-insert
+            self.beginInsertRows(parent, node.shown, node.shown + count - 1)
+            node.shown += count
+            self.endInsertRows()
+            self.inserting = False
+
+
+    def load(self, node : SchemaNode) -> None:
+        '''Requests that a node's children be read, or read again,
+        unless they already are being read
+
+        Parameters
+        ----------
+        node : SchemaNode
+
+        Returns
+        -------
+        None'''
+
+        if node.loading or node.kind == 'indexes': #an indexes folder is read along with its table
+            return None
+
+        node.loading = True
+        self.changed(node)
+        self.loader.request(node)
+
+
+    def changed(self, node : SchemaNode) -> None:
+        if node is not self.root and node.parent is not None:
+            self.dataChanged.emit(self.createIndex(node.row, 0, node), self.createIndex(node.row, 1, node))
+
+
+    def merge(self, node : SchemaNode, entries : list, error : str) -> None:
+        '''Brings a node's children in line with those just read.
+        Children that still exist are kept as they are, along with
+        their own children, so expanded branches stay expanded
+
+        Parameters
+        ----------
+        node : SchemaNode
+        entries : list
+            (kind, name, detail) tuples, as readLevel returns
+        error : str
+
+        Returns
+        -------
+        None'''
+
+        node.loading = False
+        if node is not self.root and node.parent is None:
+            return None #removed while being read
+
+        node.expiry = time.monotonic() + self.ttl
+        node.error = error
+        if error:
+            node.expiry = time.monotonic() #retried upon the next expansion or refresh
+            self.changed(node)
+            return None
+
+        indexEntries = [entry for entry in entries if entry[0] == 'index'] #kept in the table's indexes folder
+        entries = [entry for entry in entries if entry[0] != 'index']
+
+        if not node.loaded:
+            node.loaded = True
+            node.children = [SchemaNode(kind, name, detail, node, row) for row, (kind, name, detail) in enumerate(entries)]
+        else:
+            self.mergeChildren(node, entries)
+        self.changed(node)
+
+        if node.kind == 'table':
+            folder = node.children[-1]
+            folder.expiry = node.expiry
+            if not folder.loaded:
+                folder.loaded = True
+                folder.children = [SchemaNode(kind, name, detail, folder, row) for row, (kind, name, detail) in enumerate(indexEntries)]
+            else:
+                self.mergeChildren(folder, indexEntries)
+
+        if node.shown == 0 and node.children:
+            self.fetchMore(self.indexOf(node))
+
+
+    def mergeChildren(self, node : SchemaNode, entries : list) -> None:
+        '''Removes the children of a node that no longer exist,
+        updates the details of those that do and inserts new ones,
+        signalling the view only of the children it shows
+
+        Parameters
+        ----------
+        node : SchemaNode
+        entries : list
+            (kind, name, detail) tuples
+
+        Returns
+        -------
+        None'''
+
+        parent = self.indexOf(node)
+        keys = [(kind, name) for kind, name, _ in entries]
+        current = set(keys)
+        for row in reversed(range(len(node.children))):
+            if node.children[row].key() not in current:
+                self.removeChildren(node, parent, row, row + 1)
+
+        kept = {child.key() for child in node.children}
+        if [child.key() for child in node.children] != [key for key in keys if key in kept]:
+            self.removeChildren(node, parent, 0, len(node.children)) #reordered, as columns may be, so read afresh
+
+        for row, (kind, name, detail) in enumerate(entries):
+            if row < len(node.children) and node.children[row].key() == (kind, name):
+                child = node.children[row]
+                if child.detail != detail:
+                    child.detail = detail
+                    if row < node.shown:
+                        self.changed(child)
+                continue
+
+            visible = row < node.shown or node.shown == len(node.children) #past the shown children, it waits for fetchMore
+            if visible:
+                self.beginInsertRows(parent, row, row)
+            node.children.insert(row, SchemaNode(kind, name, detail, node, row))
+            for i in range(row + 1, len(node.children)):
+                node.children[i].row = i
+            if visible:
+                node.shown += 1
+                self.endInsertRows()
+
+
+    def removeChildren(self, node : SchemaNode, parent : QModelIndex, first : int, last : int) -> None:
+        '''Removes the children of a node from first up to, but not
+        including, last
+
+        Parameters
+        ----------
+        node : SchemaNode
+        parent : QModelIndex
+            The index of node
+        first : int
+        last : int
+
+        Returns
+        -------
+        None'''
+
+        if first >= last:
+            return None
+
+        visible = min(last, node.shown) - first
+        if visible > 0:
+            self.beginRemoveRows(parent, first, first + visible - 1)
+        for child in node.children[first : last]:
+            child.parent = None
+        del node.children[first : last]
+        for i in range(first, len(node.children)):
+            node.children[i].row = i
+        if visible > 0:
+            node.shown -= visible
+            self.endRemoveRows()
+
+
+    def stale(self, isExpanded) -> list:
+        '''Returns the read nodes past their expiry that are in view,
+        that is the root and expanded nodes whose ancestors are all
+        expanded too
+
+        Parameters
+        ----------
+        isExpanded
+            A function telling whether the node at an index is
+            expanded
+
+        Returns
+        -------
+        list'''
+
+        now, nodes, found = time.monotonic(), [self.root], []
+        while nodes:
+            node = nodes.pop()
+            if not node.loaded or node.loading:
+                continue
+            if node.expiry <= now:
+                found.append(node)
+            nodes.extend(child for child in node.children[ : node.shown] if child.kind in expandable and isExpanded(self.indexOf(child)))
+
+        return found
+
+
+    def expire(self) -> None:
+        '''Marks every level read as stale
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        nodes = [self.root]
+        while nodes:
+            node = nodes.pop()
+            node.expiry = 0.0
+            nodes.extend(child for child in node.children if child.loaded and child.kind in expandable)
+
+
+
+class SchemaBrowser(QTreeView):
+    '''Inherits QTreeView
+    A sidebar tree of the server's schemas, their tables, and the
+    columns and indexes of those. Double clicking a name passes it
+    along, quoted, to be inserted into the entry field
+
+    Attributes
+    ----------
+    schemaModel : SchemaModel
+    refreshTimer : QTimer
+        Refreshes the expanded levels that are past their expiry
+
+    Methods
+    -------
+    nameChosen : pyqtSignal
+        A signal that passes along the quoted name double clicked'''
+
+    nameChosen = pyqtSignal(str)
+
+    def __init__(self, pool):
+        super().__init__()
+        self.schemaModel = SchemaModel(pool)
+        self.setModel(self.schemaModel)
+        self.setUniformRowHeights(True) #rows needn't be measured one by one
+        self.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.setMinimumWidth(260)
+        self.header().setStretchLastSection(True)
+        self.setColumnWidth(0, 160)
+
+        self.expanded.connect(self.refreshNode)
+        self.doubleClicked.connect(self.chooseName)
+
+        self.refreshTimer = QTimer(self)
+        self.refreshTimer.setInterval(30000)
+        self.refreshTimer.timeout.connect(self.refreshStale)
+        self.refreshTimer.start()
+
+
+    def refreshNode(self, index : QModelIndex) -> None:
+        '''Reads an expanded node's children again, should they be
+        past their expiry
+
+        Parameters
+        ----------
+        index : QModelIndex
+
+        Returns
+        -------
+        None'''
+
+        node = self.schemaModel.nodeOf(index)
+        if node.loaded and node.expiry <= time.monotonic():
+            self.schemaModel.load(node.parent if node.kind == 'indexes' else node)
+
+
+    def refreshStale(self) -> None:
+        '''Reads the expanded levels past their expiry again, in the
+        background. Collapsed levels are left be until expanded
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        if self.isVisible():
+            for node in self.schemaModel.stale(self.isExpanded):
+                self.schemaModel.load(node.parent if node.kind == 'indexes' else node)
+
+
+    def refresh(self) -> None:
+        '''Reads every expanded level again, in the background
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.schemaModel.expire()
+        self.refreshStale()
+
+
+    def chooseName(self, index : QModelIndex) -> None:
+        node = self.schemaModel.nodeOf(index)
+        if node.kind != 'indexes':
+            self.nameChosen.emit('.'.join(quoteName(name) for name in (node.path()[ : 2] if node.kind == 'table' else [node.name])))
@@ -0,0 +1,168 @@
+'''scriptReader
+Contains the reader that splits .sql script files into statements.
+Files are memory-mapped and scanned with regular expressions that
+jump from one quote, comment or delimiter to the next, so only the
+statement at hand is ever copied into memory, however large the
+file is'''
+
+import mmap
+import re
+
+leadingJunk = re.compile(rb'(?:\s+|--(?=\s)[^\n]*|\#[^\n]*|/\*(?!!).*?\*/)*', re.S) #whitespace and comments, save for /*! versioned ones
+delimiterCommand = re.compile(rb'DELIMITER[ \t]+(\S+)[^\n]*', re.I)
+quoteEnds = {
+    b"'" : re.compile(rb"(?:[^'\\]|\\.|'')*'", re.S),
+    b'"' : re.compile(rb'(?:[^"\\]|\\.|"")*"', re.S),
+    b'`' : re.compile(rb'(?:[^`]|``)*`', re.S),
+    }
+
+
+def specialPattern(delimiter : bytes):
+    '''Returns a pattern matching the delimiter, along with the
+    starts of quotes and comments
+
+    Parameters
+    ----------
+    delimiter : bytes
+
+    Returns
+    -------
+    re.Pattern'''
+
+    return re.compile(rb"""['"`]|/\*|--(?=\s)|\#|""" + re.escape(delimiter))
+
+
+def splitStatements(data, start : int = 0, delimiter : bytes = b';', encoding : str = 'utf-8'):
+    '''Yields the statements of a script from byte offset start
+    onwards. start must be an offset a statement ended at, or 0
+
+    Parameters
+    ----------
+    data : bytes or mmap.mmap
+        The script
+    start : int
+    delimiter : bytes
+        The delimiter in effect at start
+    encoding : str
+        The encoding statements are decoded with
+
+    Returns
+    -------
+    generator
+        Yields (statement, startOffset, endOffset, delimiter)
+        tuples, where endOffset is the offset just past the
+        statement's delimiter, and delimiter is the delimiter in
+        effect past it'''
+
+    size = len(data)
+    pos = start
+    special = specialPattern(delimiter)
+
+    while pos < size:
+        pos = leadingJunk.match(data, pos).end()
+        if pos >= size:
+            return None
+
+        command = delimiterCommand.match(data, pos) #only ever at the start of a statement
+        if command is not None:
+            delimiter = command.group(1)
+            special = specialPattern(delimiter)
+            pos = command.end()
+            continue
+
+        statementStart = pos
+        while True:
+            match = special.search(data, pos)
+            if match is None: #the last statement need not be delimited
+                pos = size
+                statementEnd = size
+                break
+
+            token = match.group()
+            if token in quoteEnds:
+                quoteEnd = quoteEnds[token].match(data, match.end())
+                pos = quoteEnd.end() if quoteEnd else size
+            elif token == b'/*':
+                commentEnd = data.find(b'*/', match.end())
+                pos = commentEnd + 2 if commentEnd != -1 else size
+            elif token in (b'--', b'#'):
+                lineEnd = data.find(b'\n', match.end())
+                pos = lineEnd + 1 if lineEnd != -1 else size
+            else:
+                statementEnd = match.start()
+                pos = match.end()
+                break
+
+        statement = data[statementStart : statementEnd].strip()
+        if statement:
+            yield statement.decode(encoding), statementStart, pos, delimiter
+
+
+class ScriptReader:
+    '''Splits a script file into statements, keeping track of the
+    byte offset every statement ends at so that a failed run can be
+    resumed from where it stopped
+
+    Statements end at the current delimiter, ; to begin with, unless
+    it is within quotes or a comment. DELIMITER commands change the
+    delimiter, as they do in MySQL's CLI
+
+    Attributes
+    ----------
+    path : str
+        The script file
+    size : int
+        The size of the file in bytes
+    encoding : str
+        The encoding statements are decoded with
+    file
+        The open script file
+    map : mmap.mmap
+        The memory-mapped file, None for an empty file'''
+
+    def __init__(self, path : str, encoding : str = 'utf-8'):
+        self.path = path
+        self.encoding = encoding
+        self.file = open(path, 'rb')
+        self.file.seek(0, 2)
+        self.size = self.file.tell()
+        self.map = mmap.mmap(self.file.fileno(), 0, access = mmap.ACCESS_READ) if self.size > 0 else None
+
+
+    def statements(self, start : int = 0, delimiter : bytes = b';'):
+        '''Yields the statements of the file from byte offset start
+        onwards. start must be an offset a statement ended at, or 0
+
+        Parameters
+        ----------
+        start : int
+        delimiter : bytes
+            The delimiter in effect at start
+
+        Returns
+        -------
+        generator
+            Yields (statement, startOffset, endOffset, delimiter)
+            tuples, where endOffset is the offset just past the
+            statement's delimiter, and delimiter is the delimiter in
+            effect past it'''
+
+        if self.map is None:
+            return iter(())
+
+        return splitStatements(self.map, start, delimiter, self.encoding)
+
+
+    def close(self) -> None:
+        '''Unmaps and closes the file
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        if self.map is not None:
+            self.map.close()
+        self.file.close()
@@ -0,0 +1,914 @@
+'''session
+Contains the Session class, which executes statements on a connection
+of its own and returns their results as Result objects, the rows of
+which can be streamed or read in full. Nothing here depends on Qt, so
+the window, batch mode and scripts all execute statements through the
+same layer
+
+AsyncSession offers a session to asyncio code, running the blocking
+connector calls on an executor. Reads run on connections checked out
+from the session's pool, so that many can be in flight at once
+
+    session = Session.connect(host = 'localhost', user = 'root', password = '')
+    with session.execute('SELECT * FROM big', stream = True) as result:
+        for row in result:
+            ...
+
+    session = await AsyncSession.connect(host = 'localhost', user = 'root', password = '')
+    results = await asyncio.gather(*(session.execute(query) for query in queries))'''
+
+import asyncio
+import functools
+import re
+import time
+import sqlUtils
+from concurrent.futures import ThreadPoolExecutor
+from rawValues import RawCursor
+from rowStore import RowStore
+from statementCache import StatementCache
+
+lostConnectionErrnos = {2006, 2013, 2055, 4031} #server gone away, lost connection, lost connection (extended), client interaction timeout
+setTarget = re.compile(r'SET\s+(.*?)\s*(:?=|$)', re.I | re.S) #what a SET statement sets
+
+
+class Result:
+    '''The result of an executed statement. Rows are streamed from
+    the cursor as they are iterated over or fetched, unless the
+    result has been buffered, in which case every row was read
+    upfront and the connection is free for the next statement
+
+    Attributes
+    ----------
+    batchSize : int
+        The number of rows fetched at a time while iterating
+    statement : str
+    columnNames : tuple
+        Empty for statements that return no rows
+    rowCount : int
+        The number of rows affected, or for statements that return
+        rows, the number fetched so far. -1 should it not be known
+    lastRowId : int
+        The AUTO_INCREMENT value an insert generated, if any
+    executeTime : float
+        The seconds the statement took to execute
+    fetchTime : float
+        The seconds spent fetching rows so far
+    cursor
+        The cursor rows are streamed from, None once every row has
+        been read
+    rows : list or RowStore
+        The rows, once buffered. A RowStore should they not have fit
+        within its memory budget. None until buffered
+    position : int
+        The number of buffered rows fetched so far
+    release : func
+        Called once every row has been read, checking the connection
+        the statement ran on back in should it be pooled. None should
+        there be nothing to release'''
+
+    batchSize = 256
+
+    def __init__(self, statement : str, cursor, executeTime : float, release = None):
+        self.statement = statement
+        self.cursor = cursor
+        self.columnNames = tuple(cursor.column_names) if cursor.description is not None else ()
+        self.rowCount = cursor.rowcount
+        self.lastRowId = cursor.lastrowid
+        self.executeTime = executeTime
+        self.fetchTime = 0.0
+        self.rows = None
+        self.position = 0
+        self.release = release
+
+        if not self.columnNames:
+            self.finish()
+
+
+    @property
+    def unread(self) -> bool:
+        return self.cursor is not None
+
+
+    def __repr__(self) -> str:
+        return f'Result({self.statement!r}, columns = {len(self.columnNames)}, rowCount = {self.rowCount})'
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+    def __iter__(self):
+        while batch := self.fetchmany(self.batchSize):
+            yield from batch
+
+
+    def fetchmany(self, size : int = None) -> list:
+        '''Returns up to size rows, fewer only once the rows run out
+
+        Parameters
+        ----------
+        size : int
+            Defaults to batchSize
+
+        Returns
+        -------
+        list'''
+
+        size = size or self.batchSize
+        if self.rows is not None:
+            stop = min(self.position + size, len(self.rows))
+            batch = [self.rows[i] for i in range(self.position, stop)]
+            self.position = stop
+            return batch
+
+        if self.cursor is None:
+            return []
+
+        start = time.perf_counter()
+        try:
+            batch = self.cursor.fetchmany(size)
+        except Exception:
+            self.finish() #the connection is of no further use to this result
+            raise
+
+        self.fetchTime += time.perf_counter() - start
+        self.rowCount = self.cursor.rowcount
+        if len(batch) < size:
+            self.finish()
+
+        return batch
+
+
+    def fetchall(self) -> list:
+        '''Returns every row left
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        list'''
+
+        rows = []
+        while batch := self.fetchmany(self.batchSize):
+            rows.extend(batch)
+
+        return rows
+
+
+    def buffer(self, maxBytes : int = None):
+        '''Reads every row left into rows, freeing the connection.
+        Rows past maxBytes are spilled to disk
+
+        Parameters
+        ----------
+        maxBytes : int
+            Defaults to RowStore.maxBytes
+
+        Returns
+        -------
+        Result
+            self'''
+
+        if self.rows is None:
+            store = RowStore(maxBytes)
+            while batch := self.fetchmany(self.batchSize):
+                store.extend(batch)
+
+            self.rows = store if store.spilled else store.memoryRows
+            self.position = 0
+
+        return self
+
+
+    def finish(self) -> None:
+        '''Lets go of the cursor once every row has been read,
+        releasing the connection
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.cursor = None
+        if self.release is not None:
+            release, self.release = self.release, None
+            release()
+
+
+    def drain(self) -> None:
+        '''Discards every row left unread, one batch at a time so that
+        memory use stays bounded
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        while self.cursor is not None:
+            self.fetchmany(self.batchSize)
+
+
+    def close(self) -> None:
+        '''Discards every row left unread, along with buffered rows,
+        deleting any spilled to disk
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        try:
+            self.drain()
+        finally:
+            if isinstance(self.rows, RowStore):
+                self.rows.close()
+            self.rows = None if self.rows is None else []
+
+
+
+class Session:
+    '''Executes statements on a connection of its own. The database
+    switched to and the session variables set are kept track of, and
+    restored should the connection have to be reestablished. Reads
+    that failed due to a dropped connection are retried once
+
+    A single result can be streamed from the session's connection at
+    a time, executing the next statement discards whatever rows the
+    last one left unread. Reads can be run alongside on connections
+    checked out from pool instead. A session is not meant to be used
+    by more than one thread at once, AsyncSession serializes its use
+
+    Attributes
+    ----------
+    reconnectAttempts : int
+        The number of attempts made before giving up on reconnecting
+    myDb
+        The session's connection
+    myCur
+        The cursor statements are executed with
+    pool : ConnectionPool
+        Lends connections to executePooled(). None should there be
+        none
+    rawCur : RawCursor
+        A raw cursor, whose values are left undecoded until shown.
+        None until first needed
+    rawResults : bool
+        Whether statements are executed with rawCur
+    result : Result
+        The result last streamed from myDb, None should there be none
+    database : str
+        The database last switched to with USE
+    sessionStatements : dict
+        SET statements that have been executed, keyed by what they
+        set, to be replayed upon reconnecting
+    reconnects : int
+        The number of times the connection has been reestablished
+    statementCache : StatementCache
+        Keeps the statements executed with params prepared on myDb
+    onReconnect : func
+        Called with whether reconnecting succeeded and the time it
+        took in milliseconds. None by default'''
+
+    reconnectAttempts = 5
+
+    def __init__(self, connection, pool = None, cursor = None):
+        '''
+        Parameters
+        ----------
+        connection
+            The connection the session executes statements on
+        pool : ConnectionPool
+            The pool connection was checked out from, if any
+        cursor
+            A cursor of connection's, opened anew should it not be
+            given'''
+
+        self.myDb = connection
+        self.myCur = connection.cursor() if cursor is None else cursor
+        self.pool = pool
+        self.rawCur = None
+        self.rawResults = False
+        self.result = None
+        self.database = None
+        self.sessionStatements = {}
+        self.reconnects = 0
+        self.statementCache = StatementCache()
+        self.onReconnect = None
+
+
+    @classmethod
+    def connect(cls, minSize : int = 1, maxSize : int = 5, timeout : float = 10.0, **connParams):
+        '''Creates a pool of connections and a session on one of them
+
+        Parameters
+        ----------
+        minSize : int
+        maxSize : int
+        timeout : float
+            As taken by ConnectionPool
+        **connParams
+            As taken by mysql.connector.connect()
+
+        Returns
+        -------
+        Session'''
+
+        from connectionPool import ConnectionPool #only needed by sessions that create their own pool
+
+        pool = ConnectionPool(minSize, maxSize, timeout, **connParams)
+        return cls(pool.checkout(), pool)
+
+
+    def __enter__(self):
+        return self
+
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+    def execute(self, text : str, params : list = None, stream : bool = False) -> Result:
+        '''Executes a statement on the session's connection. Should
+        params be given, the statement is executed as a server-side
+        prepared statement with them bound to its ? placeholders, and
+        kept prepared for the next time around
+
+        Parameters
+        ----------
+        text : str
+        params : list
+            The values bound to the placeholders, in order
+        stream : bool
+            Whether rows are left on the connection to be streamed,
+            as opposed to being read in full before returning
+
+        Returns
+        -------
+        Result'''
+
+        try:
+            return self.run(text, params, stream)
+
+        except Exception as e:
+            if self.connectionLost(e) and self.reconnect() and sqlUtils.isReadOnly(text):
+                return self.run(text, params, stream) #retried only once, and only if it is safe to run again
+            raise
+
+
+    def run(self, text : str, params : list, stream : bool) -> Result:
+        '''Executes a statement as execute() does, without retrying
+
+        Parameters
+        ----------
+        text : str
+        params : list
+        stream : bool
+
+        Returns
+        -------
+        Result'''
+
+        self.drain()
+        start = time.perf_counter()
+        if params is not None:
+            cursor = self.statementCache.execute(self.myDb, text, params)
+        else:
+            cursor = self.resultCursor()
+            cursor.execute(text)
+
+        result = Result(text, cursor, time.perf_counter() - start)
+        self.trackState(text)
+        if stream and result.unread:
+            self.result = result
+        else:
+            result.buffer()
+
+        return result
+
+
+    def executePooled(self, text : str, params : list = None, stream : bool = False) -> Result:
+        '''Executes a statement on a connection checked out from the
+        pool, switched to the session's database. The connection is
+        checked back in once every row has been read
+
+        Parameters
+        ----------
+        text : str
+        params : list
+            The values bound to the placeholders, in order
+        stream : bool
+            Whether rows are left on the connection to be streamed
+
+        Returns
+        -------
+        Result'''
+
+        if self.pool is None:
+            raise ValueError('The session has no pool to check connections out from')
+
+        sideDb = self.pool.checkout()
+        try:
+            if self.database is not None: #on a cursor of its own, as USE can't be prepared
+                useCur = sideDb.cursor()
+                useCur.execute(f'USE `{self.database.replace("`", "``")}`')
+                useCur.close()
+
+            if params is not None:
+                sideCur = sideDb.cursor(prepared = True) #closed upon checkin, as the pool resets the connection
+            elif self.rawResults:
+                sideCur = RawCursor(sideDb.cursor(raw = True))
+            else:
+                sideCur = sideDb.cursor()
+
+            start = time.perf_counter()
+            sideCur.execute(text, None if params is None else tuple(params))
+            result = Result(text, sideCur, time.perf_counter() - start, sideDb.close) #checks the connection back in
+
+        except Exception:
+            sideDb.close()
+            raise
+
+        return result if stream else result.buffer()
+
+
+    def executeBatch(self, statements : list, rollbackOnError : bool) -> tuple:
+        '''Executes statements within a single transaction, merging
+        runs of single-row inserts into multi-row inserts. Should a
+        merged insert fail while errors are skipped over, it is rolled
+        back to a savepoint and its statements are executed one at a
+        time instead, so that only the failing rows are skipped. Should
+        the rollback leave rows of a non-transactional table, such as a
+        MyISAM one, in place, the merged insert isn't retried, counting
+        as a single error, as retrying would insert those rows twice
+
+        Parameters
+        ----------
+        statements : list
+            The statements to be executed, in order
+        rollbackOnError : bool
+            Whether the first error rolls the whole batch back, as
+            opposed to being skipped over
+
+        Returns
+        -------
+        tuple
+            The number of statements executed, the rows affected, the
+            errors raised and the first error message'''
+
+        executed, affected, errors, firstError = 0, 0, 0, ''
+
+        try:
+            self.drain()
+            if not self.myDb.in_transaction:
+                self.myDb.start_transaction()
+
+            position = 0
+            for statement, count in sqlUtils.mergeInserts(statements):
+                originals = statements[position : position + count]
+                position += count
+                try:
+                    if count > 1 and not rollbackOnError:
+                        self.myCur.execute('SAVEPOINT pysqlMerged')
+                    affected += self.runBatched(statement)
+                    executed += count
+                    continue
+
+                except Exception as e:
+                    if rollbackOnError or count == 1:
+                        errors += 1
+                        firstError = firstError or str(e)
+                        if rollbackOnError:
+                            break
+                        continue
+
+                    if not self.undoMerged():
+                        errors += 1
+                        firstError = firstError or str(e)
+                        continue
+
+                for original in originals: #none of the failed insert's rows are left, so they are retried one by one
+                    try:
+                        affected += self.runBatched(original)
+                        executed += 1
+
+                    except Exception as e:
+                        errors += 1
+                        firstError = firstError or str(e)
+
+            if errors and rollbackOnError:
+                self.myDb.rollback()
+                executed, affected = 0, 0
+            else:
+                self.myDb.commit()
+
+        except Exception as e:
+            errors += 1
+            firstError = firstError or str(e)
+
+        return executed, affected, errors, firstError
+
+
+    def undoMerged(self) -> bool:
+        '''Rolls a failed merged insert of a batch back to the savepoint
+        set before it
+
+        Returns
+        -------
+        bool
+            Whether none of its rows are left, which isn't the case
+            when rows of a non-transactional table were inserted'''
+
+        try:
+            self.myCur.execute('ROLLBACK TO SAVEPOINT pysqlMerged')
+            self.myCur.execute('SHOW WARNINGS')
+            return all(int(row[1]) != 1196 for row in self.myCur.fetchall()) #some non-transactional changed tables couldn't be rolled back
+        except Exception:
+            return False
+
+
+    def runBatched(self, statement : str) -> int:
+        '''Executes a statement of a batch, discarding any rows
+
+        Parameters
+        ----------
+        statement : str
+
+        Returns
+        -------
+        int
+            The number of rows affected'''
+
+        self.myCur.execute(statement)
+        if self.myCur.with_rows:
+            self.myCur.fetchall()
+
+        return max(self.myCur.rowcount, 0)
+
+
+    def resultCursor(self):
+        '''Returns the cursor statements are to be executed with,
+        opening rawCur should rawResults be set and rawCur not be
+        open yet
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        MySQLCursor or RawCursor'''
+
+        if not self.rawResults:
+            return self.myCur
+        if self.rawCur is None:
+            self.rawCur = RawCursor(self.myDb.cursor(raw = True))
+
+        return self.rawCur
+
+
+    def trackState(self, text : str) -> None:
+        '''Keeps track of the database switched to and the session
+        variables set by an executed statement, to be restored upon
+        reconnecting
+
+        Parameters
+        ----------
+        text : str
+            The executed statement
+
+        Returns
+        -------
+        None'''
+
+        keyword = sqlUtils.firstKeyword(text)
+        if keyword == 'USE':
+            self.database = self.myDb.database
+        elif keyword == 'SET':
+            match = setTarget.match(text, sqlUtils.leadingJunk.match(text).end()) #past leading comments and parentheses
+            if match is None:
+                return None
+            target = match.group(1).upper()
+            if not target.startswith(('GLOBAL', 'PERSIST', 'PASSWORD', '@@GLOBAL', '@@PERSIST')):
+                self.sessionStatements[target] = text
+
+
+    @property
+    def unread(self) -> bool:
+        return self.result is not None and self.result.unread
+
+
+    def drain(self) -> None:
+        '''Discards the rows the last streamed result left unread, so
+        that the connection can be used for the next statement
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        if self.result is not None:
+            result, self.result = self.result, None
+            result.drain()
+
+
+    def ping(self) -> bool:
+        '''Pings the connection, reconnecting should it have been
+        dropped. Skipped while a result is being streamed from it
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        bool
+            Whether the connection is up'''
+
+        if self.unread:
+            return True
+
+        try:
+            self.myDb.ping()
+            return True
+
+        except Exception:
+            return self.reconnect()
+
+
+    @staticmethod
+    def connectionLost(error : Exception) -> bool:
+        '''Returns whether error was caused by a dropped connection
+
+        Parameters
+        ----------
+        error : Exception
+
+        Returns
+        -------
+        bool'''
+
+        return getattr(error, 'errno', None) in lostConnectionErrnos or 'not available' in str(error)
+
+
+    def reconnect(self) -> bool:
+        '''Reconnects using the parameters the connection was opened
+        with, waiting twice as long after every failed attempt. The
+        current database and session variables are then restored
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        bool'''
+
+        start = time.perf_counter()
+        delay = 0.5
+
+        for attempt in range(self.reconnectAttempts):
+            try:
+                self.myDb.reconnect(attempts = 1)
+                break
+
+            except Exception:
+                if attempt == self.reconnectAttempts - 1:
+                    if self.onReconnect is not None:
+                        self.onReconnect(False, (time.perf_counter() - start) * 1000)
+                    return False
+
+                time.sleep(delay)
+                delay *= 2
+
+        self.result = None
+        self.statementCache.discard() #statements don't outlive the connection they were prepared on
+        try:
+            if self.database is not None:
+                self.myCur.execute(f'USE `{self.database.replace("`", "``")}`')
+            for statement in self.sessionStatements.values():
+                self.myCur.execute(statement)
+
+        except Exception: #a database that was dropped in the meantime shouldn't prevent reconnecting
+            pass
+
+        self.reconnects += 1
+        if self.onReconnect is not None:
+            self.onReconnect(True, (time.perf_counter() - start) * 1000)
+
+        return True
+
+
+    def close(self) -> None:
+        '''Closes the session's connection, checking it back in should
+        it be pooled
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        try:
+            self.drain()
+            self.statementCache.clear()
+        finally:
+            self.myDb.close()
+
+
+    def abort(self) -> None:
+        '''Shuts the session's connection down at once, without reading
+        the rows a streamed result left unread or telling the server
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.result = None
+        self.myDb.shutdown() #closes the socket, raising nothing
+
+
+
+class AsyncResult:
+    '''Wraps a Result for asyncio code, fetching rows on the session's
+    executor. Supports async for and async with, attributes other
+    than the methods below are those of the wrapped Result
+
+    Attributes
+    ----------
+    result : Result
+    session : AsyncSession'''
+
+    def __init__(self, result : Result, session):
+        self.result = result
+        self.session = session
+
+
+    def __getattr__(self, name : str):
+        return getattr(self.result, name)
+
+
+    def __repr__(self) -> str:
+        return f'Async{self.result!r}'
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+    async def __aiter__(self):
+        while batch := await self.fetchmany(self.result.batchSize):
+            for row in batch:
+                yield row
+
+
+    async def fetchmany(self, size : int = None) -> list:
+        if not self.result.unread: #buffered rows are at hand
+            return self.result.fetchmany(size)
+
+        return await self.session.call(self.result.fetchmany, size)
+
+
+    async def fetchall(self) -> list:
+        if not self.result.unread:
+            return self.result.fetchall()
+
+        return await self.session.call(self.result.fetchall)
+
+
+    async def close(self) -> None:
+        await self.session.call(self.result.close)
+
+
+
+class AsyncSession:
+    '''Offers a Session to asyncio code, running every blocking call
+    on an executor so that the event loop never waits on the server.
+    Reads run on connections checked out from the session's pool, as
+    many at once as the pool holds. Any other statement runs on the
+    session's own connection, one at a time, and is read in full, as
+    are reads made while the session's connection has a transaction
+    open, since other connections would not see its uncommitted
+    changes
+
+    Attributes
+    ----------
+    session : Session
+    executor : ThreadPoolExecutor
+        Runs the blocking calls, with a thread per pooled connection
+    lock : asyncio.Lock
+        Held while a statement runs on the session's own connection'''
+
+    def __init__(self, session : Session, executor : ThreadPoolExecutor = None):
+        self.session = session
+        maxWorkers = session.pool.maxSize + 1 if session.pool is not None else 1
+        self.executor = ThreadPoolExecutor(max_workers = maxWorkers) if executor is None else executor
+        self.lock = asyncio.Lock()
+
+
+    @classmethod
+    async def connect(cls, minSize : int = 1, maxSize : int = 5, timeout : float = 10.0, **connParams):
+        '''Creates a pool of connections and a session on one of them,
+        as Session.connect() does
+
+        Parameters
+        ----------
+        minSize : int
+        maxSize : int
+        timeout : float
+        **connParams
+
+        Returns
+        -------
+        AsyncSession'''
+
+        session = await asyncio.get_running_loop().run_in_executor(None, functools.partial(Session.connect, minSize, maxSize, timeout, **connParams))
+        return cls(session)
+
+
+    async def __aenter__(self):
+        return self
+
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+
+    async def call(self, func, *args, **kwargs):
+        '''Runs func with args on the executor
+
+        Parameters
+        ----------
+        func : func
+
+        Returns
+        -------
+        Whatever func returns'''
+
+        return await asyncio.get_running_loop().run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+
+    async def execute(self, text : str, params : list = None, stream : bool = False) -> AsyncResult:
+        '''Executes a statement, as Session.execute() does. Only reads
+        run on pooled connections can be streamed
+
+        Parameters
+        ----------
+        text : str
+        params : list
+            The values bound to the placeholders, in order
+        stream : bool
+            Whether rows are left on the connection to be streamed
+
+        Returns
+        -------
+        AsyncResult'''
+
+        session = self.session
+        if session.pool is not None and sqlUtils.isReadOnly(text) and not session.myDb.in_transaction:
+            result = await self.call(session.executePooled, text, params, stream)
+        else:
+            async with self.lock:
+                result = await self.call(session.execute, text, params)
+
+        return AsyncResult(result, self)
+
+
+    async def executeBatch(self, statements : list, rollbackOnError : bool) -> tuple:
+        '''Executes statements within a single transaction, as
+        Session.executeBatch() does
+
+        Parameters
+        ----------
+        statements : list
+        rollbackOnError : bool
+
+        Returns
+        -------
+        tuple'''
+
+        async with self.lock:
+            return await self.call(self.session.executeBatch, statements, rollbackOnError)
+
+
+    async def close(self) -> None:
+        async with self.lock:
+            await self.call(self.session.close)
+        self.executor.shutdown(wait = False)
@@ -4,6 +4,7 @@ associated methods. '''
 
 import json
 import themes
+from rowStore import RowStore
 from os import path
 from PyQt5.QtCore import QSize
 from PyQt5.QtGui import QPalette
@@ -35,9 +36,6 @@ class SettingsWindow(QMainWindow):
        
     Attributes
     ----------
-    paletteList
-        Contains palette objects created in themes.py, to allow
-        for theming
     container
         The widget containing the 'master' layout of the window
     themesComboBox
@@ -61,8 +59,6 @@ class SettingsWindow(QMainWindow):
     def __init__(self, window, textEdit, console, panel):
         super().__init__(window)
 
-        self.paletteDict = themes.themesDict
-
         self.setWindowTitle('Settings')
         self.setMaximumSize(QSize(180,30))
         self.container = QWidget()
@@ -83,6 +79,82 @@ class SettingsWindow(QMainWindow):
         self.fontSizeEntry.setValue(textEdit.font().pointSize())
         self.fontSizeEntry.valueChanged.connect(lambda size: self.changeFont(textEdit, size, textEdit.font().family()))
 
+        self.scrollbackLimit = QSpinBox()
+        self.scrollbackLimit.setRange(0, 10000000) #0 keeps every line
+        self.scrollbackLimit.setSingleStep(10000)
+        self.scrollbackLimit.setValue(console.document().maximumBlockCount())
+        self.scrollbackLimit.valueChanged.connect(console.document().setMaximumBlockCount)
+
+        pool = console.sqlComp[3] #pool settings take effect upon the next sign-in
+        self.poolMinSize = QSpinBox()
+        self.poolMinSize.setRange(1, 32)
+        self.poolMinSize.setValue(pool.minSize)
+
+        self.poolMaxSize = QSpinBox()
+        self.poolMaxSize.setRange(1, 32)
+        self.poolMaxSize.setValue(pool.maxSize)
+        self.poolMinSize.valueChanged.connect(lambda size: self.poolMaxSize.setValue(max(size, self.poolMaxSize.value())))
+
+        self.poolTimeout = QSpinBox()
+        self.poolTimeout.setRange(1, 600)
+        self.poolTimeout.setValue(int(pool.timeout))
+
+        self.keepAliveInterval = QSpinBox()
+        self.keepAliveInterval.setRange(0, 3600) #0 disables pinging
+        self.keepAliveInterval.setValue(console.keepAliveInterval)
+        self.keepAliveInterval.valueChanged.connect(lambda interval: setattr(console, 'keepAliveInterval', interval))
+        self.keepAliveInterval.valueChanged.connect(lambda interval: console.setKeepAlive.emit(interval * 1000))
+
+        self.pollConcurrency = QSpinBox()
+        self.pollConcurrency.setRange(1, 32)
+        self.pollConcurrency.setValue(console.pollConcurrency)
+        self.pollConcurrency.valueChanged.connect(lambda concurrency: setattr(console, 'pollConcurrency', concurrency))
+
+        self.cacheMaxEntries = QSpinBox()
+        self.cacheMaxEntries.setRange(0, 100000)
+        self.cacheMaxEntries.setValue(console.resultCache.maxEntries)
+        self.cacheMaxEntries.valueChanged.connect(lambda entries: setattr(console.resultCache, 'maxEntries', entries))
+
+        self.cacheMaxSize = QSpinBox()
+        self.cacheMaxSize.setRange(1, 16384)
+        self.cacheMaxSize.setValue(console.resultCache.maxBytes // 1048576)
+        self.cacheMaxSize.valueChanged.connect(lambda size: setattr(console.resultCache, 'maxBytes', size * 1048576))
+
+        self.cacheTtl = QSpinBox()
+        self.cacheTtl.setRange(1, 86400)
+        self.cacheTtl.setValue(int(console.resultCache.ttl))
+        self.cacheTtl.valueChanged.connect(lambda ttl: setattr(console.resultCache, 'ttl', ttl))
+
+        self.maxPrepared = QSpinBox()
+        self.maxPrepared.setRange(1, 1024)
+        self.maxPrepared.setValue(console.worker.session.statementCache.maxStatements)
+        self.maxPrepared.valueChanged.connect(lambda count: setattr(console.worker.session.statementCache, 'maxStatements', count))
+
+        self.historySize = QSpinBox()
+        self.historySize.setRange(100, 10000000)
+        self.historySize.setValue(textEdit.history.maxEntries)
+        self.historySize.valueChanged.connect(lambda size: setattr(textEdit.history, 'maxEntries', size))
+
+        self.scriptBatchSize = QSpinBox()
+        self.scriptBatchSize.setRange(1, 100000)
+        self.scriptBatchSize.setValue(console.scriptBatchSize)
+        self.scriptBatchSize.valueChanged.connect(lambda size: setattr(console, 'scriptBatchSize', size))
+
+        self.slowQueryThreshold = QSpinBox()
+        self.slowQueryThreshold.setRange(0, 3600000)
+        self.slowQueryThreshold.setValue(console.slowQueryThreshold)
+        self.slowQueryThreshold.valueChanged.connect(lambda threshold: setattr(console, 'slowQueryThreshold', threshold))
+
+        self.schemaCacheTtl = QSpinBox()
+        self.schemaCacheTtl.setRange(1, 86400)
+        self.schemaCacheTtl.setValue(int(window.schemaBrowser.schemaModel.ttl))
+        self.schemaCacheTtl.valueChanged.connect(lambda ttl: setattr(window.schemaBrowser.schemaModel, 'ttl', ttl))
+
+        self.resultMemoryBudget = QSpinBox()
+        self.resultMemoryBudget.setRange(1, 65536)
+        self.resultMemoryBudget.setValue(RowStore.maxBytes // 1048576)
+        self.resultMemoryBudget.valueChanged.connect(lambda size: setattr(RowStore, 'maxBytes', size * 1048576))
+
         self.macroOneEdit = QLineEdit()
         self.macroOneEdit.setText(window.macroOne)
         self.macroOneEdit.returnPressed.connect(lambda: setattr(window,'macroOne', self.macroOneEdit.text()))
@@ -98,13 +170,16 @@ class SettingsWindow(QMainWindow):
         
 
         self.themesComboBox = QComboBox()
-        self.themesComboBox.addItems([i for i in self.paletteDict])
+        self.themesComboBox.addItems(list(themes.themeColors))
         self.themesComboBox.textActivated.connect(lambda theme: self.changeTheme(theme, panel, window))
 
         self.saveButton = QPushButton('Save')
         self.saveButton.clicked.connect(lambda: self.saveSettings(window))
         
-        for i in (self.fontSelector, self.fontSizeConsole, self.fontSizeEntry,
+        for i in (self.fontSelector, self.fontSizeConsole, self.fontSizeEntry, self.scrollbackLimit,
+                self.poolMinSize, self.poolMaxSize, self.poolTimeout, self.keepAliveInterval, self.pollConcurrency,
+                self.cacheMaxEntries, self.cacheMaxSize, self.cacheTtl, self.maxPrepared, self.historySize,
+                self.scriptBatchSize, self.slowQueryThreshold, self.schemaCacheTtl, self.resultMemoryBudget,
                 self.macroOneEdit, self.macroTwoEdit, self.macroThreeEdit, self.themesComboBox, self.saveButton):
 
             i.sizeHint = lambda: QSize(180,30) #sets size hint of all widgets
@@ -114,6 +189,21 @@ class SettingsWindow(QMainWindow):
         self.layout.addRow('Font Selector', self.fontSelector)
         self.layout.addRow('Font Size (Console)', self.fontSizeConsole)
         self.layout.addRow('Font Size (Entry Field)', self.fontSizeEntry)
+        self.layout.addRow('Scrollback Limit (Lines)', self.scrollbackLimit)
+        self.layout.addRow('Pool Min Size', self.poolMinSize)
+        self.layout.addRow('Pool Max Size', self.poolMaxSize)
+        self.layout.addRow('Pool Checkout Timeout (s)', self.poolTimeout)
+        self.layout.addRow('Keepalive Interval (s)', self.keepAliveInterval)
+        self.layout.addRow('Parallel Poll Concurrency', self.pollConcurrency)
+        self.layout.addRow('Cache Max Entries', self.cacheMaxEntries)
+        self.layout.addRow('Cache Max Size (MB)', self.cacheMaxSize)
+        self.layout.addRow('Cache TTL (s)', self.cacheTtl)
+        self.layout.addRow('Max Prepared Statements', self.maxPrepared)
+        self.layout.addRow('History Size', self.historySize)
+        self.layout.addRow('Script Batch Size', self.scriptBatchSize)
+        self.layout.addRow('Slow Query Threshold (ms)', self.slowQueryThreshold)
+        self.layout.addRow('Schema Cache TTL (s)', self.schemaCacheTtl)
+        self.layout.addRow('Result Memory Budget (MB)', self.resultMemoryBudget)
         self.layout.addRow('Edit Macro One', self.macroOneEdit)
         self.layout.addRow('Edit Macro Two', self.macroTwoEdit)
         self.layout.addRow('Edit Macro Three', self.macroThreeEdit)
@@ -132,9 +222,9 @@ class SettingsWindow(QMainWindow):
 
 
     def changeTheme(self, theme, panel, window) -> None:
-        qApp.setPalette(self.paletteDict[theme])
+        qApp.setPalette(themes.palette(theme))
         panelPalette = panel.palette
-        panelPalette.setBrush(QPalette.Button, self.paletteDict[theme].base())
+        panelPalette.setBrush(QPalette.Button, themes.palette(theme).base())
         panel.setPalette(panelPalette)
         window.statusBar().showMessage(f'Last Operation: Theme Changed to {self.themesComboBox.currentText()}')
 
@@ -146,6 +236,21 @@ class SettingsWindow(QMainWindow):
                     'Font' : self.fontSelector.currentFont().family() ,
                     'Font Size (Console)' : self.fontSizeConsole.value(),
                     'Font Size (Entry Field)' :  self.fontSizeEntry.value(),
+                    'Scrollback Limit' : self.scrollbackLimit.value(),
+                    'Pool Min Size' : self.poolMinSize.value(),
+                    'Pool Max Size' : self.poolMaxSize.value(),
+                    'Pool Checkout Timeout' : self.poolTimeout.value(),
+                    'Keepalive Interval' : self.keepAliveInterval.value(),
+                    'Parallel Poll Concurrency' : self.pollConcurrency.value(),
+                    'Cache Max Entries' : self.cacheMaxEntries.value(),
+                    'Cache Max Size (MB)' : self.cacheMaxSize.value(),
+                    'Cache TTL' : self.cacheTtl.value(),
+                    'Max Prepared Statements' : self.maxPrepared.value(),
+                    'History Size' : self.historySize.value(),
+                    'Script Batch Size' : self.scriptBatchSize.value(),
+                    'Slow Query Threshold (ms)' : self.slowQueryThreshold.value(),
+                    'Schema Cache TTL' : self.schemaCacheTtl.value(),
+                    'Result Memory Budget (MB)' : self.resultMemoryBudget.value(),
                     'Macro One' : self.macroOneEdit.text(),
                     'Macro Two' : self.macroTwoEdit.text(),
                     'Macro Three' : self.macroThreeEdit.text(),
@@ -3,12 +3,12 @@ Contains the initial sign-in screen. Successfully logging in results
 in connecting to said database, which is passed over to the appWindow
 constructor to be used to execute MySQL queries'''
 
+import importlib
 import json
-import mysql.connector
-import appwindow
+import threading
 from os import path
-from PyQt5.QtCore import Qt, QSize, pyqtSignal
-from PyQt5.QtGui import QFont, QPalette, QColor, QPixmap, QBrush
+from PyQt5.QtCore import Qt, QSize, QTimer, pyqtSignal
+from PyQt5.QtGui import QFont, QPalette, QColor, QPixmap, QBrush, QImage, QImageReader
 from PyQt5.QtWidgets import (
 
     qApp,
@@ -39,7 +39,26 @@ class SignIn(QMainWindow):
     nameEntry : QLineEdit
         A text entry field that takes in the user name
     passwordEntry : QLineEdit
-        A text entry field that takes in the password'''
+        A text entry field that takes in the password
+    painted : bool
+        Whether the window has been painted yet
+    warmModules : tuple
+        The modules only needed past signing in, imported in the
+        background once the window has first been painted
+
+    Methods
+    -------
+    backgroundLoaded : pyqtSignal
+        A signal that passes along the background image, once read
+        in the background
+    warmedUp : pyqtSignal
+        A signal emitted once warmModules have been imported, past
+        which signing in no longer waits on imports'''
+
+    backgroundLoaded = pyqtSignal(QImage)
+    warmedUp = pyqtSignal()
+
+    warmModules = ('connectionPool', 'appwindow')
 
     def __init__(self):
         super().__init__()
@@ -49,13 +68,11 @@ class SignIn(QMainWindow):
         self.setWindowTitle('Sign In')
         self.setMinimumSize(QSize(640,480))
         
-        self.bg = QPixmap(f'{path.dirname(path.abspath(__file__))}/assets/icons/signinbg.png')
+        self.bg = QPixmap() #the fancy bg image is read in the background, past the first paint
         self.pallete = self.palette()
         self.brush = QBrush()
-        self.brush.setTexture(self.bg)
-        self.pallete.setBrush(QPalette.Window, self.brush) #Add a fancy bg image
-        
-        self.setPalette(self.pallete)
+        self.painted = False
+        self.backgroundLoaded.connect(self.setBackground)
         
         widgContainer = QWidget()
         screenGridLayout = QGridLayout()
@@ -75,7 +92,9 @@ class SignIn(QMainWindow):
         name = QLabel()
         name.setScaledContents(True)
         name.setFixedSize(QSize(128,128))
-        name.setPixmap(QPixmap(f'{path.dirname(path.abspath(__file__))}/assets/icons/alternativeLogo.png'))
+        logoReader = QImageReader(f'{path.dirname(path.abspath(__file__))}/assets/icons/alternativeLogo.png')
+        logoReader.setScaledSize(QSize(128,128)) #decoded straight to the size drawn at
+        name.setPixmap(QPixmap.fromImage(logoReader.read()))
  
         #fit logo within the label
         
@@ -135,17 +154,75 @@ class SignIn(QMainWindow):
         Parameters
         ----------
         content : tuple
-        Contains the cursor and db objects
+        Contains the cursor and db objects, along with the
+        connection parameters and the connection pool
         
         Returns:
         None'''
         
+        import appwindow #already imported by warmUp, unless signing in beat it to it
         self.appwindow = appwindow.EditingWindow(content)
         self.appwindow.show()
         self.close()
         
     
 
+    def paintEvent(self, e) -> None:
+        '''Overrides paintEvent
+        Schedules warmUp upon the first paint
+
+        Parameters
+        ----------
+        e : QEvent
+        
+        Returns
+        -------
+        None'''
+
+        super().paintEvent(e)
+        if not self.painted:
+            self.painted = True
+            QTimer.singleShot(0, self.warmUp) #once the first paint has been flushed to the screen
+
+
+    def warmUp(self) -> None:
+        '''Reads the background image and imports warmModules in a
+        thread of their own, emitting backgroundLoaded and warmedUp
+        in turn
+        
+        Parameters
+        ----------
+        
+        Returns
+        -------
+        None'''
+
+        def warm():
+            self.backgroundLoaded.emit(QImageReader(f'{path.dirname(path.abspath(__file__))}/assets/icons/signinbg.png').read()) #QImages, unlike QPixmaps, can be read off the GUI thread
+            for module in self.warmModules:
+                importlib.import_module(module)
+            self.warmedUp.emit()
+
+        threading.Thread(target = warm, daemon = True).start()
+
+
+    def setBackground(self, image : QImage) -> None:
+        '''Sets the window's background to image
+        
+        Parameters
+        ----------
+        image : QImage
+        
+        Returns
+        -------
+        None'''
+
+        self.bg = QPixmap.fromImage(image)
+        self.brush.setTexture(self.bg)
+        self.pallete.setBrush(QPalette.Window, self.brush) #Add a fancy bg image
+        self.setPalette(self.pallete)
+
+
     def setProperties(self, obj : QLineEdit) -> None:
         '''Mutates properties of the object obj
         
@@ -299,8 +376,10 @@ class Authenticate(ClickableQLabel):
     def authenticate(self):
         '''Passes the entered name and password
         (or reads from a credentials file if available), and validates them
-        A failure causes the function to return, a success passes
-        the db and cur objects in a tuple
+        A failure causes the function to return, a success creates
+        a connection pool and passes the db and cur objects of a
+        connection checked out from it in a tuple, along with the
+        parameters used to connect and the pool itself
         
         Parameters
         ----------
@@ -309,9 +388,20 @@ class Authenticate(ClickableQLabel):
         -------
         None'''
         
+        from connectionPool import ConnectionPool #already imported by warmUp, unless signing in beat it to it
+
         try:
             
-            myDb = mysql.connector.connect(host = 'localhost', user = self.window.nameEntry.text(), password = self.window.passwordEntry.text())
+            settingsDict = {}
+            if path.exists(f'{path.dirname(path.abspath(__file__))}/assets/config/settings.json'):
+                with open(f'{path.dirname(path.abspath(__file__))}/assets/config/settings.json', 'r') as settings:
+                    settingsDict = json.load(settings)
+
+            connParams = {'host' : 'localhost', 'user' : self.window.nameEntry.text(), 'password' : self.window.passwordEntry.text(),
+                          'use_pure' : False} #the C extension, where installed, reads and decodes rows far faster
+            pool = ConnectionPool(settingsDict.get('Pool Min Size', 1), settingsDict.get('Pool Max Size', 5),
+                                  settingsDict.get('Pool Checkout Timeout', 10), **connParams)
+            myDb = pool.checkout()
             myCur = myDb.cursor()
             
             
@@ -328,7 +418,7 @@ class Authenticate(ClickableQLabel):
             with open(f'{path.dirname(path.abspath(__file__))}/assets/config/credentials.json', 'w+') as credentials:
                 json.dump({'name' : self.window.nameEntry.text(), 'password' : self.window.passwordEntry.text()} , credentials) #set credentials to file
 
-        self.transferObj.emit((myDb, myCur))
+        self.transferObj.emit((myDb, myCur, connParams, pool))
             
     
 def extractCredentials(window):
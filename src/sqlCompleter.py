@@ -0,0 +1,133 @@
+'''sqlCompleter
+A file used to store the SqlCompleter class, which suggests keywords,
+schemas, tables and columns as queries are typed, from a snapshot of
+the server's metadata refreshed in the background'''
+
+import threading
+import completionIndex
+from PyQt5.QtCore import Qt, QStringListModel, QTimer, pyqtSignal
+from PyQt5.QtWidgets import QCompleter
+
+
+class SqlCompleter(QCompleter):
+    '''Inherits QCompleter
+    Looks completions up in the current MetadataSnapshot, which is
+    read on a connection checked out from the pool, in a thread of
+    its own, and swapped in once read. Until the first snapshot is
+    read, only keywords are suggested
+
+    Attributes
+    ----------
+    pool : ConnectionPool
+    keywords : set
+    database
+        A function returning the current database
+    snapshot : MetadataSnapshot
+    loading : bool
+        Whether a snapshot is being read
+    listModel : QStringListModel
+        The completions shown in the popup
+    refreshTimer : QTimer
+        Reads a new snapshot every refreshInterval seconds
+    refreshInterval : int
+        The number of seconds between snapshots
+    maxCompletions : int
+        The maximum number of completions shown
+
+    Methods
+    -------
+    snapshotRead : pyqtSignal
+        A signal that passes along a newly read snapshot, None should
+        reading it have failed'''
+
+    snapshotRead = pyqtSignal(object)
+    refreshInterval = 300
+    maxCompletions = 50
+
+    def __init__(self, pool, keywords : set, database):
+        super().__init__()
+        self.pool = pool
+        self.keywords = keywords
+        self.database = database
+        self.snapshot = completionIndex.MetadataSnapshot(keywords)
+        self.loading = False
+
+        self.listModel = QStringListModel()
+        self.setModel(self.listModel)
+        self.setCompletionMode(QCompleter.UnfilteredPopupCompletion) #completions are filtered by the trie instead
+        self.setCaseSensitivity(Qt.CaseInsensitive)
+        self.setMaxVisibleItems(10)
+        self.snapshotRead.connect(self.setSnapshot)
+
+        self.refreshTimer = QTimer(self)
+        self.refreshTimer.setInterval(self.refreshInterval * 1000)
+        self.refreshTimer.timeout.connect(self.refresh)
+        self.refreshTimer.start()
+
+
+    def refresh(self) -> None:
+        '''Reads a new snapshot in the background, unless one is
+        already being read
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        if not self.loading:
+            self.loading = True
+            threading.Thread(target = self.readSnapshot, daemon = True).start()
+
+
+    def readSnapshot(self) -> None:
+        '''Reads a snapshot on a connection checked out from the
+        pool. Runs in a thread of its own
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        try:
+            connection = self.pool.checkout()
+            try:
+                snapshot = completionIndex.readSnapshot(connection, self.keywords)
+            finally:
+                connection.close() #checks the connection back in
+
+        except Exception:
+            snapshot = None #the last snapshot is kept, until the next refresh
+
+        self.snapshotRead.emit(snapshot)
+
+
+    def setSnapshot(self, snapshot) -> None:
+        self.loading = False
+        if snapshot is not None:
+            self.snapshot = snapshot
+
+
+    def update(self, text : str, statement : str) -> str:
+        '''Fills the popup's model with the completions of the word
+        being typed
+
+        Parameters
+        ----------
+        text : str
+            The statement up to the cursor
+        statement : str
+            The whole statement
+
+        Returns
+        -------
+        str
+            The word typed so far'''
+
+        word, completions = completionIndex.complete(self.snapshot, text, statement, self.database(), self.maxCompletions)
+        self.listModel.setStringList([name for name, _ in completions])
+
+        return word
@@ -0,0 +1,74 @@
+'''sqlHighlighter
+Contains the syntax highlighter attached to the entry field, along
+with the formats tokens are drawn in, which the console's echoes of
+queries share'''
+
+import sqlTokenizer
+from PyQt5.QtGui import QColor, QSyntaxHighlighter, QTextCharFormat
+
+
+def charFormat(color : str, italic : bool = False) -> QTextCharFormat:
+    '''Returns a QTextCharFormat of the given color
+
+    Parameters
+    ----------
+    color : str
+    italic : bool
+
+    Returns
+    -------
+    QTextCharFormat'''
+
+    textFormat = QTextCharFormat()
+    textFormat.setForeground(QColor(color))
+    textFormat.setFontItalic(italic)
+
+    return textFormat
+
+
+tokenFormats = { #tokens of any other kind are drawn as is
+    'keyword' : charFormat('orange'),
+    'string' : charFormat('#FF6AAB73'),
+    'number' : charFormat('#FF2AACB8'),
+    'identifier' : charFormat('#FFC77DBB'),
+    'comment' : charFormat('gray', italic = True),
+    }
+
+
+class SqlHighlighter(QSyntaxHighlighter):
+    '''Inherits QSyntaxHighlighter
+    Highlights a document a block at a time, as it is edited. The
+    state a block ends in (within a string or comment, say) is
+    stored with it, so that editing a block only rehighlights the
+    blocks after it for as long as their state changes
+
+    Attributes
+    ----------
+    keywords : set
+        Upper cased words highlighted as keywords'''
+
+    def __init__(self, document, keywords : set):
+        super().__init__(document)
+        self.keywords = keywords
+
+
+    def highlightBlock(self, text : str) -> None:
+        '''Overrides highlightBlock
+        Tokenizes the block, starting off in the state the previous
+        block ended in
+
+        Parameters
+        ----------
+        text : str
+            The text of the block
+
+        Returns
+        -------
+        None'''
+
+        tokens, state = sqlTokenizer.tokenize(text, self.keywords, max(self.previousBlockState(), sqlTokenizer.normal))
+        for start, length, kind in tokens:
+            if kind in tokenFormats:
+                self.setFormat(start, length, tokenFormats[kind])
+
+        self.setCurrentBlockState(state)
@@ -0,0 +1,85 @@
+'''sqlTokenizer
+Contains a single-pass tokenizer for MySQL statements, aware of
+strings, comments, backtick quoted identifiers and numbers. Meant
+for syntax highlighting, so it never fails: anything it doesn't
+recognise is returned as punctuation
+
+Strings, block comments and backtick quoted identifiers may span
+several lines. Text can thus be tokenized a line at a time, passing
+the state a line ends in to the tokenizing of the next'''
+
+import re
+
+#states a line can end in
+normal, inComment, inSingleQuote, inDoubleQuote, inBacktick = range(5)
+
+tokenPattern = re.compile(r'''
+     (?P<space>\s+)
+    |(?P<comment>(?:--(?=\s|$)|\#)[^\n]*|/\*(?:.*?(?P<commentEnd>\*/)|.*))
+    |(?P<singleQuote>'(?:[^'\\]|\\.?|'')*(?P<singleQuoteEnd>')?)
+    |(?P<doubleQuote>"(?:[^"\\]|\\.?|"")*(?P<doubleQuoteEnd>")?)
+    |(?P<backtick>`(?:[^`]|``)*(?P<backtickEnd>`)?)
+    |(?P<number>(?:0x[0-9a-f]+|\d+(?:\.\d*)?(?:e[-+]?\d+)?|\.\d+(?:e[-+]?\d+)?)(?![\w$]))
+    |(?P<word>[\w$]+)
+    |(?P<punct>.)''', re.S | re.I | re.X)
+
+continuations = { #the rest of a token left open by the previous line
+    inComment : (re.compile(r'.*?(\*/)|.*', re.S), 'comment'),
+    inSingleQuote : (re.compile(r"(?:[^'\\]|\\.?|'')*(')?", re.S), 'string'),
+    inDoubleQuote : (re.compile(r'(?:[^"\\]|\\.?|"")*(")?', re.S), 'string'),
+    inBacktick : (re.compile(r'(?:[^`]|``)*(`)?', re.S), 'identifier'),
+    }
+
+openStates = {'comment' : inComment, 'singleQuote' : inSingleQuote, 'doubleQuote' : inDoubleQuote, 'backtick' : inBacktick}
+kinds = {'singleQuote' : 'string', 'doubleQuote' : 'string', 'backtick' : 'identifier'}
+
+
+def tokenize(text : str, keywords : set, state : int = normal) -> tuple:
+    '''Splits text into tokens in a single pass
+
+    Parameters
+    ----------
+    text : str
+    keywords : set
+        Upper cased words to be told apart from other words
+    state : int
+        The state the previous line ended in, for text that is a
+        single line of a larger text
+
+    Returns
+    -------
+    tuple
+        A list of (start, length, kind) tokens and the state text
+        ends in. Kinds are space, comment, string, identifier,
+        number, keyword, word and punct'''
+
+    tokens = []
+    pos = 0
+
+    if state != normal:
+        pattern, kind = continuations[state]
+        match = pattern.match(text)
+        if match.end() > 0:
+            tokens.append((0, match.end(), kind))
+        if match.group(1) is None:
+            return tokens, state
+        pos = match.end()
+
+    state = normal
+    length = len(text)
+    while pos < length:
+        match = tokenPattern.match(text, pos)
+        group = match.lastgroup
+        end = match.end()
+
+        if group == 'word':
+            kind = 'keyword' if match.group().upper() in keywords else 'word'
+        else:
+            kind = kinds.get(group, group)
+            if group in openStates and text[pos] != '-' and text[pos] != '#' and match.group(f'{group}End') is None:
+                state = openStates[group] #left open, so carried over to the next line. Line comments never are
+
+        tokens.append((pos, end - pos, kind))
+        pos = end
+
+    return tokens, state
@@ -0,0 +1,286 @@
+'''sqlUtils
+Contains small helpers that inspect query text without executing it,
+such as telling apart statements that only read data from those
+that write'''
+
+import re
+
+readKeywords = {'SELECT', 'SHOW', 'DESCRIBE', 'DESC', 'EXPLAIN', 'HELP'} #statements that never modify data
+
+leadingJunk = re.compile(r'(\s+|\(|/\*.*?\*/|(--\s|#)[^\n]*(\n|$))*', re.S) #whitespace, parentheses and comments
+
+
+def firstKeyword(text : str) -> str:
+    '''Returns the first keyword of a statement in upper case,
+    skipping leading whitespace, parentheses and comments
+
+    Parameters
+    ----------
+    text : str
+        The statement
+
+    Returns
+    -------
+    str'''
+
+    match = re.match(r'[A-Za-z_]+', text[leadingJunk.match(text).end():])
+    return match.group().upper() if match else ''
+
+
+def quoteName(name : str) -> str:
+    '''Returns a possibly database qualified name quoted with
+    backticks
+
+    Parameters
+    ----------
+    name : str
+
+    Returns
+    -------
+    str'''
+
+    return '.'.join(f'`{part.strip().strip("`").replace("`", "``")}`' for part in name.split('.'))
+
+
+def isReadOnly(text : str) -> bool:
+    '''Returns whether a statement only reads data, and as such is
+    safe to run more than once
+
+    Parameters
+    ----------
+    text : str
+        The statement
+
+    Returns
+    -------
+    bool'''
+
+    keyword = firstKeyword(text)
+    if keyword == 'SELECT':
+        return re.search(r'\bINTO\b|\bFOR\s+UPDATE\b', text, re.I) is None #SELECT ... INTO writes, FOR UPDATE locks
+
+    return keyword in readKeywords
+
+
+singleInsert = re.compile(r'\s*(INSERT\s+(?:IGNORE\s+)?INTO\s+[^(]+?(?:\s*\([^()]*\))?\s+VALUES)\s*(?=\()', re.I | re.S)
+
+
+def groupEnd(text : str, start : int) -> int:
+    '''Returns the index just past the parenthesis closing the one
+    at index start. Parentheses within quotes are ignored
+
+    Parameters
+    ----------
+    text : str
+    start : int
+        The index of an opening parenthesis
+
+    Returns
+    -------
+    int
+        -1 should the parenthesis never be closed'''
+
+    depth = 0
+    quote = None
+    i = start
+
+    while i < len(text):
+        char = text[i]
+        if quote is not None:
+            if char == '\\':
+                i += 1 #skip the escaped character
+            elif char == quote:
+                if text[i + 1 : i + 2] == quote: #a doubled quote is an escaped quote
+                    i += 1
+                else:
+                    quote = None
+        elif char in '\'"`':
+            quote = char
+        elif char == '(':
+            depth += 1
+        elif char == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+
+    return -1
+
+
+def splitInsert(text : str) -> tuple:
+    '''Splits a single-row INSERT ... VALUES (...) statement into the
+    part up to and including VALUES, and the row itself
+
+    Parameters
+    ----------
+    text : str
+        The statement
+
+    Returns
+    -------
+    tuple
+        (None, None) should text not be a single-row insert'''
+
+    match = singleInsert.match(text)
+    if match is None:
+        return None, None
+
+    end = groupEnd(text, match.end())
+    if end == -1 or text[end:].strip() not in ('', ';'): #more rows, or an ON DUPLICATE KEY clause
+        return None, None
+
+    return ' '.join(match.group(1).split()), text[match.end() : end]
+
+
+def mergeInserts(statements : list, maxRows : int = 1000, maxLength : int = 1000000) -> list:
+    '''Merges runs of consecutive single-row inserts into the same
+    table and columns into multi-row inserts. Every other statement
+    is left as is
+
+    Parameters
+    ----------
+    statements : list
+        The statements, in order of execution
+    maxRows : int
+        The maximum number of rows per merged insert
+    maxLength : int
+        The maximum length of a merged insert, to stay well below
+        the server's max_allowed_packet
+
+    Returns
+    -------
+    list
+        Pairs of the statement to execute and the number of original
+        statements it stands for'''
+
+    merged = []
+    prefix, rows, length = None, [], 0
+
+    def flush():
+        if rows:
+            merged.append((f'{prefix} {", ".join(rows)}', len(rows)))
+            rows.clear()
+
+    for statement in statements:
+        statementPrefix, row = splitInsert(statement)
+
+        if statementPrefix is None:
+            flush()
+            prefix = None
+            merged.append((statement, 1))
+            continue
+
+        if statementPrefix != prefix or len(rows) >= maxRows or length + len(row) > maxLength:
+            flush()
+            prefix, length = statementPrefix, len(statementPrefix)
+
+        rows.append(row)
+        length += len(row) + 2
+
+    flush()
+
+    return merged
+
+
+tableClause = re.compile(r'\b(?:FROM|JOIN|INTO|UPDATE|TABLE|TRUNCATE|TO|RENAME(?:\s+AS)?(?!\s+(?:TABLE|TO|COLUMN|INDEX|KEY)\b))\s+', re.I) #TO and RENAME [AS] name the new table of a rename
+databaseClause = re.compile(r'\b(?:DATABASE|SCHEMA)\s+', re.I)
+tableClauseEnd = re.compile(r'\b(?:WHERE|GROUP|ORDER|LIMIT|HAVING|ON|USING|SET|VALUES?|SELECT|UNION|JOIN|INNER|LEFT|RIGHT|CROSS|NATURAL|STRAIGHT_JOIN|PARTITION|WINDOW|FOR|LOCK|INTO|FROM)\b|[();]', re.I)
+tableName = re.compile(r'(?:`[^`]+`|[\w$]+)(?:\s*\.\s*(?:`[^`]+`|[\w$]+))?')
+quotedOrSpace = re.compile(r'''('(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`)|\s+''', re.S)
+quotedOrComment = re.compile(r'''('(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|`[^`]*`)|/\*.*?(?:\*/|$)|(?:--(?=\s|$)|#)[^\n]*''', re.S)
+literalOrSpace = re.compile(r'''('(?:[^'\\]|\\.|'')*'|"(?:[^"\\]|\\.|"")*"|(?<![\w$.])(?:0x[0-9a-f]+|\d+(?:\.\d*)?(?:e[-+]?\d+)?|\.\d+)(?![\w$]))|(`[^`]*`)|\s+''', re.I | re.S)
+placeholderList = re.compile(r'\(\s*\?(?:\s*,\s*\?)+\s*\)')
+nonDeterministic = re.compile(r'@|\b(?:NOW|RAND|UUID|UUID_SHORT|SYSDATE|CURDATE|CURTIME|CURRENT_DATE|CURRENT_TIME|CURRENT_TIMESTAMP|LOCALTIME|LOCALTIMESTAMP|UNIX_TIMESTAMP|UTC_DATE|UTC_TIME|UTC_TIMESTAMP|CONNECTION_ID|LAST_INSERT_ID|FOUND_ROWS|ROW_COUNT|SLEEP|USER|CURRENT_USER|DATABASE)\b', re.I)
+
+
+def normalize(text : str) -> str:
+    '''Collapses whitespace outside of quotes and strips the trailing
+    semicolon, so that trivially different spellings of a statement
+    compare equal
+
+    Parameters
+    ----------
+    text : str
+        The statement
+
+    Returns
+    -------
+    str'''
+
+    return quotedOrSpace.sub(lambda match: match.group(1) or ' ', text).strip().rstrip(';').rstrip()
+
+
+def tablesIn(text : str) -> set:
+    '''Returns the lower cased names of the tables a statement refers
+    to, without any database qualifier. Meant for invalidating cached
+    results, so erring on the side of too many names is fine
+
+    Parameters
+    ----------
+    text : str
+        The statement
+
+    Returns
+    -------
+    set'''
+
+    tables = set()
+    for match in tableClause.finditer(text):
+        end = tableClauseEnd.search(text, match.end())
+        for reference in text[match.end() : end.start() if end else len(text)].split(','): #table [AS alias], ...
+            name = tableName.match(reference.strip())
+            if name is not None:
+                tables.add(name.group().rsplit('.', 1)[-1].strip().strip('`').lower())
+
+    return tables
+
+
+def isCacheable(text : str) -> bool:
+    '''Returns whether the result of a statement can be cached, that
+    is, whether it is a plain SELECT that returns the same rows for
+    as long as the tables it reads don't change
+
+    Parameters
+    ----------
+    text : str
+        The statement
+
+    Returns
+    -------
+    bool'''
+
+    return firstKeyword(text) == 'SELECT' and isReadOnly(text) and nonDeterministic.search(text) is None
+
+
+def placeholderCount(text : str) -> int:
+    '''Returns the number of ? placeholders in a statement, ignoring
+    those within quotes and comments
+
+    Parameters
+    ----------
+    text : str
+        The statement
+
+    Returns
+    -------
+    int'''
+
+    return quotedOrComment.sub(' ', text).count('?')
+
+
+def fingerprint(text : str) -> str:
+    '''Returns a statement with its string and number literals
+    replaced by ?, lists of them collapsed and whitespace collapsed,
+    so that statements differing only in their values compare equal
+
+    Parameters
+    ----------
+    text : str
+        The statement
+
+    Returns
+    -------
+    str'''
+
+    text = literalOrSpace.sub(lambda match: '?' if match.group(1) else match.group(2) or ' ', text)
+    return placeholderList.sub('(?, ...)', text).strip().rstrip(';').rstrip()
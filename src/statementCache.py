@@ -0,0 +1,132 @@
+'''statementCache
+Contains the cache of server-side prepared statements kept for a
+connection. Parameterized queries that are run over and over, such
+as macros, are only parsed by the server the first time around'''
+
+from collections import OrderedDict
+
+
+class StatementCache:
+    '''Keeps up to maxStatements prepared statements open on a single
+    connection, keyed by their text. The least recently used statement
+    is closed once the cap is reached
+
+    Every statement is held by a prepared cursor of its own, as a
+    prepared cursor only ever holds one statement at a time
+
+    Attributes
+    ----------
+    maxStatements : int
+        The maximum number of statements kept open on the server
+    statements : OrderedDict
+        (text, cursor) pairs keyed by the statement text, least
+        recently used first. The text is the very object the cursor
+        was prepared with, as cursors only skip preparing for that
+        same object
+    hits : int
+        The number of executions that reused an open statement
+    prepares : int
+        The number of statements prepared
+    evictions : int
+        The number of statements closed to make room for others'''
+
+    def __init__(self, maxStatements : int = 32):
+        self.maxStatements = maxStatements
+        self.statements = OrderedDict()
+        self.hits = 0
+        self.prepares = 0
+        self.evictions = 0
+
+
+    def execute(self, connection, text : str, params : list):
+        '''Executes a statement with params bound to its placeholders,
+        preparing it on connection first should it not be open yet
+
+        Parameters
+        ----------
+        connection
+            The connection the statement is prepared on
+        text : str
+            The statement, with ? standing in for each parameter
+        params : list
+            The values bound to the placeholders, in order
+
+        Returns
+        -------
+        MySQLCursorPrepared
+            The cursor the statement was executed with, from which
+            its result is to be fetched'''
+
+        if text in self.statements:
+            self.statements.move_to_end(text)
+            operation, cursor = self.statements[text]
+            self.hits += 1
+        else:
+            while self.statements and len(self.statements) >= max(1, self.maxStatements):
+                self.statements.popitem(last = False)[1][1].close() #deallocates the statement on the server
+                self.evictions += 1
+
+            operation, cursor = text, connection.cursor(prepared = True)
+            self.prepares += 1
+
+        try:
+            cursor.execute(operation, tuple(params))
+
+        except Exception:
+            self.statements.pop(text, None)
+            cursor.close()
+            raise
+
+        self.statements[text] = (operation, cursor)
+
+        return cursor
+
+
+    def clear(self) -> None:
+        '''Closes every open statement
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        for _, cursor in self.statements.values():
+            cursor.close()
+        self.statements.clear()
+
+
+    def discard(self) -> None:
+        '''Forgets every open statement without closing them, for when
+        the connection they were prepared on has been dropped. Closing
+        them would deallocate statements of the new connection that
+        happen to share their ids
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        None'''
+
+        self.statements.clear()
+
+
+    def stats(self) -> dict:
+        '''Returns the cache's counters, for diagnostics
+
+        Parameters
+        ----------
+
+        Returns
+        -------
+        dict'''
+
+        executions = self.hits + self.prepares
+        return {
+            'Prepared Statements' : f'{len(self.statements)} / {self.maxStatements}',
+            'Statement Hits' : self.hits, 'Statements Prepared' : self.prepares,
+            'Statement Hit Rate' : f'{self.hits / executions:.0%}' if executions else 'N/A',
+            'Statement Evictions' : self.evictions
+            }
@@ -72,6 +72,95 @@ def rowDraw(columnWidth : tuple, rowArr : tuple) -> str:
     return returnStr
 
 
+def columnWidths(headerArr : tuple, rowArr) -> list:
+    '''Computes the width of each column, that is the length of its
+    longest value + 2 whitespaces on either side as padding
+    
+    Parameters
+    ----------
+    headerArr : tuple
+        A tuple containing column names
+    rowArr : iterable
+        Contains row data
+
+    Returns
+    -------
+    list'''
+
+    return [max(map(len, map(str, i))) + 2 for i in zip(headerArr, *rowArr)]
+
+
+class TableRenderer:
+    '''Draws tables for a fixed set of column widths
+    The boundary line and the row format template are built once
+    upon construction, so drawing a row is a single str.format call
+    and drawing a batch of rows a single str.join. The output is
+    identical to that of boundaryDraw, headerDraw and rowDraw
+    
+    Attributes
+    ----------
+    columnWidth : tuple
+        An array where element n represents the max width of column n
+        + 2 whitespaces on either side as padding
+    boundary : str
+        The horizontal boundary of the table
+    rowFormat : str
+        A str.format template that draws a single row'''
+
+    def __init__(self, columnWidth : tuple):
+        self.columnWidth = tuple(columnWidth)
+        self.boundary = ''.join([f'+{"-" * i}' for i in self.columnWidth]) + f'+{chr(10)}'
+        self.rowFormat = ''.join([f'|{{!s:^{i}}}' for i in self.columnWidth]) + f'|{chr(10)}'
+
+
+    def header(self, headerArr : tuple) -> str:
+        '''Draws the column names in a box, as headerDraw does
+        
+        Parameters
+        ----------
+        headerArr : tuple
+            A tuple containing column names
+        
+        Returns
+        -------
+        str'''
+
+        return f'{self.boundary}{self.rowFormat.format(*headerArr)}{self.boundary}'
+
+
+    def rows(self, rowArr) -> str:
+        '''Draws a batch of rows
+        
+        Parameters
+        ----------
+        rowArr : iterable
+            Contains row data
+        
+        Returns
+        -------
+        str'''
+
+        rowFormat = self.rowFormat.format
+        return ''.join([rowFormat(*i) for i in rowArr])
+
+
+    def draw(self, headerArr : tuple, rowArr) -> str:
+        '''Draws the entire table, as \'\'.join(tableDraw(...)) does
+        
+        Parameters
+        ----------
+        headerArr : tuple
+            A tuple containing column names
+        rowArr : iterable
+            Contains row data
+        
+        Returns
+        -------
+        str'''
+
+        return f'{self.header(headerArr)}{self.rows(rowArr)}{self.boundary}'
+
+
 def tableDraw(columnWidth : tuple, headerArr : tuple, rowArr : tuple) -> list:
     '''Draws the entire table in a box with required padding
     
@@ -89,12 +178,55 @@ def tableDraw(columnWidth : tuple, headerArr : tuple, rowArr : tuple) -> list:
     -------
     list'''
 
-    returnArr = []
+    renderer = TableRenderer(columnWidth)
+    rowFormat = renderer.rowFormat.format
 
-    returnArr.append(headerDraw(columnWidth, headerArr)) #draw header
-    for i in rowArr: #draws rest of the table
-        returnArr.append(rowDraw(columnWidth, i))
-    returnArr.append(boundaryDraw(columnWidth))
+    returnArr = [renderer.header(headerArr)] #draw header
+    returnArr.extend([rowFormat(*i) for i in rowArr]) #draws rest of the table
+    returnArr.append(renderer.boundary)
 
     return returnArr
 
+
+def streamTableDraw(headerArr : tuple, firstRows : list, rowIter, chunkSize : int = 500):
+    '''A generator that draws the table chunk by chunk, so that rows
+    can be drawn as they are fetched instead of all at once
+    
+    Column widths are computed from the column names and firstRows.
+    Should a later row not fit, the widths are grown and the header
+    is drawn again (a reflow) before the rows that needed it
+    
+    Parameters
+    ----------
+    headerArr : tuple
+        A tuple containing column names
+    firstRows : list
+        The first rows of the table, used to compute column widths
+    rowIter : iterable
+        Yields the remaining rows of the table
+    chunkSize : int
+        The number of rows drawn per chunk
+        
+    Yields
+    ------
+    str'''
+
+    columnWidth = columnWidths(headerArr, firstRows)
+    renderer = TableRenderer(columnWidth)
+    yield f'{renderer.header(headerArr)}{renderer.rows(firstRows)}'
+
+    rowIter = iter(rowIter)
+    while True:
+        chunk = [i for _, i in zip(range(chunkSize), rowIter)]
+        if chunk == []:
+            break
+
+        chunkWidth = [max(map(len, map(str, i))) + 2 for i in zip(*chunk)]
+        if any(new > old for new, old in zip(chunkWidth, columnWidth)): #reflow
+            columnWidth = [max(new, old) for new, old in zip(chunkWidth, columnWidth)]
+            renderer = TableRenderer(columnWidth)
+            yield f'{renderer.header(headerArr)}{renderer.rows(chunk)}'
+        else:
+            yield renderer.rows(chunk)
+
+    yield renderer.boundary
@@ -39,26 +39,43 @@ def createPalette(palette, base, window, text, button):
     return palette
 
 
-raspberry = createPalette(QPalette(), '#FF1E1E1E', '#FF313131', '#FFE30B5C','#FFFFFFFF')
-mango = createPalette(QPalette(), '#FF1E1E1E', '#FF313131', '#FFFFC800','#FFFFFFFF')
-lime = createPalette(QPalette(), '#FF1E1E1E', '#FF313131', '#FFBFFF00','#FFFFFFFF')
-cottonCandy  = createPalette(QPalette(), '#FF131425','#FF1B1D36','#FFFCA6D1','#FFFCA6D1')
-outOfPlaceBanana = createPalette(QPalette(), '#FF1B293A', '#FF2F455D', '#FFE7E39E', '#FFE7E39E')
-ocean = createPalette(QPalette(), '#FF090922', '#FF0E0F38', '#FF25B497', '#FFFFFFFF')
-ube = createPalette(QPalette(), '#FF2A273F', '#FF3E3A5D', '#FFBCB4F6', '#FFBCB4F6')
-nightDash = createPalette(QPalette(), '#FF15213B', '#FF2B3655', '#FFFCA311', '#FFFCA311')
-Darkness = createPalette(QPalette(), '#FF000000', '#FF000000', '#FF000000', '#FF000000') # :)
-
-
-themesDict = {
-     'Raspberry' : raspberry, 'Mango Twist' : mango,
-    'QT Lime Pie' : lime,'Cotton Candy' : cottonCandy,
-    'Out-Of-Place Banana' : outOfPlaceBanana,'Ocean' : ocean,
-    'Ube' : ube, 'Night Dash' : nightDash, 'Darkness' : Darkness
+themeColors = { #theme names : the base, window, text and button colors passed to createPalette
+    'Raspberry' : ('#FF1E1E1E', '#FF313131', '#FFE30B5C','#FFFFFFFF'),
+    'Mango Twist' : ('#FF1E1E1E', '#FF313131', '#FFFFC800','#FFFFFFFF'),
+    'QT Lime Pie' : ('#FF1E1E1E', '#FF313131', '#FFBFFF00','#FFFFFFFF'),
+    'Cotton Candy' : ('#FF131425','#FF1B1D36','#FFFCA6D1','#FFFCA6D1'),
+    'Out-Of-Place Banana' : ('#FF1B293A', '#FF2F455D', '#FFE7E39E', '#FFE7E39E'),
+    'Ocean' : ('#FF090922', '#FF0E0F38', '#FF25B497', '#FFFFFFFF'),
+    'Ube' : ('#FF2A273F', '#FF3E3A5D', '#FFBCB4F6', '#FFBCB4F6'),
+    'Night Dash' : ('#FF15213B', '#FF2B3655', '#FFFCA311', '#FFFCA311'),
+    'Darkness' : ('#FF000000', '#FF000000', '#FF000000', '#FF000000'), # :)
     }
 
-#To add a new theme, set up a new pallete object,
-#and add a key-value pair of the form themeName-paletteObj to themesDict
+palettes = {} #palettes built so far, keyed by theme name
+
+
+def palette(theme : str) -> QPalette:
+    '''Returns the palette of a theme. Palettes are built the first
+    time they are asked for rather than upon import, so that
+    importing the file costs next to nothing
+
+    Parameters
+    ----------
+    theme : str
+        A key of themeColors
+
+    Returns
+    -------
+    QPalette'''
+
+    if theme not in palettes:
+        palettes[theme] = createPalette(QPalette(), *themeColors[theme])
+
+    return palettes[theme]
+
+
+#To add a new theme, add a key-value pair of the form
+#themeName-(base, window, text, button) to themeColors
 
 #window = 
 #wconsole/textedit : 
@@ -0,0 +1,54 @@
+'''test_commandHistory
+Tests searching the command history, kept in memory alone'''
+
+import time
+import pytest
+from commandHistory import CommandHistory
+
+
+def memoryHistory(maxEntries : int) -> CommandHistory:
+    history = CommandHistory('', maxEntries)
+    history.ready.set() #nothing to load
+    return history
+
+
+@pytest.fixture(scope = 'module')
+def largeHistory():
+    history = memoryHistory(150000)
+    for i in range(160000):
+        history.index(f'SELECT col{i % 3001}, name FROM t{i % 5000} WHERE id = {i} AND o{i % 7} = 9')
+    return history
+
+
+def testSearchMatchesWordPrefixes():
+    history = memoryHistory(100)
+    for text in ('SELECT * FROM users', 'SELECT name FROM orders', 'DELETE FROM users WHERE id = 1', 'SELECT * FROM users'):
+        history.index(text)
+
+    assert [text for _, text in history.search('fro us', limit = 5)] == ['SELECT * FROM users', 'DELETE FROM users WHERE id = 1']
+    assert [text for _, text in history.search('SEL', limit = 5)] == ['SELECT * FROM users', 'SELECT name FROM orders']
+    assert history.search('ers sel') == []
+
+    newest = history.search('users')[0][0]
+    assert history.search('users', before = newest) == [(2, 'DELETE FROM users WHERE id = 1')]
+
+
+def testSearchSkipsForgottenQueries():
+    history = memoryHistory(10)
+    for i in range(3000):
+        history.index(f'SELECT {i % 2000}')
+
+    assert [text for _, text in history.search('99', limit = 20)] == [f'SELECT {i}' for i in range(999, 989, -1)]
+    assert history.search('5') == []
+
+
+@pytest.mark.parametrize('text', ('t1', '1', '9 o', 'col12 t4', 'name select', ''))
+def testSearchTimeOnLargeHistory(largeHistory, text):
+    found = largeHistory.search(text, limit = 10)
+    start = time.perf_counter()
+    for _ in range(10):
+        assert largeHistory.search(text, limit = 10) == found
+    elapsed = (time.perf_counter() - start) / 10
+
+    assert len(found) == 10
+    assert elapsed < 0.005, f'{elapsed * 1000:.1f} ms searching {text!r}'
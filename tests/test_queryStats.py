@@ -0,0 +1,13 @@
+'''test_queryStats
+Tests the per-query latencies kept by QueryStats'''
+
+from queryStats import QueryStats
+
+
+def testLeastRecentlyRunFingerprintsAreForgotten():
+    stats = QueryStats(maxFingerprints = 2)
+    for text in ('SELECT 1', 'SELECT a FROM t', 'SELECT 2', 'SELECT b FROM u'):
+        stats.record(text, 0.5, 0, 0, 0, 1, 10)
+
+    assert [(key, runs) for key, runs, *_ in stats.summary()] == [('SELECT ?', 2), ('SELECT b FROM u', 1)]
+    assert set(stats.counts) == set(stats.latencies)
@@ -0,0 +1,35 @@
+'''test_resultCache
+Tests which cached results writes drop'''
+
+import pytest
+import sqlUtils
+from resultCache import ResultCache
+
+
+@pytest.mark.parametrize('text, tables', (
+    ('RENAME TABLE a TO b, c TO d', {'a', 'b', 'c', 'd'}),
+    ('ALTER TABLE shop.a RENAME TO shop.b', {'a', 'b'}),
+    ('ALTER TABLE a RENAME AS b', {'a', 'b'}),
+    ('ALTER TABLE a RENAME COLUMN x TO y', {'a', 'y'}),
+    ('SELECT name FROM users JOIN orders ON users.id = orders.userId', {'users', 'orders'}),
+))
+def testTablesIn(text, tables):
+    assert sqlUtils.tablesIn(text) == tables
+
+
+@pytest.mark.parametrize('text, kept', (
+    ('RENAME TABLE orders TO archive', ['SELECT * FROM users']),
+    ('RENAME TABLE archive TO users', ['SELECT * FROM orders']),
+    ('ALTER TABLE orders RENAME TO archive', ['SELECT * FROM users']),
+    ('DROP DATABASE shop', []),
+    ('DROP SCHEMA IF EXISTS shop', []),
+    ('INSERT INTO other VALUES (1)', ['SELECT * FROM users', 'SELECT * FROM orders']),
+))
+def testWritesDropStaleResults(text, kept):
+    cache = ResultCache()
+    for query in ('SELECT * FROM users', 'SELECT * FROM orders'):
+        cache.put(query, 'shop', ('id',), [(1,)])
+
+    cache.invalidate(text)
+
+    assert [key[0] for key in cache.entries] == kept
@@ -0,0 +1,155 @@
+'''test_session
+Tests Session against stand-in connections, which reject what the
+server would reject'''
+
+import asyncio
+import pytest
+from session import AsyncSession, Session
+
+
+class PreparedUseError(Exception):
+    errno = 1295 #this command is not supported in the prepared statement protocol yet
+
+
+class Cursor:
+    def __init__(self, log : list, prepared : bool = False):
+        self.log = log
+        self.prepared = prepared
+        self.description = None
+        self.column_names = ()
+        self.rowcount = -1
+        self.lastrowid = None
+        self.rows = []
+
+    def execute(self, text : str, params = None):
+        if self.prepared and text.upper().startswith('USE'):
+            raise PreparedUseError('This command is not supported in the prepared statement protocol yet')
+
+        self.log.append((text, params, self.prepared))
+        if text.upper().startswith('SELECT'):
+            self.description = [('id', 3, None, None, None, None, 1, 0)]
+            self.column_names = ('id',)
+            self.rows = [(i,) for i in range(3)]
+
+    def fetchmany(self, size : int = 1) -> list:
+        batch, self.rows = self.rows[ : size], self.rows[size : ]
+        self.rowcount = 3 - len(self.rows)
+        return batch
+
+    def close(self):
+        pass
+
+
+class Connection:
+    in_transaction = False
+
+    def __init__(self, log : list):
+        self.log = log
+        self.closed = False
+
+    def cursor(self, prepared : bool = False, raw : bool = False):
+        return Cursor(self.log, prepared)
+
+    def close(self):
+        self.closed = True
+
+
+class Pool:
+    maxSize = 2
+
+    def __init__(self):
+        self.log = []
+        self.connections = []
+
+    def checkout(self, timeout : float = None):
+        self.connections.append(Connection(self.log))
+        return self.connections[-1]
+
+
+@pytest.fixture
+def session():
+    pool = Pool()
+    session = Session(Connection([]), pool)
+    session.database = 'shop'
+    return session
+
+
+def testPooledParamsWithDatabase(session):
+    result = session.executePooled('SELECT id FROM t WHERE id > ?', [0])
+
+    assert result.fetchall() == [(0,), (1,), (2,)]
+    assert session.pool.log == [('USE `shop`', None, False), ('SELECT id FROM t WHERE id > ?', (0,), True)]
+    assert all(connection.closed for connection in session.pool.connections)
+
+
+def testAsyncParamsWithDatabase(session):
+    async def run():
+        asyncSession = AsyncSession(session)
+        results = await asyncio.gather(*(asyncSession.execute('SELECT id FROM t WHERE id > ?', [i]) for i in range(4)))
+        return [await result.fetchall() for result in results]
+
+    assert asyncio.run(run()) == [[(0,), (1,), (2,)]] * 4
+    assert [entry for entry in session.pool.log if entry[0].startswith('USE')] == [('USE `shop`', None, False)] * 4
+
+
+class BatchCursor:
+    '''Inserts rows into a table, failing at a duplicate id. A
+    transactional table takes none of a failing insert's rows, a
+    non-transactional one keeps those before the duplicate, which
+    rolling back to a savepoint leaves in place with warning 1196'''
+
+    def __init__(self, transactional : bool):
+        self.transactional = transactional
+        self.table = []
+        self.savepoint = []
+        self.warnings = []
+        self.with_rows = False
+        self.rowcount = -1
+
+    def execute(self, text : str, params = None):
+        self.with_rows = False
+        if text.startswith('SAVEPOINT'):
+            self.savepoint = list(self.table)
+        elif text.startswith('ROLLBACK TO SAVEPOINT'):
+            self.warnings = [] if self.transactional else [('Warning', 1196, 'Some non-transactional changed tables couldn\'t be rolled back')]
+            if self.transactional:
+                self.table = list(self.savepoint)
+        elif text == 'SHOW WARNINGS':
+            self.with_rows = True
+        else:
+            inserted = []
+            for value in text.split('VALUES ')[1].split(', '):
+                if value in self.table + inserted:
+                    if not self.transactional:
+                        self.table += inserted
+                    raise Exception(f'Duplicate entry {value}')
+                inserted.append(value)
+            self.table += inserted
+            self.rowcount = len(inserted)
+
+    def fetchall(self) -> list:
+        return self.warnings
+
+
+class BatchConnection(Connection):
+    def start_transaction(self):
+        pass
+
+    def commit(self):
+        pass
+
+    def rollback(self):
+        pass
+
+
+@pytest.mark.parametrize('transactional', (True, False))
+def testBatchRetriesOnlyWhatRollsBack(transactional):
+    cursor = BatchCursor(transactional)
+    session = Session(BatchConnection([]), Pool(), cursor)
+    statements = [f'INSERT INTO t VALUES ({value})' for value in (1, 2, 1, 3)]
+
+    executed, affected, errors, firstError = session.executeBatch(statements, False)
+
+    assert cursor.table == ['(1)', '(2)', '(3)'] if transactional else ['(1)', '(2)']
+    assert (executed, affected, errors) == ((3, 3, 1) if transactional else (0, 0, 1))
+    assert firstError == 'Duplicate entry (1)'